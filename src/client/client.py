@@ -46,6 +46,8 @@ def run_client(p_value, client_id, catalog, result_list):
     Records latency for each operation and stores the results in a shared list.
     """
     local_results = []
+    # One session per client so requests reuse the connection when the frontend keeps it alive
+    session = requests.Session()
 
     for _ in range(NUM_ITERATIONS):
         stock = random.choice(catalog)
@@ -53,7 +55,7 @@ def run_client(p_value, client_id, catalog, result_list):
         # --- Stock Lookup ---
         start = time.time()
         try:
-            r = requests.get(f"{FRONTEND_URL}/stocks/{stock}")
+            r = session.get(f"{FRONTEND_URL}/stocks/{stock}")
             r.raise_for_status()
             print(f"[Client {client_id}] Lookup successful for {stock}")
         except Exception as e:
@@ -66,7 +68,7 @@ def run_client(p_value, client_id, catalog, result_list):
             payload = {"name": stock, "type": "buy", "quantity": 1}
             start = time.time()
             try:
-                r = requests.post(f"{FRONTEND_URL}/orders", json=payload)
+                r = session.post(f"{FRONTEND_URL}/orders", json=payload)
                 r.raise_for_status()
                 txn_id = r.json()["data"].get("transaction_id")
             except Exception as e:
@@ -79,7 +81,7 @@ def run_client(p_value, client_id, catalog, result_list):
             if txn_id:
                 start = time.time()
                 try:
-                    r = requests.get(f"{FRONTEND_URL}/orders/{txn_id}")
+                    r = session.get(f"{FRONTEND_URL}/orders/{txn_id}")
                     r.raise_for_status()
                 except Exception as e:
                     print(f"[Client {client_id}] Order lookup failed: {e}")
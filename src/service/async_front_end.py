@@ -0,0 +1,478 @@
+import asyncio
+import http
+import json
+import os
+import time
+import urllib.parse
+import grpc
+
+from cache import EncodedResponse, NegativeEntry
+from channel_pool import AsyncChannelPool
+from latency import LatencyRecorder
+from single_flight import AsyncSingleFlight
+import catalog_pb2 as catalog_pb2
+import catalog_pb2_grpc as catalog_pb2_grpc
+import order_pb2 as order_pb2
+import order_pb2_grpc as order_pb2_grpc
+
+# Largest request head (request line + headers) accepted on a connection
+MAX_HEADER_SIZE = 64 * 1024
+# Most stocks looked up by one GET /stocks?names=...
+STOCK_BATCH_MAX_SIZE = int(os.environ.get("STOCK_BATCH_MAX_SIZE")) if os.environ.get("STOCK_BATCH_MAX_SIZE") else 100
+# Most orders accepted by one POST /orders/batch
+ORDER_BATCH_MAX_SIZE = int(os.environ.get("ORDER_BATCH_MAX_SIZE")) if os.environ.get("ORDER_BATCH_MAX_SIZE") else 1000
+
+
+class AsyncFrontend:
+    """
+    asyncio implementation of the frontend REST API.
+
+    Serves the same `/stocks/<name>`, `/stocks?names=...`, `/orders` and `/orders/batch` endpoints as `FrontendHandler`, but on a single
+    event loop: connections are persistent HTTP/1.1 connections, pipelined requests are answered in
+    order, and the backends are called through `grpc.aio` so no thread is held while a call is in flight.
+    """
+
+    def __init__(self, cache, order_cache, membership, catalog_address, enable_cache=True, encode_responses=False,
+                 stock_watcher=None):
+        self.cache = cache
+        self.order_cache = order_cache
+        self.encode_responses = encode_responses
+        self.stock_watcher = stock_watcher
+        self.membership = membership
+        self.catalog_address = catalog_address
+        self.enable_cache = enable_cache
+        self.channel_pool = AsyncChannelPool()
+        # Coalesces concurrent catalog lookups of the same stock
+        self.stock_lookups = AsyncSingleFlight()
+        # Latency of placed orders per replication durability
+        self.trade_latency = LatencyRecorder()
+
+    async def handle_connection(self, reader, writer):
+        """Reads requests off a connection until the client closes it or asks for `Connection: close`."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                request_line = lines[0].split(" ")
+                if len(request_line) != 3:
+                    writer.write(self.encode_response(*self.error(400, "Malformed request line"), keep_alive=False))
+                    break
+                method, path, version = request_line
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                body = b""
+                content_length = int(headers.get("content-length") or 0)
+                if content_length:
+                    body = await reader.readexactly(content_length)
+
+                connection = headers.get("connection", "").lower()
+                if version == "HTTP/1.1":
+                    keep_alive = connection != "close"
+                else:
+                    keep_alive = connection == "keep-alive"
+
+                code, data = await self.dispatch(method, path, body, headers)
+                writer.write(self.encode_response(code, data, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except Exception as e:
+            print(f"Connection error: {str(e)}")
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body, headers):
+        """
+            Routes a request to its handler.
+
+            Returns:
+                tuple: (status code, json-serializable response body or `EncodedResponse`)
+        """
+        try:
+            path_parts = path.split('/')
+            if method == "GET":
+                url = urllib.parse.urlsplit(path)
+                if url.path == "/stocks":
+                    stock_names = [name for value in urllib.parse.parse_qs(url.query).get("names", [])
+                                   for name in value.split(",") if name]
+                    # Duplicates are looked up once
+                    stock_names = list(dict.fromkeys(stock_names))
+                    if not stock_names:
+                        return self.error(400, "Query parameter names is required")
+                    if len(stock_names) > STOCK_BATCH_MAX_SIZE:
+                        return self.error(400, f"At most {STOCK_BATCH_MAX_SIZE} stocks can be looked up at once")
+                    return await self.handle_stocks(stock_names)
+                if "/stocks" in path:
+                    if len(path_parts) == 3 and path_parts[1] == 'stocks':
+                        # Decode the URL-encoded string (e.g., converts 'Stock%20A' to 'Stock A')
+                        return await self.handle_cache(urllib.parse.unquote(path_parts[2]), headers.get("if-none-match"))
+                    return self.error(404, "Stock not found")
+                if "/orders" in path:
+                    if len(path_parts) == 3:
+                        try:
+                            order_id = int(path_parts[2])
+                        except ValueError:
+                            return self.error(400, "Order ID must be an integer")
+                        return await self.handle_order_lookup(order_id)
+                    return self.error(404, "Order Id variable not found")
+                if path == "/metrics":
+                    return 200, {"data": {
+                        "stock_lookups": self.stock_lookups.stats(),
+                        "cache": self.cache.stats(),
+                        "order_cache": self.order_cache.stats(),
+                        "trades": self.trade_latency.stats(),
+                        "order_reads": self.membership.read_stats()
+                    }}
+                return self.error(404, "Endpoint not found")
+
+            if method == "POST":
+                if path == "/orders":
+                    order_request = json.loads(body)
+                    stock_name = order_request.get("name")
+                    quantity = order_request.get("quantity")
+                    type = order_request.get("type")
+
+                    if not stock_name or not isinstance(quantity, int) or quantity <= 0:
+                        return self.error(400, "Invalid order request")
+                    return await self.handle_order(stock_name, quantity, type)
+                if path == "/orders/batch":
+                    batch_request = json.loads(body)
+                    orders = batch_request.get("orders") if isinstance(batch_request, dict) else None
+
+                    if not isinstance(orders, list) or not orders:
+                        return self.error(400, "Invalid batch request")
+                    if len(orders) > ORDER_BATCH_MAX_SIZE:
+                        return self.error(400, f"A batch holds at most {ORDER_BATCH_MAX_SIZE} orders")
+                    return await self.handle_order_batch(orders)
+                return self.error(404, "Endpoint not found")
+
+            return self.error(405, "Method not allowed")
+        except Exception as e:
+            return self.error(500, f"Internal server error: {str(e)}")
+
+    async def handle_cache(self, stock_name, if_none_match=None):
+        """Returns the cached stock details or looks them up in the catalog and caches them, see `FrontendHandler.handle_cache`."""
+        if self.stock_watcher is not None and not self.stock_watcher.might_exist(stock_name):
+            return self.error(404, "Stock not found")
+
+        if self.enable_cache:
+            stock_details = self.cache.get_cache(stock_name)
+            if isinstance(stock_details, NegativeEntry):
+                if stock_details.is_valid():
+                    return self.error(404, "Stock not found")
+            elif stock_details:
+                return self.stock_response(stock_details, if_none_match)
+
+        try:
+            stock_details = await self.stock_lookups.do(stock_name, lambda: self.lookup_and_cache(stock_name))
+        except grpc.RpcError as e:
+            return self.error(500, f"Catalog service error: {e.details()}")
+
+        if stock_details is None:
+            return self.error(404, "Stock not found")
+        return self.stock_response(stock_details, if_none_match)
+
+    @staticmethod
+    def stock_response(stock_details, if_none_match):
+        if isinstance(stock_details, EncodedResponse) and stock_details.matches(if_none_match):
+            return 304, stock_details
+        return 200, stock_details
+
+    async def lookup_and_cache(self, stock_name):
+        """Looks the stock up in the catalog and stores the result, or a negative entry, in the cache. None if it does not exist."""
+        # Read before the lookup, so the fill is dropped if a trade or change event made it stale meanwhile
+        generation = self.cache.generation(stock_name)
+        stub = self.channel_pool.get_stub(self.catalog_address, catalog_pb2_grpc.CatalogServiceStub)
+        response = await stub.LookupStock(catalog_pb2.LookupRequest(name=stock_name))
+        if not response.exists:
+            if self.enable_cache:
+                self.cache.update_cache(stock_name, NegativeEntry(), generation)
+            return None
+        stock_details = {
+            "data": {
+                "name": response.name,
+                "price": response.price,
+                "quantity": response.quantity
+            }
+        }
+        if self.encode_responses:
+            stock_details = EncodedResponse(stock_details)
+        if self.enable_cache:
+            self.cache.update_cache(stock_name, stock_details, generation)
+        return stock_details
+
+    async def handle_stocks(self, stock_names):
+        """Looks up several stocks with at most one catalog call, see `FrontendHandler.handle_stocks`."""
+        stocks = {}
+        missing = []
+        known = [name for name in stock_names if self.stock_watcher is None or self.stock_watcher.might_exist(name)]
+        cached = self.cache.get_many(known) if self.enable_cache else {}
+        for stock_name in known:
+            stock_details = cached.get(stock_name)
+            if isinstance(stock_details, NegativeEntry):
+                if not stock_details.is_valid():
+                    missing.append(stock_name)
+            elif stock_details:
+                stocks[stock_name] = stock_details
+            else:
+                missing.append(stock_name)
+
+        if missing:
+            try:
+                stocks.update(await self.lookup_many_and_cache(missing))
+            except grpc.RpcError as e:
+                return self.error(500, f"Catalog service error: {e.details()}")
+
+        results = []
+        for stock_name in stock_names:
+            stock_details = stocks.get(stock_name)
+            if stock_details is None:
+                results.append({"name": stock_name, **self.error(404, "Stock not found")[1]})
+            else:
+                results.append((stock_details.data if isinstance(stock_details, EncodedResponse) else stock_details)["data"])
+        return 200, {"data": {"stocks": results}}
+
+    async def lookup_many_and_cache(self, stock_names):
+        """Looks several stocks up with one `LookupStocks` call and caches them in one step, returns the existing ones by name."""
+        generations = {stock_name: self.cache.generation(stock_name) for stock_name in stock_names}
+        stub = self.channel_pool.get_stub(self.catalog_address, catalog_pb2_grpc.CatalogServiceStub)
+        response = await stub.LookupStocks(catalog_pb2.LookupStocksRequest(names=stock_names))
+        stocks = {}
+        entries = {}
+        for stock in response.stocks:
+            if not stock.exists:
+                entries[stock.name] = NegativeEntry()
+                continue
+            stock_details = {
+                "data": {
+                    "name": stock.name,
+                    "price": stock.price,
+                    "quantity": stock.quantity
+                }
+            }
+            if self.encode_responses:
+                stock_details = EncodedResponse(stock_details)
+            stocks[stock.name] = entries[stock.name] = stock_details
+        if self.enable_cache:
+            self.cache.update_many(entries, generations)
+        return stocks
+
+    async def handle_order_lookup(self, transaction_id):
+        """
+        Looks up an order unless it is cached, on a follower that stored it when there is one, otherwise
+        on the leader, re-electing the leader if it is unreachable.
+        """
+        if self.enable_cache:
+            order_details = self.order_cache.get_cache(str(transaction_id))
+            if order_details:
+                return 200, order_details
+
+        response = await self.lookup_on_follower(transaction_id)
+        if response is not None:
+            return self.order_details(transaction_id, response)
+
+        leader = self.membership.get_leader()
+        address = leader["address"] if leader else "localhost:50054"
+        stub = self.channel_pool.get_stub(address, order_pb2_grpc.OrderServiceStub)
+        try:
+            if leader:
+                self.membership.start_read(leader)
+            try:
+                response = await stub.LookUpOrder(order_pb2.OrderLookUpRequest(transaction_id=transaction_id))
+            finally:
+                if leader:
+                    self.membership.finish_read(leader)
+        except grpc.RpcError as e:
+            if e.code() in [grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED]:
+                if await self.report_failure(leader, address):
+                    return await self.handle_order_lookup(transaction_id)
+                return self.error(500, "Leader election failed")
+            return self.error(500, f"Order service error: {e.details()}")
+
+        if response.exists:
+            return self.order_details(transaction_id, response)
+        return self.error(404, response.message or "Order not found")
+
+    async def lookup_on_follower(self, transaction_id):
+        """
+        Looks the order up on a follower the membership picked among those that stored it.
+
+        Returns:
+            The `LookUpOrder` response, or None if no follower is known to have the order, the follower did
+            not find it or failed, so the leader is asked instead.
+        """
+        follower = self.membership.choose_reader(transaction_id)
+        if follower is None:
+            return None
+        stub = self.channel_pool.get_stub(follower["address"], order_pb2_grpc.OrderServiceStub)
+        self.membership.start_read(follower)
+        try:
+            response = await stub.LookUpOrder(order_pb2.OrderLookUpRequest(transaction_id=transaction_id))
+            return response if response.exists else None
+        except grpc.RpcError as e:
+            print(f"gRPC error during order lookup on replica {follower['replica_id']}: {e.details()}")
+            if e.code() in [grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED]:
+                await self.report_failure(follower, follower["address"])
+            return None
+        finally:
+            self.membership.finish_read(follower)
+
+    def order_details(self, transaction_id, response):
+        """Caches a found order and returns its response."""
+        order_details = {"data": {
+            "transaction_id": response.transaction_id,
+            "name": response.stock_name,
+            "type": response.order_type,
+            "quantity": response.quantity
+        }}
+        if self.enable_cache:
+            self.order_cache.update_cache(str(transaction_id), order_details)
+        return 200, order_details
+
+    async def handle_order(self, stock_name, quantity, type):
+        """Places an order on the leader replica, which replicates it to the followers."""
+        leader = self.membership.get_leader()
+        address = leader["address"] if leader else "localhost:50054"
+        stub = self.channel_pool.get_stub(address, order_pb2_grpc.OrderServiceStub)
+        try:
+            start = time.perf_counter()
+            response = await stub.PlaceOrder(order_pb2.OrderRequest(stock_name=stock_name, quantity=quantity, order_type=type))
+        except grpc.RpcError as e:
+            if e.code() in [grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED]:
+                if await self.report_failure(leader, address):
+                    return await self.handle_order(stock_name, quantity, type)
+                return self.error(500, "Leader election failed")
+            return self.error(500, f"Order service error: {e.details()}")
+
+        if not response.success:
+            return self.error(400, response.message)
+        self.stock_lookups.forget(stock_name)
+        self.cache.invalidate_stock(stock_name)
+        self.trade_latency.record(response.durability or "unknown", time.perf_counter() - start)
+        if self.enable_cache:
+            self.order_cache.update_cache(str(response.transaction_id), {"data": {
+                "transaction_id": response.transaction_id,
+                "name": stock_name,
+                "type": type,
+                "quantity": quantity
+            }})
+        if response.under_replicated:
+            # Placed, but not replicated as the durability mode requires: 202 so clients do not retry it
+            return 202, {"data": {"transaction_id": response.transaction_id, "under_replicated": True, "message": response.message}}
+        return 200, {"data": {"transaction_id": response.transaction_id}}
+
+    async def handle_order_batch(self, orders):
+        """Places a basket of orders with one `PlaceOrders` call to the leader, see `FrontendHandler.handle_order_batch`."""
+        results = [None] * len(orders)
+        positions = []
+        requests = []
+        for index, order in enumerate(orders):
+            stock_name = order.get("name") if isinstance(order, dict) else None
+            quantity = order.get("quantity") if isinstance(order, dict) else None
+            if not stock_name or not isinstance(quantity, int) or quantity <= 0:
+                results[index] = self.error(400, "Invalid order request")[1]
+                continue
+            positions.append(index)
+            requests.append(order_pb2.OrderRequest(stock_name=stock_name, quantity=quantity, order_type=order.get("type")))
+
+        if requests:
+            leader = self.membership.get_leader()
+            address = leader["address"] if leader else "localhost:50054"
+            stub = self.channel_pool.get_stub(address, order_pb2_grpc.OrderServiceStub)
+            try:
+                start = time.perf_counter()
+                response = await stub.PlaceOrders(order_pb2.PlaceOrdersRequest(orders=requests))
+            except grpc.RpcError as e:
+                if e.code() in [grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED]:
+                    if await self.report_failure(leader, address):
+                        return await self.handle_order_batch(orders)
+                    return self.error(500, "Leader election failed")
+                return self.error(500, f"Order service error: {e.details()}")
+
+            elapsed = time.perf_counter() - start
+            durability = next((result.durability for result in response.results if result.success), None)
+            if durability is not None:
+                # One sample per basket
+                self.trade_latency.record(f"{durability or 'unknown'} batch", elapsed)
+            changed = set()
+            for index, request, result in zip(positions, requests, response.results):
+                if result.transaction_id >= 0:
+                    changed.add(request.stock_name)
+                if result.success:
+                    results[index] = {"transaction_id": result.transaction_id}
+                    if result.under_replicated:
+                        results[index]["under_replicated"] = True
+                    if self.enable_cache:
+                        self.order_cache.update_cache(str(result.transaction_id), {"data": {
+                            "transaction_id": result.transaction_id,
+                            "name": request.stock_name,
+                            "type": request.order_type,
+                            "quantity": request.quantity
+                        }})
+                else:
+                    results[index] = self.error(400, result.message)[1]
+            for stock_name in changed:
+                self.stock_lookups.forget(stock_name)
+                self.cache.invalidate_stock(stock_name)
+
+        return 200, {"data": {"results": results}}
+
+    async def report_failure(self, replica, address):
+        """
+        Reports a failed replica to the membership without blocking the event loop.
+
+        Returns:
+            bool: True if a leader is available after the failure was handled.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.membership.report_failure, replica)
+        return self.membership.get_leader() is not None
+
+    @staticmethod
+    def error(code, message):
+        return code, {
+            "error": {
+                "code": code,
+                "message": message
+            }
+        }
+
+    @staticmethod
+    def encode_response(code, data, keep_alive):
+        """Builds the raw HTTP/1.1 response for a json body, an `EncodedResponse` is sent without re-encoding it."""
+        if isinstance(data, EncodedResponse):
+            connection = b"Connection: keep-alive\r\n\r\n" if keep_alive else b"Connection: close\r\n\r\n"
+            if code == 304:
+                return b"".join([b"HTTP/1.1 304 Not Modified\r\nETag: ", data.etag.encode('latin-1'), b"\r\n", connection])
+            return b"".join([b"HTTP/1.1 200 OK\r\n", data.headers, connection, data.body])
+        body = json.dumps(data).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {code} {http.HTTPStatus(code).phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            f"\r\n"
+        )
+        return head.encode('latin-1') + body
+
+
+async def serve_async(port, cache, order_cache, membership, catalog_address, enable_cache=True, encode_responses=False,
+                      stock_watcher=None, reuse_port=False):
+    """Runs the asyncio frontend on the given port until cancelled."""
+    frontend = AsyncFrontend(cache, order_cache, membership, catalog_address, enable_cache, encode_responses, stock_watcher)
+    server = await asyncio.start_server(frontend.handle_connection, "", port, limit=MAX_HEADER_SIZE,
+                                        reuse_address=True, reuse_port=reuse_port)
+    print(f"Async front-end service started on port {port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await frontend.channel_pool.close()
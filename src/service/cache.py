@@ -1,5 +1,63 @@
 from collections import OrderedDict
+import hashlib
+import json
+import os
 import threading
+import time
+import zlib
+
+# Fewest entries per shard of a `ShardedCache`, smaller caches use fewer shards (a single one below twice this)
+MIN_SHARD_SIZE = 8
+# Seconds a lookup of a stock the catalog does not have is answered from the cache
+NEGATIVE_CACHE_TTL = float(os.environ.get("NEGATIVE_CACHE_TTL")) if os.environ.get("NEGATIVE_CACHE_TTL") else 5.0
+# Most names the catalog does not have that are remembered, apart from the stock entries
+NEGATIVE_CACHE_SIZE = int(os.environ.get("NEGATIVE_CACHE_SIZE")) if os.environ.get("NEGATIVE_CACHE_SIZE") else 100
+
+
+class EncodedResponse:
+    """
+    Stock details cached together with their encoded response.
+
+    The JSON body, its ETag and the Content-Type / Content-Length / ETag header lines are built once when
+    the entry is cached, so serving a cache hit needs no serialization and the frontends write the
+    response as one buffer.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.body = json.dumps(data).encode('utf-8')
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=8).hexdigest()}"'
+        self.headers = (
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(self.body)}\r\n"
+            f"ETag: {self.etag}\r\n"
+        ).encode('latin-1')
+
+    def matches(self, if_none_match):
+        """Returns True if an If-None-Match header value lists the ETag of this response."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == self.etag:
+                return True
+        return False
+
+
+class NegativeEntry:
+    """
+    Cache value recording that the catalog has no such stock.
+
+    Unlike stock details it expires after `ttl` seconds, so a stock added to the catalog later is not
+    hidden for long. The expiry is wall-clock time so entries stay valid across forked workers.
+    """
+
+    def __init__(self, ttl=NEGATIVE_CACHE_TTL):
+        self.expires_at = time.time() + ttl
+
+    def is_valid(self):
+        return time.time() < self.expires_at
+
 
 class ReadWriteLock: 
     def __init__(self):
@@ -38,16 +96,15 @@ class Cache:
 
     def get_cache(self, stock_name):
         """Check if stock is present in cache it will return it"""
-        self.lock.acquire_read()
+        # A hit reorders the LRU list, so even lookups need the write lock
+        self.lock.acquire_write()
         try:
             if stock_name in self.cache:
-                print(f"[Cache HIT] {stock_name}")
                 self.cache.move_to_end(stock_name) 
                 return self.cache[stock_name]
-            print(f"[Cache MISS] {stock_name}")
             return None
         finally:
-            self.lock.release_read()
+            self.lock.release_write()
 
     def update_cache(self, stock_name, stock_details):
         """Add stock data to cache and apply eviction if needed."""
@@ -56,7 +113,6 @@ class Cache:
          if stock_details is not None:
             if stock_name in self.cache:
                 self.cache.move_to_end(stock_name)
-                print(f"[Cache UPDATE] Added {stock_name}, Cache Keys: {list(self.cache.keys())}")
             self.cache[stock_name] = stock_details
         
             if len(self.cache) > self.max_size:
@@ -65,6 +121,34 @@ class Cache:
             self.lock.release_write()
         
 
+    def get_many(self, stock_names):
+        """Returns the cached entries of several stocks as a dict, under one acquisition of the lock."""
+        self.lock.acquire_write()
+        try:
+            entries = {}
+            for stock_name in stock_names:
+                if stock_name in self.cache:
+                    self.cache.move_to_end(stock_name)
+                    entries[stock_name] = self.cache[stock_name]
+            return entries
+        finally:
+            self.lock.release_write()
+
+    def update_many(self, entries):
+        """Adds the entries of a dict of stocks to the cache, under one acquisition of the lock."""
+        self.lock.acquire_write()
+        try:
+            for stock_name, stock_details in entries.items():
+                if stock_details is None:
+                    continue
+                if stock_name in self.cache:
+                    self.cache.move_to_end(stock_name)
+                self.cache[stock_name] = stock_details
+                if len(self.cache) > self.max_size:
+                    self.cache.popitem(last=False)
+        finally:
+            self.lock.release_write()
+
     def invalidate_stock(self, stock_name):
         """Remove stock from cache (invalidated)."""
         self.lock.acquire_write()
@@ -73,4 +157,726 @@ class Cache:
                 del self.cache[stock_name]
                 print(f"[Cache INVALIDATE] Removed {stock_name}")
         finally:
-            self.lock.release_write()
\ No newline at end of file
+            self.lock.release_write()
+
+    def refresh_cache(self, stock_name, stock_details):
+        """Replace the data of a stock only if it is already cached, without touching its recency."""
+        self.lock.acquire_write()
+        try:
+            if stock_name in self.cache:
+                self.cache[stock_name] = stock_details
+        finally:
+            self.lock.release_write()
+
+    def clear(self):
+        """Remove every stock from the cache."""
+        self.lock.acquire_write()
+        try:
+            self.cache.clear()
+        finally:
+            self.lock.release_write()
+
+
+class LRUShard:
+    """One stripe of a `ShardedCache` with exact LRU ordering, guarded by its own lock."""
+
+    def __init__(self, max_size):
+        self.entries = OrderedDict()
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def refresh(self, key, value):
+        with self.lock:
+            if key in self.entries:
+                self.entries[key] = value
+
+    def remove(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class ClockShard:
+    """
+    One stripe of a `ShardedCache` with CLOCK (second chance) eviction, an approximation of LRU.
+
+    A hit only sets the referenced bit of the entry, so lookups take no lock at all. Inserts and
+    removals take the shard lock; when the shard is full the clock hand sweeps the slots, clearing
+    referenced bits until it finds an entry that was not used since the last sweep. The hit and miss
+    counters are updated without the lock and may undercount slightly under contention.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        # key -> [value, referenced, slot]
+        self.entries = {}
+        self.slots = [None] * max_size
+        self.free_slots = list(range(max_size - 1, -1, -1))
+        self.hand = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry[1] = True
+        return entry[0]
+
+    def put(self, key, value):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry[0] = value
+                entry[1] = True
+                return
+            slot = self.free_slots.pop() if self.free_slots else self._evict()
+            self.slots[slot] = key
+            self.entries[key] = [value, False, slot]
+
+    def _evict(self):
+        """Advances the hand to the first unreferenced entry, evicts it and returns its slot."""
+        while True:
+            slot = self.hand
+            self.hand = (self.hand + 1) % self.max_size
+            entry = self.entries[self.slots[slot]]
+            if entry[1]:
+                entry[1] = False
+            else:
+                del self.entries[self.slots[slot]]
+                self.evictions += 1
+                return slot
+
+    def refresh(self, key, value):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry[0] = value
+
+    def remove(self, key):
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.slots[entry[2]] = None
+                self.free_slots.append(entry[2])
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+            self.slots = [None] * self.max_size
+            self.free_slots = list(range(self.max_size - 1, -1, -1))
+            self.hand = 0
+
+
+class LFUShard:
+    """
+    One stripe of a `ShardedCache` with LFU eviction.
+
+    Keys are grouped in buckets by access count; the victim is the least recently used key of the
+    lowest-count bucket, so every operation is O(1).
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        # key -> [value, count]
+        self.entries = {}
+        # count -> keys with that count, in LRU order
+        self.buckets = {}
+        self.min_count = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _touch(self, key, entry):
+        count = entry[1]
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_count == count:
+                self.min_count = count + 1
+        entry[1] = count + 1
+        self.buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touch(key, entry)
+            return entry[0]
+
+    def put(self, key, value):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry[0] = value
+                self._touch(key, entry)
+                return
+            if len(self.entries) >= self.max_size:
+                victim, _ = self.buckets[self.min_count].popitem(last=False)
+                if not self.buckets[self.min_count]:
+                    del self.buckets[self.min_count]
+                del self.entries[victim]
+                self.evictions += 1
+            self.entries[key] = [value, 1]
+            self.buckets.setdefault(1, OrderedDict())[key] = None
+            self.min_count = 1
+
+    def refresh(self, key, value):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry[0] = value
+
+    def remove(self, key):
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                bucket = self.buckets[entry[1]]
+                del bucket[key]
+                if not bucket:
+                    del self.buckets[entry[1]]
+                    if self.buckets and self.min_count == entry[1]:
+                        self.min_count = min(self.buckets)
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+            self.buckets = {}
+            self.min_count = 0
+
+
+class ARCShard:
+    """
+    One stripe of a `ShardedCache` with Adaptive Replacement Cache eviction (Megiddo & Modha).
+
+    Entries seen once live in T1 and entries seen at least twice in T2. The ghost lists B1/B2 remember
+    recently evicted keys and steer the target size `p` of T1, so the cache adapts between recency and
+    frequency and a one-off scan cannot flush the frequently used entries out of T2.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.p = 0
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            if key in self.t1:
+                value = self.t1.pop(key)
+                self.t2[key] = value
+            elif key in self.t2:
+                value = self.t2[key]
+                self.t2.move_to_end(key)
+            else:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return value
+
+    def _replace(self, key):
+        """Evicts from T1 or T2 into the matching ghost list, unless invalidations left free room."""
+        if len(self.t1) + len(self.t2) < self.max_size:
+            return
+        if self.t1 and (len(self.t1) > self.p or (key in self.b2 and len(self.t1) == self.p) or not self.t2):
+            victim, _ = self.t1.popitem(last=False)
+            self.b1[victim] = None
+        else:
+            victim, _ = self.t2.popitem(last=False)
+            self.b2[victim] = None
+        self.evictions += 1
+
+    def put(self, key, value):
+        with self.lock:
+            if key in self.t1 or key in self.t2:
+                self.t1.pop(key, None)
+                self.t2[key] = value
+                self.t2.move_to_end(key)
+                return
+
+            c = self.max_size
+            if key in self.b1:
+                self.p = min(c, self.p + max(len(self.b2) // max(len(self.b1), 1), 1))
+                self._replace(key)
+                del self.b1[key]
+                self.t2[key] = value
+                return
+            if key in self.b2:
+                self.p = max(0, self.p - max(len(self.b1) // max(len(self.b2), 1), 1))
+                self._replace(key)
+                del self.b2[key]
+                self.t2[key] = value
+                return
+
+            if len(self.t1) + len(self.b1) == c:
+                if len(self.t1) < c:
+                    self.b1.popitem(last=False)
+                    self._replace(key)
+                else:
+                    self.t1.popitem(last=False)
+                    self.evictions += 1
+            elif len(self.t1) + len(self.b1) < c:
+                total = len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2)
+                if total >= c:
+                    if total == 2 * c:
+                        self.b2.popitem(last=False)
+                    self._replace(key)
+            self.t1[key] = value
+
+    def refresh(self, key, value):
+        with self.lock:
+            if key in self.t1:
+                self.t1[key] = value
+            elif key in self.t2:
+                self.t2[key] = value
+
+    def remove(self, key):
+        with self.lock:
+            self.t1.pop(key, None)
+            self.t2.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.p = 0
+            self.t1.clear()
+            self.t2.clear()
+            self.b1.clear()
+            self.b2.clear()
+
+
+class FrequencySketch:
+    """
+    Count-min sketch of 4-bit counters estimating how often keys were accessed.
+
+    Counters are halved every `sample_size` increments so the estimate follows the recent workload.
+    """
+
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+
+    def __init__(self, max_size):
+        width = 16
+        while width < 4 * max_size:
+            width *= 2
+        self.mask = width - 1
+        self.rows = [bytearray(width) for _ in self.SEEDS]
+        self.sample_size = 10 * max(max_size, 1)
+        self.additions = 0
+
+    def _indexes(self, key):
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        return [((h * seed) & 0xFFFFFFFFFFFFFFFF) >> 32 & self.mask for seed in self.SEEDS]
+
+    def increment(self, key):
+        for row, index in zip(self.rows, self._indexes(key)):
+            if row[index] < 15:
+                row[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            for row in self.rows:
+                for index in range(len(row)):
+                    row[index] >>= 1
+            self.additions //= 2
+
+    def estimate(self, key):
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+
+
+class TinyLFUShard:
+    """
+    One stripe of a `ShardedCache` with W-TinyLFU eviction.
+
+    New keys enter a small LRU window (1% of the shard). Keys leaving the window compete with the
+    victim of the main segmented LRU (20% probation, 80% protected) and are only admitted if the
+    frequency sketch has seen them more often, which keeps one-off scans from evicting popular keys.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.window_size = max(1, max_size // 100)
+        self.main_size = max_size - self.window_size
+        self.protected_size = int(self.main_size * 0.8)
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.sketch = FrequencySketch(max_size)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            self.sketch.increment(key)
+            if key in self.window:
+                self.window.move_to_end(key)
+                value = self.window[key]
+            elif key in self.protected:
+                self.protected.move_to_end(key)
+                value = self.protected[key]
+            elif key in self.probation:
+                value = self.probation.pop(key)
+                self._protect(key, value)
+            else:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return value
+
+    def _protect(self, key, value):
+        """Promotes a probation entry, demoting the oldest protected entry if the segment is full."""
+        self.protected[key] = value
+        if len(self.protected) > self.protected_size:
+            demoted, demoted_value = self.protected.popitem(last=False)
+            self.probation[demoted] = demoted_value
+
+    def put(self, key, value):
+        with self.lock:
+            for segment in (self.window, self.probation, self.protected):
+                if key in segment:
+                    segment[key] = value
+                    return
+            self.window[key] = value
+            if len(self.window) <= self.window_size:
+                return
+
+            candidate, candidate_value = self.window.popitem(last=False)
+            if len(self.probation) + len(self.protected) < self.main_size:
+                self.probation[candidate] = candidate_value
+                return
+            if not self.probation:
+                self.evictions += 1
+                return
+            victim = next(iter(self.probation))
+            if self.sketch.estimate(candidate) > self.sketch.estimate(victim):
+                del self.probation[victim]
+                self.probation[candidate] = candidate_value
+            self.evictions += 1
+
+    def refresh(self, key, value):
+        with self.lock:
+            for segment in (self.window, self.probation, self.protected):
+                if key in segment:
+                    segment[key] = value
+                    return
+
+    def remove(self, key):
+        with self.lock:
+            for segment in (self.window, self.probation, self.protected):
+                segment.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.window.clear()
+            self.probation.clear()
+            self.protected.clear()
+
+
+# Eviction policies selectable for a ShardedCache
+EVICTION_POLICIES = {
+    "lru": LRUShard,
+    "clock": ClockShard,
+    "lfu": LFUShard,
+    "arc": ARCShard,
+    "tinylfu": TinyLFUShard,
+}
+
+
+class ShardedCache:
+    """
+    Lock-striped cache with the same interface as `Cache`.
+
+    Keys are spread over `num_shards` independent shards, each with its own lock and eviction state,
+    so lookups of different stocks do not contend on a single lock. The shards hold `max_size` entries
+    together: each gets max_size // num_shards, the first max_size % num_shards one more, and each
+    evicts according to `policy`, one of `EVICTION_POLICIES` ("clock" makes cache hits lock-free). No
+    shard gets fewer than `MIN_SHARD_SIZE` entries, a small cache is a single shard, so eviction stays
+    close to that of one global list.
+    """
+
+    def __init__(self, max_size, num_shards=8, policy="lru"):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy {policy}, expected one of {', '.join(EVICTION_POLICIES)}")
+        self.max_size = max_size
+        self.policy = policy
+        self.num_shards = max(1, min(num_shards, max_size // MIN_SHARD_SIZE))
+        shard_size, extra = divmod(max_size, self.num_shards)
+        shard_class = EVICTION_POLICIES[policy]
+        self.shards = [shard_class(shard_size + (index < extra)) for index in range(self.num_shards)]
+
+    def _shard(self, stock_name):
+        # crc32 rather than hash() so a key maps to the same shard in every process
+        return self.shards[zlib.crc32(stock_name.encode('utf-8')) % self.num_shards]
+
+    def get_cache(self, stock_name):
+        """Check if stock is present in cache it will return it"""
+        return self._shard(stock_name).get(stock_name)
+
+    def update_cache(self, stock_name, stock_details):
+        """Add stock data to cache and apply eviction if needed."""
+        if stock_details is not None:
+            self._shard(stock_name).put(stock_name, stock_details)
+
+    def get_many(self, stock_names):
+        """Returns the cached entries of several stocks as a dict."""
+        entries = {}
+        for stock_name in stock_names:
+            stock_details = self._shard(stock_name).get(stock_name)
+            if stock_details is not None:
+                entries[stock_name] = stock_details
+        return entries
+
+    def update_many(self, entries):
+        """Adds the entries of a dict of stocks to the cache."""
+        for stock_name, stock_details in entries.items():
+            self.update_cache(stock_name, stock_details)
+
+    def refresh_cache(self, stock_name, stock_details):
+        """Replace the data of a stock only if it is already cached, without touching its recency."""
+        self._shard(stock_name).refresh(stock_name, stock_details)
+
+    def invalidate_stock(self, stock_name):
+        """Remove stock from cache (invalidated)."""
+        self._shard(stock_name).remove(stock_name)
+
+    def clear(self):
+        """Remove every stock from the cache."""
+        for shard in self.shards:
+            shard.clear()
+
+    def stats(self):
+        """Returns the hit, miss and eviction counters summed over the shards."""
+        hits = sum(shard.hits for shard in self.shards)
+        misses = sum(shard.misses for shard in self.shards)
+        return {
+            "policy": self.policy,
+            "hits": hits,
+            "misses": misses,
+            "evictions": sum(shard.evictions for shard in self.shards),
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0
+        }
+
+
+class TracingCache:
+    """
+    Wraps a cache and records every lookup and invalidation to a trace file.
+
+    Each line is `get,<stock>` or `invalidate,<stock>`; `tests/cache-policy-replay.py` replays the
+    trace against every eviction policy to compare hit ratios offline. It wraps the `GenerationCache`,
+    so only invalidations made by the frontend are traced, not the stale fills that layer drops.
+    """
+
+    def __init__(self, cache, trace_file):
+        self.cache = cache
+        # Line buffered so the trace survives the frontend being killed
+        self.trace = open(trace_file, 'a', buffering=1)
+        self.lock = threading.Lock()
+
+    def _record(self, operation, stock_name):
+        with self.lock:
+            self.trace.write(f"{operation},{stock_name}\n")
+
+    def get_cache(self, stock_name):
+        self._record("get", stock_name)
+        return self.cache.get_cache(stock_name)
+
+    def get_many(self, stock_names):
+        for stock_name in stock_names:
+            self._record("get", stock_name)
+        return self.cache.get_many(stock_names)
+
+    def invalidate_stock(self, stock_name):
+        self._record("invalidate", stock_name)
+        self.cache.invalidate_stock(stock_name)
+
+    def __getattr__(self, name):
+        return getattr(self.cache, name)
+
+
+class NegativeCache:
+    """
+    Wraps a cache and keeps its `NegativeEntry`s in a separate bounded LRU map.
+
+    Negative entries never take a slot of the wrapped cache, so a scan of unknown names that get past
+    the known-symbol filter cannot evict hot stocks; it only cycles through the `max_size` negative
+    slots. Lookups check the negative map first. Negative entries are kept per process.
+    """
+
+    def __init__(self, cache, max_size=NEGATIVE_CACHE_SIZE):
+        self.cache = cache
+        self.max_size = max_size
+        self.negatives = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _get_negative(self, stock_name):
+        with self.lock:
+            return self.negatives.get(stock_name)
+
+    def _put_negative(self, stock_name, entry):
+        with self.lock:
+            self.negatives[stock_name] = entry
+            self.negatives.move_to_end(stock_name)
+            if len(self.negatives) > self.max_size:
+                self.negatives.popitem(last=False)
+
+    def _remove_negative(self, stock_name):
+        with self.lock:
+            self.negatives.pop(stock_name, None)
+
+    def get_cache(self, stock_name):
+        negative = self._get_negative(stock_name)
+        return negative if negative is not None else self.cache.get_cache(stock_name)
+
+    def get_many(self, stock_names):
+        entries = {}
+        with self.lock:
+            for stock_name in stock_names:
+                if stock_name in self.negatives:
+                    entries[stock_name] = self.negatives[stock_name]
+        entries.update(self.cache.get_many([stock_name for stock_name in stock_names if stock_name not in entries]))
+        return entries
+
+    def update_cache(self, stock_name, stock_details):
+        if isinstance(stock_details, NegativeEntry):
+            self._put_negative(stock_name, stock_details)
+        elif stock_details is not None:
+            self._remove_negative(stock_name)
+            self.cache.update_cache(stock_name, stock_details)
+
+    def update_many(self, entries):
+        stocks = {}
+        for stock_name, stock_details in entries.items():
+            if isinstance(stock_details, NegativeEntry):
+                self._put_negative(stock_name, stock_details)
+            elif stock_details is not None:
+                self._remove_negative(stock_name)
+                stocks[stock_name] = stock_details
+        self.cache.update_many(stocks)
+
+    def invalidate_stock(self, stock_name):
+        self._remove_negative(stock_name)
+        self.cache.invalidate_stock(stock_name)
+
+    def refresh_cache(self, stock_name, stock_details):
+        # A change event means the stock exists
+        self._remove_negative(stock_name)
+        self.cache.refresh_cache(stock_name, stock_details)
+
+    def clear(self):
+        with self.lock:
+            self.negatives.clear()
+        self.cache.clear()
+
+    def stats(self):
+        with self.lock:
+            negative_entries = len(self.negatives)
+        return {**self.cache.stats(), "negative_entries": negative_entries}
+
+    def __getattr__(self, name):
+        return getattr(self.cache, name)
+
+class GenerationCache:
+    """
+    Wraps a cache and drops fills of values that became stale while they were looked up.
+
+    Every stock has a generation that `invalidate_stock` bumps before removing the entry, and
+    `refresh_cache` before refreshing it, so trades placed through this frontend and change events of
+    the catalog feed both move it; `clear` moves the generation of every stock. A lookup reads
+    the generation before calling the catalog and passes it to `update_cache` / `update_many`; the fill
+    is stored, and removed again if the generation moved meanwhile. Checking after storing rather than
+    before means no lock has to span both the fill and the invalidation: either the invalidation runs
+    after the fill was stored and removes it, or the fill sees the new generation and removes itself.
+
+    Generations live in the process, each frontend worker wraps its cache with its own.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.generations = {}
+        # Bumped by clear, part of every stock's generation
+        self.clears = 0
+        self.lock = threading.Lock()
+
+    def generation(self, stock_name):
+        """Returns the current generation of a stock, to be passed to the fill of a lookup started now."""
+        return self.clears, self.generations.get(stock_name, 0)
+
+    def _bump(self, stock_name):
+        with self.lock:
+            self.generations[stock_name] = self.generations.get(stock_name, 0) + 1
+
+    def update_cache(self, stock_name, stock_details, generation=None):
+        """Adds stock data to the cache, unless the stock changed since `generation` was read."""
+        self.cache.update_cache(stock_name, stock_details)
+        if generation is not None and self.generation(stock_name) != generation:
+            self.cache.invalidate_stock(stock_name)
+
+    def update_many(self, entries, generations=None):
+        """Adds the entries of a dict of stocks, dropping those that changed since their entry of `generations`."""
+        self.cache.update_many(entries)
+        if generations is not None:
+            for stock_name in entries:
+                if self.generation(stock_name) != generations[stock_name]:
+                    self.cache.invalidate_stock(stock_name)
+
+    def invalidate_stock(self, stock_name):
+        """Removes the stock from the cache, lookups already in flight will not store it again."""
+        self._bump(stock_name)
+        self.cache.invalidate_stock(stock_name)
+
+    def refresh_cache(self, stock_name, stock_details):
+        """
+        Replaces the data of a stock if it is cached, for a change event of the catalog feed.
+
+        A stock that is not cached is left out, a lookup of it already in flight may have read the
+        catalog before the change, so its fill is dropped.
+        """
+        self._bump(stock_name)
+        self.cache.refresh_cache(stock_name, stock_details)
+
+    def clear(self):
+        """Removes every stock from the cache, no lookup already in flight will store one again."""
+        with self.lock:
+            self.clears += 1
+        self.cache.clear()
+
+    def __getattr__(self, name):
+        return getattr(self.cache, name)
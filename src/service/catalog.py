@@ -1,47 +1,88 @@
 import os
 
+import collections
 import csv
+import json
 import threading
 import time
+import zlib
 import grpc
 from concurrent import futures
 
+from channel_pool import SERVER_OPTIONS
+from group_commit import GroupCommitter
+from wal import WriteAheadLog
 import catalog_pb2 as catalog_pb2
 import catalog_pb2_grpc as catalog_pb2_grpc
 
+# Number of change events kept for watchers resuming after a reconnect
+CHANGE_LOG_SIZE = int(os.environ.get("CHANGE_LOG_SIZE")) if os.environ.get("CHANGE_LOG_SIZE") else 1000
+
+# Seconds between snapshots of the catalog file, a snapshot is only written if stocks changed since the last one
+CATALOG_SNAPSHOT_INTERVAL = float(os.environ.get("CATALOG_SNAPSHOT_INTERVAL")) if os.environ.get("CATALOG_SNAPSHOT_INTERVAL") else 5.0
+# When the change log is fsynced, see WAL_FSYNC. "always" acknowledges a trade only once its change is on disk
+CATALOG_WAL_FSYNC = os.environ.get("CATALOG_WAL_FSYNC") if os.environ.get("CATALOG_WAL_FSYNC") else "always"
+
+# Number of lock stripes the stocks are spread over, trades on stocks of different stripes never wait for each other
+CATALOG_LOCK_STRIPES = int(os.environ.get("CATALOG_LOCK_STRIPES")) if os.environ.get("CATALOG_LOCK_STRIPES") else 16
+
+
+class _Change:
+    """A quantity change waiting in a stripe, `stock` and `error` are set once a combiner applied it."""
+
+    def __init__(self, stock_name, quantity_change, error):
+        self.stock_name = stock_name
+        self.quantity_change = quantity_change
+        self.error = error
+        self.stock = None
+        self.commit = None
+        self.applied = False
+
+
+class _Stripe:
+    """
+    Pending changes of the stocks in one lock stripe (flat combining).
+
+    A trade queues its change and, unless another thread is already applying changes to the stripe,
+    becomes the combiner: once the previous pass is written to disk, it takes every change queued so far,
+    including those of other threads, and applies them in one pass. Threads arriving meanwhile queue their
+    changes for the next pass instead of each taking the lock in turn, so a hot stock is updated, persisted
+    and published once per pass however many trades it had.
+    """
 
-# Read-Write Lock implementation
-class ReadWriteLock:
     def __init__(self):
-        self._read_ready = threading.Condition(threading.Lock())
-        self._readers = 0
-        
-    def acquire_read(self):
-        with self._read_ready:
-            self._readers += 1
-            
-    def release_read(self):
-        with self._read_ready:
-            self._readers -= 1
-            if not self._readers:
-                self._read_ready.notify_all()
-                
-    def acquire_write(self):
-        with self._read_ready:
-            while self._readers > 0:
-                self._read_ready.wait()
-                
-    def release_write(self):
-        self._read_ready.acquire()
-        self._read_ready.release()
+        self.condition = threading.Condition()
+        self.pending = []
+        self.combining = False
+        # Group commit batch of the latest pass, the next pass starts once it is written
+        self.last_commit = None
+        self.passes = 0
+        self.changes = 0
 
 class CatalogServiceImpl(catalog_pb2_grpc.CatalogServiceServicer):
     def __init__(self, catalog_file):
         self.catalog_file = catalog_file
+        # Stock records are never modified in place: a change replaces the record, so readers need no lock
         self.stocks = {}
-        self.lock = ReadWriteLock()
+        self.stripes = [_Stripe() for _ in range(CATALOG_LOCK_STRIPES)]
+        # Changes are appended to the log, snapshots rewrite the catalog file and truncate the log
+        self.wal = WriteAheadLog(os.path.splitext(catalog_file)[0] + ".wal", fsync_policy=CATALOG_WAL_FSYNC)
+        # Names of the stocks changed since the last snapshot
+        self.dirty = set()
+        self.dirty_lock = threading.Lock()
+        # Serializes snapshots of the catalog file
+        self.flush_lock = threading.Lock()
+        # Held while a logged batch is published to the stocks, so a snapshot never copies the stocks in between
+        self.commit_lock = threading.Lock()
+        # Change feed for WatchStocks, versions restart from 0 in every epoch (i.e. process start)
+        self.epoch = time.time_ns()
+        self.version = 0
+        self.changes = collections.deque(maxlen=CHANGE_LOG_SIZE)
+        self.changes_ready = threading.Condition()
         self.load_catalog()
-        # Start periodic flushing to disk
+        # Concurrent updates share one log write
+        self.group_commit = GroupCommitter(self.write_changes, "catalog")
+        # Start periodic snapshots
         self.flush_thread = threading.Thread(target=self.periodic_flush, daemon=True)
         self.flush_thread.start()
     
@@ -53,112 +94,364 @@ class CatalogServiceImpl(catalog_pb2_grpc.CatalogServiceServicer):
         price: currrent price of the stock
         quantity: represents the number of shares of a particular stock that are currently available for trading. When someone buys shares, the quantity decreases and when someone sells shares, the quantity increases.
         volume: its a running counter that tracks the total number of shares that have been traded (both bought and sold) over time.
+
+        Changes logged after the last snapshot are then replayed on top, and their stocks are marked dirty so the
+        next snapshot includes them.
         """
-        try:
-            self.lock.acquire_write()
-            if os.path.exists(self.catalog_file):
-                with open(self.catalog_file, 'r') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        self.stocks[row['name']] = {
-                            'name': row['name'],
-                            'price': float(row['price']),
-                            'quantity': int(row['quantity']),
-                            'volume': int(row['volume'])
-                        }
-            else:
-                with open(self.catalog_file, 'w', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=['name', 'price', 'quantity', 'volume'])
-                    writer.writeheader()
-                
-                self.flush_to_disk()
-        finally:
-            self.lock.release_write()
-        
-    def flush_to_disk(self):
-        """Write the catalog to disk"""
-        try:
-            self.lock.acquire_read()
+        if os.path.exists(self.catalog_file):
+            with open(self.catalog_file, 'r') as f:
+                reader = csv.DictReader(f)
+                for row in reader:
+                    self.stocks[row['name']] = {
+                        'name': row['name'],
+                        'price': float(row['price']),
+                        'quantity': int(row['quantity']),
+                        'volume': int(row['volume'])
+                    }
+        else:
             with open(self.catalog_file, 'w', newline='') as f:
                 writer = csv.DictWriter(f, fieldnames=['name', 'price', 'quantity', 'volume'])
                 writer.writeheader()
-                for stock in self.stocks.values():
-                    writer.writerow(stock)
-        finally:
-            self.lock.release_read()
-            
+
+        for payload in self.wal.replay():
+            # Records hold the quantity and volume after the change, so replaying one twice is harmless
+            stock_name, quantity, volume = json.loads(payload)
+            if stock_name in self.stocks:
+                self.stocks[stock_name] = dict(self.stocks[stock_name], quantity=quantity, volume=volume)
+                self.dirty.add(stock_name)
+        if self.dirty:
+            print(f"Replayed changes of {len(self.dirty)} stocks from {self.wal.path}")
+
+    def flush_to_disk(self):
+        """
+        Writes a snapshot of the catalog file if stocks changed since the last one, and truncates the change log.
+
+        The log is rotated first, so every change it held is already in the copied stocks. The snapshot is
+        written to a temp file, fsynced and renamed over the catalog file, the folder is fsynced so the rename
+        is durable, then the rotated log is deleted, so a crash at any point loses nothing.
+
+        Returns:
+            bool: True if a snapshot was written.
+        """
+        with self.flush_lock:
+            with self.dirty_lock:
+                if not self.dirty:
+                    return False
+                dirty, self.dirty = self.dirty, set()
+            try:
+                with self.commit_lock:
+                    self.wal.rotate()
+                    # The set of stocks never changes, only records are replaced, so this is a consistent copy of each stock
+                    stocks = list(self.stocks.values())
+                temp_file = self.catalog_file + ".tmp"
+                with open(temp_file, 'w', newline='') as f:
+                    writer = csv.DictWriter(f, fieldnames=['name', 'price', 'quantity', 'volume'])
+                    writer.writeheader()
+                    for stock in stocks:
+                        writer.writerow(stock)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file, self.catalog_file)
+                # The rename must be durable before the rotated log holding the same changes is deleted
+                fd = os.open(os.path.dirname(os.path.abspath(self.catalog_file)), os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                self.wal.discard_rotated()
+            except Exception:
+                # Still dirty, the next snapshot retries
+                with self.dirty_lock:
+                    self.dirty |= dirty
+                raise
+        return True
+
+    def write_changes(self, stocks):
+        """
+        Appends a group commit batch of changed stock records to the change log, one compact record per stock,
+        then replaces the records in the catalog, marks them dirty for the next snapshot and publishes them to
+        the watchers.
+
+        Runs on the group commit flusher thread, so changes become visible in commit order and only once they
+        are logged: if the append fails, the catalog keeps the previous records.
+        """
+        with self.commit_lock:
+            self.wal.append_many([json.dumps([stock['name'], stock['quantity'], stock['volume']]).encode('utf-8') for stock in stocks])
+            for stock in stocks:
+                self.stocks[stock['name']] = stock
+        with self.dirty_lock:
+            self.dirty.update(stock['name'] for stock in stocks)
+        for stock in stocks:
+            self.publish_change(stock)
+
     def periodic_flush(self):
-        """Periodically flush data to disk"""
+        """Periodically snapshot the catalog to disk, off the request path"""
         while True:
-            time.sleep(5)  # Flush every 5 seconds
-            self.flush_to_disk()
+            time.sleep(CATALOG_SNAPSHOT_INTERVAL)
+            try:
+                self.flush_to_disk()
+            except Exception as e:
+                print(f"Exception in periodic_flush: {str(e)}")
     
     def LookupStock(self, request, context):
         """Looks up the stock in the catalog based on the provided stock name."""
-        try:
-            self.lock.acquire_read()
-            stock_name = request.name
-            if stock_name in self.stocks:
-                stock = self.stocks[stock_name]
-                return catalog_pb2.LookupResponse(
+        stock = self.stocks.get(request.name)
+        if stock is not None:
+            return catalog_pb2.LookupResponse(
+                exists=True,
+                name=stock['name'],
+                price=stock['price'],
+                quantity=stock['quantity']
+            )
+        else:
+            return catalog_pb2.LookupResponse(exists=False)
+    
+    def LookupStocks(self, request, context):
+        """
+        Looks up several stocks in one call.
+
+        Returns:
+            - stocks: A `LookupResponse` per requested name, in the same order, with `exists` False for unknown names.
+        """
+        stocks = []
+        for stock_name in request.names:
+            stock = self.stocks.get(stock_name)
+            if stock is None:
+                stocks.append(catalog_pb2.LookupResponse(exists=False, name=stock_name))
+            else:
+                stocks.append(catalog_pb2.LookupResponse(
                     exists=True,
                     name=stock['name'],
                     price=stock['price'],
                     quantity=stock['quantity']
-                )
-            else:
-                return catalog_pb2.LookupResponse(exists=False)
-        finally:
-            self.lock.release_read()
-    
+                ))
+        return catalog_pb2.LookupStocksResponse(stocks=stocks)
+
     def UpdateStock(self, request, context):
-        """Updates the quantity of a stock in the catalog."""
-        try:
-            self.lock.acquire_write()
-            stock_name = request.name
-            quantity_change = request.quantity_change
-            
-            if stock_name not in self.stocks:
-                return catalog_pb2.UpdateResponse(
-                    success=False,
-                    message="Stock not found",
-                    new_quantity=0
-                )
-            
-            stock = self.stocks[stock_name]
-            new_quantity = stock['quantity'] + quantity_change
-            
+        """
+        Updates the quantity of a stock in the catalog.
+
+        The update is acknowledged (and published to watchers) once its record is appended to the change
+        log, the append is shared with the other updates waiting at that time through `group_commit`.
+        """
+        stock, error = self.change_quantity(request.name, request.quantity_change)
+        if error:
+            return catalog_pb2.UpdateResponse(success=False, message=error, new_quantity=stock['quantity'] if stock else 0)
+        return catalog_pb2.UpdateResponse(
+            success=True,
+            message="Stock updated successfully",
+            new_quantity=stock['quantity']
+        )
+
+    def ReserveStock(self, request, context):
+        """
+        Checks and applies a trade in one step: a buy takes `quantity` shares if that many are available,
+        a sell returns them. Replaces a `LookupStock` followed by an `UpdateStock`, which could race with
+        other trades between the two calls.
+
+        Returns:
+            - success (bool): True if the trade was applied.
+            - message (str): Why the trade was rejected, e.g. "Insufficient stock".
+            - new_quantity (int): The quantity after the trade, or the current quantity if it was rejected.
+            - price (float): The price of the stock.
+        """
+        return self.UpdateStocks(catalog_pb2.UpdateStocksRequest(items=[request]), context).results[0]
+
+    def UpdateStocks(self, request, context):
+        """
+        Checks and applies the trades of a basket, each one like `ReserveStock`.
+
+        The trades are applied in order under one acquisition of the write lock and written to disk together,
+        so a basket costs one round trip and one catalog write however many trades it has. A rejected trade
+        does not affect the others.
+
+        Returns:
+            - results: A `ReserveResponse` per trade, in the order of `request.items`.
+        """
+        changes = []
+        for item in request.items:
+            if item.order_type not in ("buy", "sell"):
+                changes.append((item.name, None, f"Invalid order type {item.order_type}"))
+            elif item.quantity <= 0:
+                changes.append((item.name, None, "Quantity must be positive"))
+            else:
+                changes.append((item.name, -item.quantity if item.order_type == "buy" else item.quantity, None))
+
+        results = []
+        for stock, error in self.change_quantities(changes):
+            if stock is None:
+                results.append(catalog_pb2.ReserveResponse(success=False, message=error))
+            else:
+                results.append(catalog_pb2.ReserveResponse(
+                    success=not error,
+                    message=error or "Stock reserved successfully",
+                    new_quantity=stock['quantity'],
+                    price=stock['price']
+                ))
+        return catalog_pb2.UpdateStocksResponse(results=results)
+
+    def change_quantity(self, stock_name, quantity_change):
+        """
+        Applies a quantity change to a stock under the write lock and waits until it is written to disk.
+
+        Returns:
+            tuple: (stock, error). `stock` is a copy of the stock after the change, or None if it does not
+            exist. `error` is None on success, otherwise the reason the change was rejected.
+        """
+        return self.change_quantities([(stock_name, quantity_change, None)])[0]
+
+    def change_quantities(self, changes):
+        """
+        Applies quantity changes through the combiners of their stripes, then waits until they are written to disk.
+
+        Changes of one stripe are applied in order, each one on its own: a rejected change does not affect
+        the others.
+
+        Args:
+            changes: List of (stock_name, quantity_change, error) tuples, a change with an error is not applied.
+
+        Returns:
+            list: A (stock, error) tuple per change, as returned by `change_quantity`.
+        """
+        queued = [_Change(stock_name, quantity_change, error) for stock_name, quantity_change, error in changes]
+        by_stripe = {}
+        for change in queued:
+            by_stripe.setdefault(self.stripe(change.stock_name), []).append(change)
+        for stripe, stripe_changes in by_stripe.items():
+            self.combine(stripe, stripe_changes)
+
+        for commit in {change.commit for change in queued if change.commit is not None}:
+            commit.wait()
+        return [(change.stock, change.error) for change in queued]
+
+    def stripe(self, stock_name):
+        # crc32 rather than hash() so the stripes do not depend on the hash seed
+        return self.stripes[zlib.crc32(stock_name.encode('utf-8')) % len(self.stripes)]
+
+    def combine(self, stripe, changes):
+        """Queues changes on a stripe and returns once a combiner, possibly this thread, applied them."""
+        with stripe.condition:
+            stripe.pending.extend(changes)
+            while not changes[-1].applied:
+                if stripe.combining:
+                    stripe.condition.wait()
+                    continue
+                stripe.combining = True
+                if stripe.last_commit is not None and not stripe.last_commit.done.is_set():
+                    # Changes queued while the previous pass is written are combined into this one
+                    stripe.condition.release()
+                    stripe.last_commit.done.wait()
+                    stripe.condition.acquire()
+                batch, stripe.pending = stripe.pending, []
+                stripe.condition.release()
+                commit = None
+                try:
+                    commit = self.apply_changes(batch)
+                finally:
+                    for change in batch:
+                        if not change.applied:
+                            # Only if applying failed, the waiting threads must not wait forever
+                            change.error = change.error or "Stock update failed"
+                            change.applied = True
+                    stripe.condition.acquire()
+                    stripe.combining = False
+                    stripe.last_commit = commit or stripe.last_commit
+                    stripe.passes += 1
+                    stripe.changes += len(batch)
+                    stripe.condition.notify_all()
+
+    def apply_changes(self, batch):
+        """
+        Applies the queued changes of one stripe in order and submits the changed stocks as one group commit
+        record set. Only the combiner of the stripe calls it, so it has the stocks of the stripe to itself.
+
+        The new records are staged: `write_changes` puts them in the catalog once they are logged, and the
+        next pass of the stripe starts only after that, so it reads them from there.
+
+        Returns:
+            The group commit batch of the pass, None if no change was applied.
+        """
+        changed = {}
+        for change in batch:
+            stock = changed.get(change.stock_name) or self.stocks.get(change.stock_name)
+            if change.error or stock is None:
+                change.stock = stock
+                change.error = change.error or "Stock not found"
+                continue
+            new_quantity = stock['quantity'] + change.quantity_change
             if new_quantity < 0:
-                return catalog_pb2.UpdateResponse(
-                    success=False,
-                    message="Insufficient stock",
-                    new_quantity=stock['quantity']
-                )
-            
-            # Update stock quantity
-            stock['quantity'] = new_quantity
-            
-            # Update trading volume if buying or selling
-            if quantity_change != 0:
-                stock['volume'] += abs(quantity_change)
-            
-            # Immediate flush to disk after update
-            self.flush_to_disk()
-            
-            return catalog_pb2.UpdateResponse(
-                success=True,
-                message="Stock updated successfully",
-                new_quantity=new_quantity
-            )
-        finally:
-            self.lock.release_write()
+                change.stock = stock
+                change.error = "Insufficient stock"
+                continue
+
+            # Update stock quantity and trading volume, as a new record so readers never see a partial update
+            stock = dict(stock, quantity=new_quantity, volume=stock['volume'] + abs(change.quantity_change))
+            changed[change.stock_name] = stock
+            change.stock = stock
+
+        commit = self.group_commit.submit(list(changed.values())) if changed else None
+        for change in batch:
+            if change.error is None:
+                change.commit = commit
+            change.applied = True
+        return commit
+
+    def combining_stats(self):
+        """Returns the number of combining passes, the changes they applied and the average changes per pass."""
+        passes = sum(stripe.passes for stripe in self.stripes)
+        changes = sum(stripe.changes for stripe in self.stripes)
+        return {
+            "passes": passes,
+            "changes": changes,
+            "average_pass_size": round(changes / passes, 2) if passes else 0.0
+        }
+
+    def publish_change(self, stock):
+        """Appends a versioned change event for the stock and wakes up the watchers."""
+        with self.changes_ready:
+            self.version += 1
+            self.changes.append(catalog_pb2.StockEvent(
+                epoch=self.epoch,
+                version=self.version,
+                name=stock['name'],
+                price=stock['price'],
+                quantity=stock['quantity']
+            ))
+            self.changes_ready.notify_all()
+
+    def WatchStocks(self, request, context):
+        """
+        Streams versioned stock change events.
+
+        Watchers resume from the last (epoch, version) they received. If that point is no longer in
+        the change log, or belongs to a previous epoch, a `reset` event is sent first so the watcher
+        drops everything it derived from older events, and streaming continues from the current version.
+        The reset event lists every stock name so watchers can rebuild their set of known symbols.
+        """
+        last_version = request.from_version if request.epoch == self.epoch else -1
+        while context.is_active():
+            with self.changes_ready:
+                if self.version == last_version:
+                    # Wake up periodically to notice cancelled watchers
+                    self.changes_ready.wait(timeout=1)
+                oldest_version = self.changes[0].version if self.changes else self.version + 1
+                if last_version < oldest_version - 1 or last_version > self.version:
+                    # Events after last_version were dropped from the log (or belong to another epoch)
+                    # The stock set only changes on restart, so it is read without the catalog lock
+                    pending = [catalog_pb2.StockEvent(epoch=self.epoch, version=self.version, reset=True,
+                                                      names=list(self.stocks))]
+                else:
+                    pending = [event for event in self.changes if event.version > last_version]
+            for event in pending:
+                yield event
+                last_version = event.version
 
 
 def serve():
     """
     Server code
     """
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=50))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=50), options=SERVER_OPTIONS)
      # for local run update to ./data/catalog_database.csv 
     catalog_pb2_grpc.add_CatalogServiceServicer_to_server(
         CatalogServiceImpl('./data/catalog_database.csv'), server)
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rcatalog.proto\"\x1d\n\rLookupRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"O\n\x0eLookupResponse\x12\x0e\n\x06\x65xists\x18\x01 \x01(\x08\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05price\x18\x03 \x01(\x01\x12\x10\n\x08quantity\x18\x04 \x01(\x05\"6\n\rUpdateRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x17\n\x0fquantity_change\x18\x02 \x01(\x05\"H\n\x0eUpdateResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x14\n\x0cnew_quantity\x18\x03 \x01(\x05\x32p\n\x0e\x43\x61talogService\x12.\n\x0bLookupStock\x12\x0e.LookupRequest\x1a\x0f.LookupResponse\x12.\n\x0bUpdateStock\x12\x0e.UpdateRequest\x1a\x0f.UpdateResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rcatalog.proto\"\x1d\n\rLookupRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"O\n\x0eLookupResponse\x12\x0e\n\x06\x65xists\x18\x01 \x01(\x08\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05price\x18\x03 \x01(\x01\x12\x10\n\x08quantity\x18\x04 \x01(\x05\"$\n\x13LookupStocksRequest\x12\r\n\x05names\x18\x01 \x03(\t\"7\n\x14LookupStocksResponse\x12\x1f\n\x06stocks\x18\x01 \x03(\x0b\x32\x0f.LookupResponse\"6\n\rUpdateRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x17\n\x0fquantity_change\x18\x02 \x01(\x05\"H\n\x0eUpdateResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x14\n\x0cnew_quantity\x18\x03 \x01(\x05\"D\n\x0eReserveRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x12\n\norder_type\x18\x02 \x01(\t\x12\x10\n\x08quantity\x18\x03 \x01(\x05\"X\n\x0fReserveResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x14\n\x0cnew_quantity\x18\x03 \x01(\x05\x12\r\n\x05price\x18\x04 \x01(\x01\"5\n\x13UpdateStocksRequest\x12\x1e\n\x05items\x18\x01 \x03(\x0b\x32\x0f.ReserveRequest\"9\n\x14UpdateStocksResponse\x12!\n\x07results\x18\x01 \x03(\x0b\x32\x10.ReserveResponse\"3\n\x0cWatchRequest\x12\r\n\x05\x65poch\x18\x01 \x01(\x03\x12\x14\n\x0c\x66rom_version\x18\x02 \x01(\x03\"y\n\nStockEvent\x12\r\n\x05\x65poch\x18\x01 \x01(\x03\x12\x0f\n\x07version\x18\x02 \x01(\x03\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\r\n\x05price\x18\x04 \x01(\x01\x12\x10\n\x08quantity\x18\x05 \x01(\x05\x12\r\n\x05reset\x18\x06 \x01(\x08\x12\r\n\x05names\x18\x07 \x03(\t2\xca\x02\n\x0e\x43\x61talogService\x12.\n\x0bLookupStock\x12\x0e.LookupRequest\x1a\x0f.LookupResponse\x12;\n\x0cLookupStocks\x12\x14.LookupStocksRequest\x1a\x15.LookupStocksResponse\x12.\n\x0bUpdateStock\x12\x0e.UpdateRequest\x1a\x0f.UpdateResponse\x12\x31\n\x0cReserveStock\x12\x0f.ReserveRequest\x1a\x10.ReserveResponse\x12;\n\x0cUpdateStocks\x12\x14.UpdateStocksRequest\x1a\x15.UpdateStocksResponse\x12+\n\x0bWatchStocks\x12\r.WatchRequest\x1a\x0b.StockEvent0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -35,10 +35,26 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_LOOKUPREQUEST']._serialized_end=46
   _globals['_LOOKUPRESPONSE']._serialized_start=48
   _globals['_LOOKUPRESPONSE']._serialized_end=127
-  _globals['_UPDATEREQUEST']._serialized_start=129
-  _globals['_UPDATEREQUEST']._serialized_end=183
-  _globals['_UPDATERESPONSE']._serialized_start=185
-  _globals['_UPDATERESPONSE']._serialized_end=257
-  _globals['_CATALOGSERVICE']._serialized_start=259
-  _globals['_CATALOGSERVICE']._serialized_end=371
+  _globals['_LOOKUPSTOCKSREQUEST']._serialized_start=129
+  _globals['_LOOKUPSTOCKSREQUEST']._serialized_end=165
+  _globals['_LOOKUPSTOCKSRESPONSE']._serialized_start=167
+  _globals['_LOOKUPSTOCKSRESPONSE']._serialized_end=222
+  _globals['_UPDATEREQUEST']._serialized_start=224
+  _globals['_UPDATEREQUEST']._serialized_end=278
+  _globals['_UPDATERESPONSE']._serialized_start=280
+  _globals['_UPDATERESPONSE']._serialized_end=352
+  _globals['_RESERVEREQUEST']._serialized_start=354
+  _globals['_RESERVEREQUEST']._serialized_end=422
+  _globals['_RESERVERESPONSE']._serialized_start=424
+  _globals['_RESERVERESPONSE']._serialized_end=512
+  _globals['_UPDATESTOCKSREQUEST']._serialized_start=514
+  _globals['_UPDATESTOCKSREQUEST']._serialized_end=567
+  _globals['_UPDATESTOCKSRESPONSE']._serialized_start=569
+  _globals['_UPDATESTOCKSRESPONSE']._serialized_end=626
+  _globals['_WATCHREQUEST']._serialized_start=628
+  _globals['_WATCHREQUEST']._serialized_end=679
+  _globals['_STOCKEVENT']._serialized_start=681
+  _globals['_STOCKEVENT']._serialized_end=802
+  _globals['_CATALOGSERVICE']._serialized_start=805
+  _globals['_CATALOGSERVICE']._serialized_end=1135
 # @@protoc_insertion_point(module_scope)
@@ -39,11 +39,31 @@ class CatalogServiceStub(object):
                 request_serializer=catalog__pb2.LookupRequest.SerializeToString,
                 response_deserializer=catalog__pb2.LookupResponse.FromString,
                 _registered_method=True)
+        self.LookupStocks = channel.unary_unary(
+                '/CatalogService/LookupStocks',
+                request_serializer=catalog__pb2.LookupStocksRequest.SerializeToString,
+                response_deserializer=catalog__pb2.LookupStocksResponse.FromString,
+                _registered_method=True)
         self.UpdateStock = channel.unary_unary(
                 '/CatalogService/UpdateStock',
                 request_serializer=catalog__pb2.UpdateRequest.SerializeToString,
                 response_deserializer=catalog__pb2.UpdateResponse.FromString,
                 _registered_method=True)
+        self.ReserveStock = channel.unary_unary(
+                '/CatalogService/ReserveStock',
+                request_serializer=catalog__pb2.ReserveRequest.SerializeToString,
+                response_deserializer=catalog__pb2.ReserveResponse.FromString,
+                _registered_method=True)
+        self.UpdateStocks = channel.unary_unary(
+                '/CatalogService/UpdateStocks',
+                request_serializer=catalog__pb2.UpdateStocksRequest.SerializeToString,
+                response_deserializer=catalog__pb2.UpdateStocksResponse.FromString,
+                _registered_method=True)
+        self.WatchStocks = channel.unary_stream(
+                '/CatalogService/WatchStocks',
+                request_serializer=catalog__pb2.WatchRequest.SerializeToString,
+                response_deserializer=catalog__pb2.StockEvent.FromString,
+                _registered_method=True)
 
 
 class CatalogServiceServicer(object):
@@ -55,12 +75,36 @@ class CatalogServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def LookupStocks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def UpdateStock(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ReserveStock(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UpdateStocks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchStocks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_CatalogServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -69,11 +113,31 @@ def add_CatalogServiceServicer_to_server(servicer, server):
                     request_deserializer=catalog__pb2.LookupRequest.FromString,
                     response_serializer=catalog__pb2.LookupResponse.SerializeToString,
             ),
+            'LookupStocks': grpc.unary_unary_rpc_method_handler(
+                    servicer.LookupStocks,
+                    request_deserializer=catalog__pb2.LookupStocksRequest.FromString,
+                    response_serializer=catalog__pb2.LookupStocksResponse.SerializeToString,
+            ),
             'UpdateStock': grpc.unary_unary_rpc_method_handler(
                     servicer.UpdateStock,
                     request_deserializer=catalog__pb2.UpdateRequest.FromString,
                     response_serializer=catalog__pb2.UpdateResponse.SerializeToString,
             ),
+            'ReserveStock': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReserveStock,
+                    request_deserializer=catalog__pb2.ReserveRequest.FromString,
+                    response_serializer=catalog__pb2.ReserveResponse.SerializeToString,
+            ),
+            'UpdateStocks': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdateStocks,
+                    request_deserializer=catalog__pb2.UpdateStocksRequest.FromString,
+                    response_serializer=catalog__pb2.UpdateStocksResponse.SerializeToString,
+            ),
+            'WatchStocks': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchStocks,
+                    request_deserializer=catalog__pb2.WatchRequest.FromString,
+                    response_serializer=catalog__pb2.StockEvent.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'CatalogService', rpc_method_handlers)
@@ -112,6 +176,33 @@ class CatalogService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def LookupStocks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/CatalogService/LookupStocks',
+            catalog__pb2.LookupStocksRequest.SerializeToString,
+            catalog__pb2.LookupStocksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def UpdateStock(request,
             target,
@@ -138,3 +229,84 @@ class CatalogService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def ReserveStock(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/CatalogService/ReserveStock',
+            catalog__pb2.ReserveRequest.SerializeToString,
+            catalog__pb2.ReserveResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def UpdateStocks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/CatalogService/UpdateStocks',
+            catalog__pb2.UpdateStocksRequest.SerializeToString,
+            catalog__pb2.UpdateStocksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WatchStocks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/CatalogService/WatchStocks',
+            catalog__pb2.WatchRequest.SerializeToString,
+            catalog__pb2.StockEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,113 @@
+import os
+import threading
+import grpc
+
+# Interval between keepalive pings on idle channels
+KEEPALIVE_TIME_MS = int(os.environ.get("GRPC_KEEPALIVE_TIME_MS")) if os.environ.get("GRPC_KEEPALIVE_TIME_MS") else 30000
+KEEPALIVE_TIMEOUT_MS = int(os.environ.get("GRPC_KEEPALIVE_TIMEOUT_MS")) if os.environ.get("GRPC_KEEPALIVE_TIMEOUT_MS") else 10000
+
+DEFAULT_CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", KEEPALIVE_TIME_MS),
+    ("grpc.keepalive_timeout_ms", KEEPALIVE_TIMEOUT_MS),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.initial_reconnect_backoff_ms", 200),
+    ("grpc.max_reconnect_backoff_ms", 5000),
+]
+
+# Servers have to accept the keepalive pings sent by pooled channels, otherwise they answer with GOAWAY
+SERVER_OPTIONS = [
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.min_ping_interval_without_data_ms", min(KEEPALIVE_TIME_MS, 10000)),
+    ("grpc.http2.max_ping_strikes", 0),
+]
+
+
+class ChannelPool:
+    """
+    Pool of long-lived gRPC channels and stubs keyed by address.
+
+    Channels are created on first use and shared by every caller in the process, so a call only pays
+    the TCP/HTTP2 handshake once per backend. A failed call never closes a channel, that would cancel
+    every other call and stream on it; the channel reconnects by itself with the keepalive and reconnect
+    backoff of `DEFAULT_CHANNEL_OPTIONS`.
+    """
+
+    def __init__(self, options=None):
+        self.options = list(options) if options is not None else list(DEFAULT_CHANNEL_OPTIONS)
+        self.channels = {}
+        self.stubs = {}
+        self.lock = threading.Lock()
+
+    def get_channel(self, address):
+        """Returns the pooled channel for the address, creating it if needed."""
+        channel = self.channels.get(address)
+        if channel is None:
+            with self.lock:
+                channel = self.channels.get(address)
+                if channel is None:
+                    channel = grpc.insecure_channel(address, options=self.options)
+                    self.channels[address] = channel
+        return channel
+
+    def get_stub(self, address, stub_class):
+        """
+        Returns a stub of the given class bound to the pooled channel for the address.
+
+        Args:
+            address (str): host:port of the backend.
+            stub_class: Generated stub class, e.g. `catalog_pb2_grpc.CatalogServiceStub`.
+        """
+        key = (address, stub_class)
+        stub = self.stubs.get(key)
+        if stub is None:
+            channel = self.get_channel(address)
+            with self.lock:
+                stub = self.stubs.get(key)
+                if stub is None:
+                    stub = stub_class(channel)
+                    self.stubs[key] = stub
+        return stub
+
+    def close(self):
+        """Closes every pooled channel."""
+        with self.lock:
+            channels = list(self.channels.values())
+            self.channels.clear()
+            self.stubs.clear()
+        for channel in channels:
+            channel.close()
+
+
+class AsyncChannelPool:
+    """
+    `ChannelPool` counterpart for `grpc.aio` channels.
+
+    Has to be used from a single event loop, the channels are bound to the loop they were created on.
+    """
+
+    def __init__(self, options=None):
+        self.options = list(options) if options is not None else list(DEFAULT_CHANNEL_OPTIONS)
+        self.channels = {}
+        self.stubs = {}
+
+    def get_stub(self, address, stub_class):
+        """Returns a stub of the given class bound to the pooled aio channel for the address."""
+        key = (address, stub_class)
+        stub = self.stubs.get(key)
+        if stub is None:
+            channel = self.channels.get(address)
+            if channel is None:
+                channel = grpc.aio.insecure_channel(address, options=self.options)
+                self.channels[address] = channel
+            stub = stub_class(channel)
+            self.stubs[key] = stub
+        return stub
+
+    async def close(self):
+        """Closes every pooled channel."""
+        channels = list(self.channels.values())
+        self.channels.clear()
+        self.stubs.clear()
+        for channel in channels:
+            await channel.close()
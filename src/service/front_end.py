@@ -1,13 +1,23 @@
-from cache import Cache
+from cache import EncodedResponse, GenerationCache, NegativeCache, NegativeEntry, ShardedCache, TracingCache
+from membership import ReplicaMembership
+from channel_pool import ChannelPool
+from latency import LatencyRecorder
+from async_front_end import serve_async
+from shared_cache import SharedCache
+from single_flight import SingleFlight
+from stock_watcher import StockWatcher
+import argparse
+import asyncio
 import json
 import http.server
+import multiprocessing
+import socket
 import socketserver
 import grpc
 import concurrent.futures
 import urllib.parse
 import os  
 import time
-import threading
 
 import catalog_pb2 as catalog_pb2
 import catalog_pb2_grpc as catalog_pb2_grpc
@@ -20,6 +30,7 @@ executor = concurrent.futures.ThreadPoolExecutor(max_workers=50)
 ENABLE_CACHE = True  # Set to False to test without cache
 catalog_ip = os.environ.get("CATALOG_IP") if os.environ.get("CATALOG_IP") else "localhost"
 order_ip = os.environ.get("ORDER_IP") if os.environ.get("ORDER_IP") else "localhost"
+CATALOG_ADDRESS = f"{catalog_ip}:50052"
 
 REPLICAS = [
     {"replica_id": 1, "address": "localhost:50054", "status":False},
@@ -27,190 +38,43 @@ REPLICAS = [
     {"replica_id": 3, "address": "localhost:50056", "status":False}
 ]
 
-global_cache = Cache(max_size=10)
+CACHE_SIZE = 10
+# Number of independently locked cache shards and their eviction policy (lru, clock, lfu, arc or tinylfu)
+CACHE_SHARDS = int(os.environ.get("CACHE_SHARDS")) if os.environ.get("CACHE_SHARDS") else 4
+CACHE_POLICY = os.environ.get("CACHE_POLICY") if os.environ.get("CACHE_POLICY") else "lru"
+# Cache stocks as pre-encoded response bodies with an ETag, hits then skip serialization and support 304 responses
+CACHE_ENCODED_RESPONSES = os.environ.get("CACHE_ENCODED_RESPONSES", "1").lower() in ("1", "true", "yes")
+# When set, every cache lookup and invalidation is appended to this file for tests/cache-policy-replay.py
+CACHE_TRACE_FILE = os.environ.get("CACHE_TRACE_FILE")
+global_cache = ShardedCache(max_size=CACHE_SIZE, num_shards=CACHE_SHARDS, policy=CACHE_POLICY)
+# Placed orders never change, so looked up and placed orders are cached without invalidation
+ORDER_CACHE_SIZE = int(os.environ.get("ORDER_CACHE_SIZE")) if os.environ.get("ORDER_CACHE_SIZE") else 1000
+global_order_cache = ShardedCache(max_size=ORDER_CACHE_SIZE, num_shards=CACHE_SHARDS)
+# Long-lived gRPC channels shared by every request handler
+global_channel_pool = ChannelPool()
+# Coalesces concurrent catalog lookups of the same stock
+stock_lookups = SingleFlight()
+# Most stocks looked up by one GET /stocks?names=...
+STOCK_BATCH_MAX_SIZE = int(os.environ.get("STOCK_BATCH_MAX_SIZE")) if os.environ.get("STOCK_BATCH_MAX_SIZE") else 100
+# Most orders accepted by one POST /orders/batch
+ORDER_BATCH_MAX_SIZE = int(os.environ.get("ORDER_BATCH_MAX_SIZE")) if os.environ.get("ORDER_BATCH_MAX_SIZE") else 1000
+# Latency of placed orders per replication durability
+trade_latency = LatencyRecorder()
+# Follows the catalog change feed, also knows which stock names exist (set in start_background_tasks)
+stock_watcher = None
 
 class FrontendHandler(http.server.BaseHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
-        # Extract the replicas and cache_size from kwargs
-        self.replicas = kwargs.pop('replicas', None)
+        # Extract the shared replica membership from kwargs
+        self.membership = kwargs.pop('membership', None)
 
         # Initialize the cache with the cache_size
         self.cache = global_cache
-        self.leader = None
-        self.followers = []
-        self.faulty_replicas = {}
-        self.elect_leader()
-        self.update_followers()
+        self.order_cache = global_order_cache
+        self.channel_pool = global_channel_pool
         # Call the parent class' constructor to set up the request handler
         super().__init__(*args, **kwargs)
 
-        self.fault_check_thread = threading.Thread(target=self.periodic_faulty_replica_check, daemon=True)
-        self.fault_check_thread.start()
-        
-    
-    def elect_leader(self):
-        """
-            Elects a leader from the available replicas based on their health status.
-            
-            The replicas are sorted by replica_id in descending order. The leader is chosen from the first healthy replica.
-            If no healthy replica is found, the election fails.
-        """
-
-        sorted_replicas = sorted(self.replicas, key=lambda x: x["replica_id"], reverse=True)
-        for each_replica in sorted_replicas:
-            print(each_replica)
-            if self.health_check(each_replica):
-                self.leader = each_replica
-                each_replica["status"] = True
-                print(f"Elected Leader - {each_replica['replica_id']}")
-                return
-        print("All the Order Service Replicas are unresponsive, cannot select the leader")
-        
-    def update_followers(self):
-        """
-        Updates the list of follower replicas by checking the health of each replica.
-        
-        This function iterates through all the replicas (except the leader) and checks their health status.
-        If the replica is healthy, it is added to the followers list. If not, the replica's status is marked as False.
-        """
-        self.followers = []
-        for each_replica in self.replicas:
-             if each_replica["replica_id"] != self.leader["replica_id"]:
-                if self.health_check(each_replica):
-                    self.followers.append(each_replica)
-                    each_replica["status"] = True
-                else:
-                    each_replica["status"] = False
-        print(self.replicas)
-
-    def periodic_faulty_replica_check(self):
-        while True:
-            self.check_and_update_faulty_replicas()
-
-    def check_and_update_faulty_replicas(self):   
-        """
-        Checks the status of faulty replicas and attempts to sync them with the leader if they become healthy.
-
-        This function identifies inactive replicas (faulty) from the list of replicas and checks if they are healthy again.
-        If a replica becomes healthy, it is synced with the leader using the sync function. If syncing is successful, 
-        the replica's status is updated to active, and the followers list is refreshed.
-        """ 
-        inactive_replicas = [replica for replica in REPLICAS if not replica["status"]]
-        
-        for each_inactive_replica in inactive_replicas:
-            if(self.health_check(each_inactive_replica)):
-                if self.sync_faulty_replica(each_inactive_replica):
-                    print(f" Faulty Replica {each_inactive_replica['replica_id']} synced successfully.")
-                    each_inactive_replica['status']  = True
-                    self.update_followers()
-                else:
-                    print(f"Failed to sync faulty replica {each_inactive_replica['replica_id']}.")
-            else:
-                print(f"Replica {each_inactive_replica['replica_id']} is unresponsive.")
-
-    def sync_faulty_replica(self, replica):
-        """
-        Attempts to sync a faulty replica with the leader's data.
-
-        Args:
-            replica: The replica to be synced.
-
-        Returns:
-            bool: True if the replica was successfully synced, False otherwise.
-        """
-        try:
-            latest_transaction_id = self.get_latest_transaction_id(replica)
-            if latest_transaction_id is not None:
-                orders_to_sync = self.get_orders_to_sync(latest_transaction_id)
-                return self.bulk_upsert_to_replica(replica, orders_to_sync)
-            else:
-                return False
-        except grpc.RpcError as e:
-            print(f"Error syncing replica {replica['replica_id']}: {e.details()}")
-            return False
-    
-    def get_latest_transaction_id(self, replica):
-        """
-        Retrieves the latest transaction ID from a given replica.
-
-        Args:
-            replica (dict): The replica from which the latest transaction ID is to be retrieved.
-
-        Returns:
-            int or None: The latest transaction ID if the request is successful, None if the request fails.
-        """
-        with grpc.insecure_channel(replica["address"]) as channel:
-            stub = order_pb2_grpc.OrderServiceStub(channel)
-            request = order_pb2.LookUpByIdRequest()
-            response = stub.LatesttId(request)
-            if response.success:
-                return response.transaction_id
-            else:
-                print(f"Failed to get latest transaction ID from replica {replica['replica_id']}.")
-                return None
-
-    def get_orders_to_sync(self, latest_transaction_id):
-        """
-        Retrieves the orders that need to be synced with the replica, starting from the given transaction ID.
-
-        Args:
-            latest_transaction_id (int): The transaction ID after which the orders need to be synced.
-
-        Returns:
-            list: A list of orders that need to be synced with the replica. An empty list is returned if no new orders are found.
-        """
-        with grpc.insecure_channel(self.leader["address"]) as channel:
-            stub = order_pb2_grpc.OrderServiceStub(channel)
-            update_request = order_pb2.LookUpByIdRequest(transaction_id=latest_transaction_id)
-            response = stub.LookUpOrdersById(update_request)
-            if response.exists:
-                return response.data
-            else:
-                print(f"No orders to sync after transaction ID {latest_transaction_id}.")
-                return []
-
-    def bulk_upsert_to_replica(self, replica, orders_to_sync):
-        """
-        Syncs the orders to a given replica by performing a bulk upsert operation.
-
-        Args:
-            replica (dict): The replica to which the orders will be synced. 
-            orders_to_sync (list): A list of orders that need to be synced to the replica.
-
-        Returns:
-            bool: Returns `True` if the orders were successfully synced, `False` otherwise.
-        """
-        try:
-            with grpc.insecure_channel(replica["address"]) as channel:
-                stub = order_pb2_grpc.OrderServiceStub(channel)
-                update_request = order_pb2.BulkUpsertRequest(data=orders_to_sync)
-                response = stub.BulkUpsert(update_request)
-                return response.success
-        except grpc.RpcError as e:
-            print(f"Failed to bulk upsert orders to replica {replica['replica_id']}: {e.details()}")
-            return False
-    
-    def health_check(self, replica):
-        """
-        Performs a health check on the given replica by sending a HealthCheck request.
-
-        Args:
-            replica (dict): The replica to be checked. It contains the replica's address.
-
-        Returns:
-            bool: Returns `True` if the replica is healthy, `False` otherwise.
-        """
-        address = replica['address'] if replica else "localhost:50054"
-        try:
-            with grpc.insecure_channel(address) as channel:
-                stub = order_pb2_grpc.OrderServiceStub(channel)
-                health_check_request = order_pb2.HealthCheckRequest()
-                response = stub.HealthCheck(health_check_request)
-                return response.success
-        except grpc.RpcError as e:
-            print(f"Order Service error {e.details()}")
-            return False
-
     def do_GET(self):
         """
             GET API for lookUp based on a stock name
@@ -226,6 +90,21 @@ class FrontendHandler(http.server.BaseHTTPRequestHandler):
                     "price": 15.99,
                     "quantity": 100
                 }
+
+            GET API for lookUp of several stocks, e.g. /stocks?names=GameStart,NFLX
+
+            API Args:
+                names: Comma separated stock names
+
+            Returns:
+                json of the data of every stock in the requested order, or an error if it does not exist
+                example of data -
+                "data": {
+                    "stocks": [
+                        {"name": "GameStart", "price": 15.99, "quantity": 100},
+                        {"name": "Unknown", "error": {"code": 404, "message": "Stock not found"}}
+                    ]
+                }
             
             GET API for lookUp based on a order id
 
@@ -245,7 +124,19 @@ class FrontendHandler(http.server.BaseHTTPRequestHandler):
         
         try:
             path_parts = self.path.split('/')
-            if "/stocks" in self.path:
+            url = urllib.parse.urlsplit(self.path)
+            if url.path == "/stocks":
+                stock_names = [name for value in urllib.parse.parse_qs(url.query).get("names", [])
+                               for name in value.split(",") if name]
+                # Duplicates are looked up once
+                stock_names = list(dict.fromkeys(stock_names))
+                if not stock_names:
+                    self.send_error_response(400, "Query parameter names is required")
+                elif len(stock_names) > STOCK_BATCH_MAX_SIZE:
+                    self.send_error_response(400, f"At most {STOCK_BATCH_MAX_SIZE} stocks can be looked up at once")
+                else:
+                    self.handle_stocks(stock_names)
+            elif "/stocks" in self.path:
                 if len(path_parts) == 3 and path_parts[1] == 'stocks':
                     # Decode the URL-encoded string (e.g., converts 'Stock%20A' to 'Stock A')
                     stock_name = urllib.parse.unquote(path_parts[2]) 
@@ -267,6 +158,8 @@ class FrontendHandler(http.server.BaseHTTPRequestHandler):
                     self.send_error_response(404, "Order Id variable not found")
 
 
+            elif self.path == "/metrics":
+                self.handle_metrics()
             else: 
                self.send_error_response(404, "Endpoint not found") 
         except Exception as e:
@@ -288,6 +181,25 @@ class FrontendHandler(http.server.BaseHTTPRequestHandler):
                     }
                 } 
 
+        POST API to place a basket of orders at once
+            API payload:
+                {
+                    "orders": [
+                        {"name": "GameStart", "quantity": 1, "type": "sell"},
+                        {"name": "NFLX", "quantity": 500, "type": "buy"}
+                    ]
+                }
+            Returns:
+                A result per order, in the same order
+                {
+                    "data": {
+                        "results": [
+                            {"transaction_id": 11},
+                            {"error": {"code": 400, "message": "Insufficient stock"}}
+                        ]
+                    }
+                }
+
         """
         try:
             if self.path == "/orders":
@@ -304,6 +216,19 @@ class FrontendHandler(http.server.BaseHTTPRequestHandler):
                     return
 
                 self.handle_order(stock_name, quantity, type)
+            elif self.path == "/orders/batch":
+                content_length = int(self.headers['Content-Length'])
+                batch_request = json.loads(self.rfile.read(content_length))
+                orders = batch_request.get("orders") if isinstance(batch_request, dict) else None
+
+                if not isinstance(orders, list) or not orders:
+                    self.send_error_response(400, "Invalid batch request")
+                    return
+                if len(orders) > ORDER_BATCH_MAX_SIZE:
+                    self.send_error_response(400, f"A batch holds at most {ORDER_BATCH_MAX_SIZE} orders")
+                    return
+
+                self.handle_order_batch(orders)
             else:
                 self.send_error_response(404, "Endpoint not found")
         except Exception as e:
@@ -317,62 +242,165 @@ class FrontendHandler(http.server.BaseHTTPRequestHandler):
                 stock_name: The name of stock for which information is needed
 
             Returns:
-                stock details needed in json format
+                stock details needed in json format, None if the stock does not exist
+
+            Raises:
+                grpc.RpcError: If the catalog service cannot be reached.
         """
-        with grpc.insecure_channel(f'localhost:50052') as channel:
-            stub = catalog_pb2_grpc.CatalogServiceStub(channel)
-            request = catalog_pb2.LookupRequest(name=stock_name)
-            
-            try:
-                response = stub.LookupStock(request)
-                if response.exists:
-                    # Stock found, return details
-                    return {
-                        "data": {
-                            "name": response.name,
-                            "price": response.price,
-                            "quantity": response.quantity
-                        }
-                    }
-                else:
-                    # Stock not found
-                    self.send_error_response(404, "Stock not found")
-            except grpc.RpcError as e:
-                self.send_error_response(500, f"Catalog service error: {e.details()}")
+        stub = self.channel_pool.get_stub(CATALOG_ADDRESS, catalog_pb2_grpc.CatalogServiceStub)
+        request = catalog_pb2.LookupRequest(name=stock_name)
+        response = stub.LookupStock(request)
+        if response.exists:
+            # Stock found, return details
+            return {
+                "data": {
+                    "name": response.name,
+                    "price": response.price,
+                    "quantity": response.quantity
+                }
+            }
+        # Stock not found
+        return None
 
+    def lookup_and_cache(self, stock_name):
+        """Looks the stock up in the catalog and stores the result, or a negative entry, in the cache."""
+        # Read before the lookup, so the fill is dropped if a trade or change event made it stale meanwhile
+        generation = self.cache.generation(stock_name)
+        stock_details = self.handle_stock_lookup(stock_name)
+        if stock_details is not None and CACHE_ENCODED_RESPONSES:
+            stock_details = EncodedResponse(stock_details)
+        if ENABLE_CACHE:
+            self.cache.update_cache(stock_name, stock_details if stock_details is not None else NegativeEntry(), generation)
+        return stock_details
 
     def handle_cache(self, stock_name):
         """
             Handles stock lookup, either returning the cached data or performing a fresh lookup.
 
+            Concurrent misses for the same stock share one catalog call through `stock_lookups`,
+            so the catalog sees a single `LookupStock` and the cache is filled once. Names missing from
+            the known-symbol filter of `stock_watcher`, and names the catalog recently reported as
+            unknown (negative cache entries), are answered with a 404 without calling the catalog.
+            Pre-encoded entries are answered with a 304 if the client already has their ETag.
+
             Args:
                 stock_name (str): The name of the stock for which data is needed.
 
             Returns:
                 dict: The stock details in JSON format, sent back in a successful response.
         """
-        print(f"[DEBUG] Handle cache called for {stock_name}")
-        if ENABLE_CACHE and stock_name in self.cache.cache:
-            print(f"[DEBUG] Cache HIT for {stock_name}")
-        else:
-            print(f"[DEBUG] Cache MISS for {stock_name}")
-
-        start_time = time.time()
-        stock_details = self.cache.get_cache(stock_name)
-        if stock_details:
-            print(f"[DEBUG] Returning cached data for {stock_name}")
-            return self.send_success_response(stock_details)
+        if stock_watcher is not None and not stock_watcher.might_exist(stock_name):
+            return self.send_error_response(404, "Stock not found")
 
-        stock_details = self.handle_stock_lookup(stock_name)
-        print(f"[DEBUG] gRPC catalog call for {stock_name} took {time.time() - start_time:.2f}s")
-        self.cache.update_cache(stock_name, stock_details)
-        return self.send_success_response(stock_details)
+        if ENABLE_CACHE:
+            stock_details = self.cache.get_cache(stock_name)
+            if isinstance(stock_details, NegativeEntry):
+                if stock_details.is_valid():
+                    return self.send_error_response(404, "Stock not found")
+            elif stock_details:
+                return self.send_stock_response(stock_details)
+
+        try:
+            stock_details = stock_lookups.do(stock_name, lambda: self.lookup_and_cache(stock_name))
+        except grpc.RpcError as e:
+            return self.send_error_response(500, f"Catalog service error: {e.details()}")
 
+        if stock_details is None:
+            return self.send_error_response(404, "Stock not found")
+        return self.send_stock_response(stock_details)
 
+    def handle_stocks(self, stock_names):
+        """
+            Looks up several stocks with at most one catalog call.
+
+            Stocks the cache holds are served from it, and names ruled out by the known-symbol filter or a
+            valid negative entry are reported as not found, like in `handle_cache`. All other stocks are
+            fetched with one `LookupStocks` call and added to the cache together.
+
+            Args:
+                stock_names (list): Distinct names of the stocks.
+
+            Returns:
+                dict: The stock details, or a 404 error, per name in json format.
+        """
+        stocks = {}
+        missing = []
+        known = [name for name in stock_names if stock_watcher is None or stock_watcher.might_exist(name)]
+        cached = self.cache.get_many(known) if ENABLE_CACHE else {}
+        for stock_name in known:
+            stock_details = cached.get(stock_name)
+            if isinstance(stock_details, NegativeEntry):
+                if not stock_details.is_valid():
+                    missing.append(stock_name)
+            elif stock_details:
+                stocks[stock_name] = stock_details
+            else:
+                missing.append(stock_name)
+
+        if missing:
+            try:
+                stocks.update(self.lookup_many_and_cache(missing))
+            except grpc.RpcError as e:
+                return self.send_error_response(500, f"Catalog service error: {e.details()}")
+
+        results = []
+        for stock_name in stock_names:
+            stock_details = stocks.get(stock_name)
+            if stock_details is None:
+                results.append({"name": stock_name, "error": {"code": 404, "message": "Stock not found"}})
+            else:
+                results.append((stock_details.data if isinstance(stock_details, EncodedResponse) else stock_details)["data"])
+        self.send_success_response({"data": {"stocks": results}})
+
+    def lookup_many_and_cache(self, stock_names):
+        """
+            Looks several stocks up with one `LookupStocks` call and adds them, and negative entries for the
+            unknown ones, to the cache in one step.
+
+            Returns:
+                dict: The stock details of the stocks that exist, by name.
+
+            Raises:
+                grpc.RpcError: If the catalog service cannot be reached.
+        """
+        generations = {stock_name: self.cache.generation(stock_name) for stock_name in stock_names}
+        stub = self.channel_pool.get_stub(CATALOG_ADDRESS, catalog_pb2_grpc.CatalogServiceStub)
+        response = stub.LookupStocks(catalog_pb2.LookupStocksRequest(names=stock_names))
+        stocks = {}
+        entries = {}
+        for stock in response.stocks:
+            if not stock.exists:
+                entries[stock.name] = NegativeEntry()
+                continue
+            stock_details = {
+                "data": {
+                    "name": stock.name,
+                    "price": stock.price,
+                    "quantity": stock.quantity
+                }
+            }
+            if CACHE_ENCODED_RESPONSES:
+                stock_details = EncodedResponse(stock_details)
+            stocks[stock.name] = entries[stock.name] = stock_details
+        if ENABLE_CACHE:
+            self.cache.update_many(entries, generations)
+        return stocks
+
+    def handle_metrics(self):
+        """Returns the frontend counters."""
+        self.send_success_response({"data": {
+            "stock_lookups": stock_lookups.stats(),
+            "cache": self.cache.stats(),
+            "order_cache": self.order_cache.stats(),
+            "trades": trade_latency.stats(),
+            "order_reads": self.membership.read_stats()
+        }})
 
     def handle_order_lookup(self, transaction_id):
         """
-            Connect to the order service using gRPC and fetches data
+            Connect to the order service using gRPC and fetches data, unless the order is already cached
+
+            The order is read from a follower that has it when there is one, the leader is the fallback.
 
             Args:
                 transaction_id: The order_id of order for which information is needed
@@ -380,41 +408,83 @@ class FrontendHandler(http.server.BaseHTTPRequestHandler):
             Returns:
                 order details needed in json format
         """
-        address = self.leader["address"] if self.leader else "localhost:50054"
+        if ENABLE_CACHE:
+            order_details = self.order_cache.get_cache(str(transaction_id))
+            if order_details:
+                return self.send_success_response(order_details)
+
+        response = self.lookup_on_follower(transaction_id)
+        if response is not None:
+            return self.send_order_details(transaction_id, response)
+
+        leader = self.membership.get_leader()
+        address = leader["address"] if leader else "localhost:50054"
         print(address)
-        with grpc.insecure_channel(address) as channel:
-            stub = order_pb2_grpc.OrderServiceStub(channel)
-            request = order_pb2.OrderLookUpRequest(transaction_id=transaction_id)
+        stub = self.channel_pool.get_stub(address, order_pb2_grpc.OrderServiceStub)
+        request = order_pb2.OrderLookUpRequest(transaction_id=transaction_id)
 
+        try:
+            if leader:
+                self.membership.start_read(leader)
             try:
                 response = stub.LookUpOrder(request)
-                print(response)
-                if response.exists:
-                    self.send_success_response({"data" : {
-                        "transaction_id": response.transaction_id,
-                        "name": response.stock_name,
-                        "type": response.order_type, 
-                        "quantity": response.quantity
-                    }})
-                else:
-                    self.send_error_response(404, getattr(response, "message", "Order not found"))
-            except grpc.RpcError as e:
-                print(f"gRPC error during order lookup: {e.details()} (code: {e.code()})")
+            finally:
+                if leader:
+                    self.membership.finish_read(leader)
+            if response.exists:
+                self.send_order_details(transaction_id, response)
+            else:
+                self.send_error_response(404, getattr(response, "message", "Order not found"))
+        except grpc.RpcError as e:
+            print(f"gRPC error during order lookup: {e.details()} (code: {e.code()})")
 
-                if e.code() in [grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED]:
-                    print("Leader appears unavailable — triggering leader election.")
-                    self.elect_leader()
-                    self.update_followers()
-
-                    if self.leader:
-                        self.handle_order_lookup(transaction_id)
-                    else:
-                        self.send_error_response(500, "Leader election failed")
+            if e.code() in [grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED]:
+                self.membership.report_failure(leader)
+
+                if self.membership.get_leader():
+                    self.handle_order_lookup(transaction_id)
                 else:
-                    # This means the leader is alive but returned some gRPC error (e.g., internal logic issue)
-                    self.send_error_response(500, f"Order service error: {e.details()}")
+                    self.send_error_response(500, "Leader election failed")
+            else:
+                # This means the leader is alive but returned some gRPC error (e.g., internal logic issue)
+                self.send_error_response(500, f"Order service error: {e.details()}")
+
+    def lookup_on_follower(self, transaction_id):
+        """
+        Looks the order up on a follower the membership picked among those that stored it.
+
+        Returns:
+            The `LookUpOrder` response, or None if no follower is known to have the order, the follower did
+            not find it or failed, so the leader is asked instead.
+        """
+        follower = self.membership.choose_reader(transaction_id)
+        if follower is None:
+            return None
+        stub = self.channel_pool.get_stub(follower["address"], order_pb2_grpc.OrderServiceStub)
+        self.membership.start_read(follower)
+        try:
+            response = stub.LookUpOrder(order_pb2.OrderLookUpRequest(transaction_id=transaction_id))
+            return response if response.exists else None
+        except grpc.RpcError as e:
+            print(f"gRPC error during order lookup on replica {follower['replica_id']}: {e.details()}")
+            if e.code() in [grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED]:
+                self.membership.report_failure(follower)
+            return None
+        finally:
+            self.membership.finish_read(follower)
+
+    def send_order_details(self, transaction_id, response):
+        """Caches and sends a found order."""
+        order_details = {"data" : {
+            "transaction_id": response.transaction_id,
+            "name": response.stock_name,
+            "type": response.order_type, 
+            "quantity": response.quantity
+        }}
+        if ENABLE_CACHE:
+            self.order_cache.update_cache(str(transaction_id), order_details)
+        self.send_success_response(order_details)
 
-                
     def handle_order(self, stock_name, quantity, type):
         """
             Connects to the order service using gRPC and processes the order.
@@ -430,77 +500,141 @@ class FrontendHandler(http.server.BaseHTTPRequestHandler):
                 transaction_id as needed in json format
         """
         # Use the order_ip in the connection string
-        address = self.leader["address"] if self.leader else "localhost:50054"
-        with grpc.insecure_channel(address) as channel:
-            stub = order_pb2_grpc.OrderServiceStub(channel)
-            request = order_pb2.OrderRequest(stock_name=stock_name, quantity=quantity, order_type=type)
-            try:
-                response = stub.PlaceOrder(request)
-                if response.success:
-                    print(f"Cache - {dict(self.cache.cache)}")
-                    print("Invalidating Cache...")
-                    self.cache.invalidate_stock(stock_name)
-                    print(f"Cache - {dict(self.cache.cache)}")
-                    self.update_order_followers(response.transaction_id, stock_name, quantity, type)
+        leader = self.membership.get_leader()
+        address = leader["address"] if leader else "localhost:50054"
+        stub = self.channel_pool.get_stub(address, order_pb2_grpc.OrderServiceStub)
+        request = order_pb2.OrderRequest(stock_name=stock_name, quantity=quantity, order_type=type)
+        try:
+            start = time.perf_counter()
+            response = stub.PlaceOrder(request)
+            if response.success:
+                trade_latency.record(response.durability or "unknown", time.perf_counter() - start)
+                # Lookups already in flight may return the pre-trade quantity, don't let new misses join them
+                stock_lookups.forget(stock_name)
+                self.cache.invalidate_stock(stock_name)
+                if ENABLE_CACHE:
+                    self.order_cache.update_cache(str(response.transaction_id), {"data": {
+                        "transaction_id": response.transaction_id,
+                        "name": stock_name,
+                        "type": type,
+                        "quantity": quantity
+                    }})
+                if response.under_replicated:
+                    # Placed, but not replicated as the durability mode requires: 202 so clients do not retry it
+                    self.send_success_response({
+                        "data": {
+                            "transaction_id": response.transaction_id,
+                            "under_replicated": True,
+                            "message": response.message
+                        }
+                    }, 202)
+                else:
                     self.send_success_response({
                         "data": {
                             "transaction_id": response.transaction_id
                         }
                     })
+            else:
+                self.send_error_response(400, response.message)
+        except grpc.RpcError as e:
+            print(f"gRPC error during place order: {e.details()}")
+            if e.code() in [grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED]:
+                self.membership.report_failure(leader)
+                if self.membership.get_leader():
+                    self.handle_order(stock_name, quantity, type)
                 else:
-                    self.send_error_response(400, response.message)
-            except grpc.RpcError as e:
-                print(f"gRPC error during place order: {e.details()}")
-                if e.code() in [grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED]:
-                    self.elect_leader()
-                    self.update_followers()
-                    if self.leader:
-                        self.handle_order(stock_name, quantity, type)
-                    else:
-                        self.send_error_response(500, "Leader election failed")
-                else:
-                    # This means the leader is alive but returned some gRPC error (e.g., internal logic issue)
-                    self.send_error_response(500, f"Order service error: {e.details()}")
-
+                    self.send_error_response(500, "Leader election failed")
+            else:
+                # This means the leader is alive but returned some gRPC error (e.g., internal logic issue)
+                self.send_error_response(500, f"Order service error: {e.details()}")
 
-    def update_order_followers(self, transaction_id, stock_name, quantity, type):
+    def handle_order_batch(self, orders):
         """
-        Updates the order information on all follower replicas after a new order is placed.
+            Places a basket of orders with one `PlaceOrders` call to the leader.
 
-        Args:
-            transaction_id (int): The unique ID of the order that was just placed.
-            stock_name (str): The name of the stock that was involved in the order.
-            quantity (int): The quantity of the stock that was traded.
-            type (str): The type of the order (either "buy" or "sell").
+            Orders that fail validation are answered without being sent. The leader applies the others
+            with one catalog call and one log write, each one succeeds or fails on its own.
 
-        Returns:
-            None: This function does not return a value but sends error responses as needed.
+            Args:
+                orders: List of order payloads as accepted by POST /orders.
+
+            Returns:
+                A result per order in json format, the transaction_id (flagged `under_replicated` if it was
+                not replicated as the durability mode requires) or an error with a status code
         """
-        for each_follower in self.followers:
-            if(self.health_check(each_follower)):
-                with grpc.insecure_channel(each_follower["address"]) as channel:
-                    stub = order_pb2_grpc.OrderServiceStub(channel)
-                    request = order_pb2.OrderSyncRequest(transaction_id= transaction_id, stock_name=stock_name, quantity=quantity, order_type=type)
-                    try:
-                        response = stub.SyncOrder(request)
-                        if response.success:
-                            print(f"Order service replica {each_follower['replica_id']} updated")
-                        else:
-                            print(f"Order service replica {each_follower['replica_id']} updatation failed")
-
-                    except grpc.RpcError as e:
-                        self.send_error_response(500, f"Order service replica {each_follower['replica_id']} error: {e.details()}")
-            else:
-                for each_replica in self.replicas:
-                    if(each_replica["replica_id"] ==  each_follower["replica_id"]):
-                        each_replica["status"] = False
+        results = [None] * len(orders)
+        positions = []
+        requests = []
+        for index, order in enumerate(orders):
+            stock_name = order.get("name") if isinstance(order, dict) else None
+            quantity = order.get("quantity") if isinstance(order, dict) else None
+            if not stock_name or not isinstance(quantity, int) or quantity <= 0:
+                results[index] = {"error": {"code": 400, "message": "Invalid order request"}}
+                continue
+            positions.append(index)
+            requests.append(order_pb2.OrderRequest(stock_name=stock_name, quantity=quantity, order_type=order.get("type")))
+
+        if requests:
+            leader = self.membership.get_leader()
+            address = leader["address"] if leader else "localhost:50054"
+            stub = self.channel_pool.get_stub(address, order_pb2_grpc.OrderServiceStub)
+            try:
+                start = time.perf_counter()
+                response = stub.PlaceOrders(order_pb2.PlaceOrdersRequest(orders=requests))
+            except grpc.RpcError as e:
+                print(f"gRPC error during place orders: {e.details()}")
+                if e.code() in [grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED]:
+                    self.membership.report_failure(leader)
+                    if self.membership.get_leader():
+                        return self.handle_order_batch(orders)
+                    return self.send_error_response(500, "Leader election failed")
+                return self.send_error_response(500, f"Order service error: {e.details()}")
+
+            elapsed = time.perf_counter() - start
+            durability = next((result.durability for result in response.results if result.success), None)
+            if durability is not None:
+                # One sample per basket
+                trade_latency.record(f"{durability or 'unknown'} batch", elapsed)
+            changed = set()
+            for index, request, result in zip(positions, requests, response.results):
+                if result.transaction_id >= 0:
+                    changed.add(request.stock_name)
+                if result.success:
+                    results[index] = {"transaction_id": result.transaction_id}
+                    if result.under_replicated:
+                        results[index]["under_replicated"] = True
+                    if ENABLE_CACHE:
+                        self.order_cache.update_cache(str(result.transaction_id), {"data": {
+                            "transaction_id": result.transaction_id,
+                            "name": request.stock_name,
+                            "type": request.order_type,
+                            "quantity": request.quantity
+                        }})
+                else:
+                    results[index] = {"error": {"code": 400, "message": result.message}}
+            for stock_name in changed:
+                stock_lookups.forget(stock_name)
+                self.cache.invalidate_stock(stock_name)
 
-    def send_success_response(self, data):
-        self.send_response(200)
+        self.send_success_response({"data": {"results": results}})
+
+    def send_success_response(self, data, code=200):
+        self.send_response(code)
         self.send_header('Content-Type', 'application/json')
         self.end_headers()
         self.wfile.write(json.dumps(data).encode('utf-8'))
     
+    def send_stock_response(self, stock_details):
+        """Sends stock details, an `EncodedResponse` is written as-is or as a 304 if the client has its ETag."""
+        if not isinstance(stock_details, EncodedResponse):
+            return self.send_success_response(stock_details)
+        if stock_details.matches(self.headers.get("If-None-Match")):
+            self.log_request(304)
+            self.wfile.write(f"{self.protocol_version} 304 Not Modified\r\nETag: {stock_details.etag}\r\n\r\n".encode('latin-1'))
+            return
+        self.log_request(200)
+        self.wfile.write(b"".join([f"{self.protocol_version} 200 OK\r\n".encode('latin-1'), stock_details.headers, b"\r\n", stock_details.body]))
+
     def send_error_response(self, code, message):
         self.send_response(code)
         self.send_header('Content-Type', 'application/json')
@@ -516,14 +650,82 @@ class FrontendHandler(http.server.BaseHTTPRequestHandler):
 class ThreadedHTTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
     allow_reuse_address = True
 
-def run_server(port):
-    handler = lambda *args, **kwargs: FrontendHandler(*args, replicas=REPLICAS, **kwargs)
-    server = ThreadedHTTPServer(("", port), handler)
+class ReusePortHTTPServer(ThreadedHTTPServer):
+    """ThreadedHTTPServer that lets several worker processes bind the same port (SO_REUSEPORT)."""
+    def server_bind(self):
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+def start_background_tasks():
+    """Starts the replica membership and the cache change feed, returns the membership."""
+    global global_cache, stock_watcher
+    forked_worker = isinstance(global_cache, SharedCache)
+    # Negative entries and generations are per process, so forked workers wrap the shared cache themselves
+    global_cache = GenerationCache(NegativeCache(global_cache))
+    if CACHE_TRACE_FILE:
+        # Forked workers each write their own trace so lines do not interleave
+        trace_file = f"{CACHE_TRACE_FILE}.{os.getpid()}" if forked_worker else CACHE_TRACE_FILE
+        # Outside the generation layer, so a fill it drops is not traced as an invalidation
+        global_cache = TracingCache(global_cache, trace_file)
+    membership = ReplicaMembership(REPLICAS, channel_pool=global_channel_pool)
+    membership.start()
+    if ENABLE_CACHE:
+        stock_watcher = StockWatcher(global_cache, CATALOG_ADDRESS, global_channel_pool, encode_responses=CACHE_ENCODED_RESPONSES)
+        stock_watcher.start()
+    return membership
+
+def run_server(port, reuse_port=False):
+    membership = start_background_tasks()
+    handler = lambda *args, **kwargs: FrontendHandler(*args, membership=membership, **kwargs)
+    server_class = ReusePortHTTPServer if reuse_port else ThreadedHTTPServer
+    server = server_class(("", port), handler)
     print(f"Front-end service started on port {port}")
     server.serve_forever()
 
-if __name__ == "__main__":
-    SERVER_PORT = 8081
-    run_server(SERVER_PORT)
+def run_async_server(port, reuse_port=False):
+    """Serves the API from a single asyncio event loop with persistent HTTP/1.1 connections."""
+    membership = start_background_tasks()
+    asyncio.run(serve_async(port, global_cache, global_order_cache, membership, CATALOG_ADDRESS,
+                            enable_cache=ENABLE_CACHE, encode_responses=CACHE_ENCODED_RESPONSES,
+                            stock_watcher=stock_watcher, reuse_port=reuse_port))
+
+def run_prefork(port, workers, mode):
+    """
+    Runs `workers` frontend processes on the same port via SO_REUSEPORT.
+
+    The stock cache is moved to a shared-memory segment before forking, so a lookup cached by one
+    worker is a hit for all of them and invalidations reach every worker. No gRPC channel may be
+    opened before the fork, each worker builds its own channels and replica membership.
+    """
+    global global_cache
+    global_cache = SharedCache(max_size=CACHE_SIZE)
+    target = run_async_server if mode == "async" else run_server
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=target, args=(port, True)) for _ in range(workers)]
+    try:
+        for process in processes:
+            process.start()
+        print(f"Front-end service started {workers} {mode} workers on port {port}")
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        global_cache.close(unlink=True)
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Front-end Service")
+    parser.add_argument("--mode", choices=["threaded", "async"], default="threaded",
+                        help="threaded: one thread per connection (HTTP/1.0), async: asyncio event loop (HTTP/1.1 keep-alive)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes sharing the port and a shared-memory stock cache")
+    args = parser.parse_args()
 
+    SERVER_PORT = 8081
+    if args.workers > 1:
+        run_prefork(SERVER_PORT, args.workers, args.mode)
+    elif args.mode == "async":
+        run_async_server(SERVER_PORT)
+    else:
+        run_server(SERVER_PORT)
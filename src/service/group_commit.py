@@ -0,0 +1,113 @@
+import collections
+import os
+import threading
+import time
+
+# Most records written by one batch, and how long the flusher waits for a batch to fill up (0 flushes
+# as soon as the previous batch is done, batches then form only from writers arriving during a flush)
+GROUP_COMMIT_MAX_BATCH = int(os.environ.get("GROUP_COMMIT_MAX_BATCH")) if os.environ.get("GROUP_COMMIT_MAX_BATCH") else 256
+GROUP_COMMIT_MAX_DELAY = float(os.environ.get("GROUP_COMMIT_MAX_DELAY_MS")) / 1000 if os.environ.get("GROUP_COMMIT_MAX_DELAY_MS") else 0.0
+# Seconds between batch statistics printed to the log
+REPORT_INTERVAL = 30.0
+
+
+class _Batch:
+    """Records committed together, every writer of the batch waits on the same event."""
+
+    def __init__(self):
+        self.records = []
+        self.done = threading.Event()
+        self.error = None
+
+    def wait(self):
+        """Blocks until the batch is written, re-raises the error of the write if it failed."""
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+
+
+class GroupCommitter:
+    """
+    Makes concurrent writers share one durable write.
+
+    Writers `submit` records and `wait` on the returned batch; a single flusher thread hands each batch
+    to `write_batch` (e.g. one log write plus one fsync) and then releases all of its writers together.
+    Records are written in the order they were submitted, so a writer that submits while holding its
+    own lock and waits after releasing it keeps its ordering without holding the lock during the fsync.
+    """
+
+    def __init__(self, write_batch, name, max_batch_size=GROUP_COMMIT_MAX_BATCH, max_delay=GROUP_COMMIT_MAX_DELAY):
+        self.write_batch = write_batch
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.condition = threading.Condition()
+        self.batches = collections.deque()
+        self.batch_count = 0
+        self.record_count = 0
+        self.largest_batch = 0
+        self.last_report = time.monotonic()
+        self.thread = threading.Thread(target=self.flush_forever, daemon=True)
+        self.thread.start()
+
+    def submit(self, records):
+        """
+        Queues records to be written by the next batch that has room for them.
+
+        Args:
+            records: List of records, they are always written in the same batch.
+
+        Returns:
+            The batch, call `wait()` on it to block until the records are written.
+        """
+        with self.condition:
+            if not self.batches or len(self.batches[-1].records) + len(records) > self.max_batch_size:
+                self.batches.append(_Batch())
+            batch = self.batches[-1]
+            batch.records.extend(records)
+            self.condition.notify()
+            return batch
+
+    def commit(self, records):
+        """Submits records and waits until they are written."""
+        self.submit(records).wait()
+
+    def flush_forever(self):
+        while True:
+            with self.condition:
+                while not self.batches:
+                    self.condition.wait()
+                if self.max_delay:
+                    deadline = time.monotonic() + self.max_delay
+                    while len(self.batches) == 1 and len(self.batches[0].records) < self.max_batch_size:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self.condition.wait(remaining)
+                batch = self.batches.popleft()
+
+            try:
+                self.write_batch(batch.records)
+            except Exception as e:
+                print(f"[GroupCommit {self.name}] Writing a batch of {len(batch.records)} records failed: {str(e)}")
+                batch.error = e
+            batch.done.set()
+            self.record_stats(len(batch.records))
+
+    def record_stats(self, size):
+        self.batch_count += 1
+        self.record_count += size
+        self.largest_batch = max(self.largest_batch, size)
+        if time.monotonic() - self.last_report >= REPORT_INTERVAL:
+            self.last_report = time.monotonic()
+            stats = self.stats()
+            print(f"[GroupCommit {self.name}] {stats['records']} records in {stats['batches']} batches, "
+                  f"average batch size {stats['average_batch_size']}, largest {stats['largest_batch']}")
+
+    def stats(self):
+        return {
+            "batches": self.batch_count,
+            "records": self.record_count,
+            "average_batch_size": round(self.record_count / self.batch_count, 2) if self.batch_count else 0.0,
+            "largest_batch": self.largest_batch
+        }
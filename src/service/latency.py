@@ -0,0 +1,48 @@
+import os
+import threading
+from collections import deque
+
+# Latency samples kept per label for the percentiles
+LATENCY_WINDOW = int(os.environ.get("LATENCY_WINDOW")) if os.environ.get("LATENCY_WINDOW") else 10000
+
+
+class LatencyRecorder:
+    """
+    Latencies of recent calls grouped by a label, e.g. the replication durability of a trade.
+
+    The last `window` samples of each label are kept to report percentiles, the count covers every
+    recorded call.
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.counts = {}
+
+    def record(self, label, seconds):
+        with self.lock:
+            if label not in self.samples:
+                self.samples[label] = deque(maxlen=self.window)
+                self.counts[label] = 0
+            self.samples[label].append(seconds)
+            self.counts[label] += 1
+
+    def stats(self):
+        """
+        Returns:
+            dict: Per label the call count and the mean, p50, p90, p99 and max latency in milliseconds.
+        """
+        with self.lock:
+            snapshot = {label: (self.counts[label], sorted(samples)) for label, samples in self.samples.items()}
+        stats = {}
+        for label, (count, samples) in snapshot.items():
+            stats[label] = {
+                "count": count,
+                "mean_ms": round(1000 * sum(samples) / len(samples), 3),
+                "p50_ms": round(1000 * samples[len(samples) // 2], 3),
+                "p90_ms": round(1000 * samples[int(len(samples) * 0.9)], 3),
+                "p99_ms": round(1000 * samples[int(len(samples) * 0.99)], 3),
+                "max_ms": round(1000 * samples[-1], 3)
+            }
+        return stats
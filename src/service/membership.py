@@ -0,0 +1,303 @@
+import os
+import random
+import threading
+import time
+import grpc
+
+from channel_pool import ChannelPool
+import order_pb2 as order_pb2
+import order_pb2_grpc as order_pb2_grpc
+
+# Seconds between background probes of the replicas
+PROBE_INTERVAL = float(os.environ.get("PROBE_INTERVAL")) if os.environ.get("PROBE_INTERVAL") else 2.0
+# Upper bound for the exponential backoff applied to unresponsive replicas
+MAX_PROBE_BACKOFF = float(os.environ.get("MAX_PROBE_BACKOFF")) if os.environ.get("MAX_PROBE_BACKOFF") else 30.0
+
+
+class ReplicaMembership:
+    """
+    Process-wide view of the order service replicas.
+
+    Holds the current leader and followers and keeps them up to date from a single background
+    thread, so request handlers read a cached view instead of health checking replicas themselves.
+    Unresponsive replicas are re-probed with exponential backoff and synced with the leader once
+    they come back.
+
+    `lock` only guards the cached view and is never held during an RPC: health checks and
+    `SetFollowers` calls work on a snapshot taken under it, and the lock is taken again to publish
+    their result, so handlers reading the view never wait behind a failover.
+    """
+
+    def __init__(self, replicas, channel_pool=None, probe_interval=PROBE_INTERVAL, max_backoff=MAX_PROBE_BACKOFF):
+        self.replicas = replicas
+        self.channel_pool = channel_pool if channel_pool is not None else ChannelPool()
+        self.probe_interval = probe_interval
+        self.max_backoff = max_backoff
+        self.leader = None
+        self.followers = []
+        self.lock = threading.RLock()
+        # Serializes leader elections, which health check replicas without holding `lock`
+        self.election_lock = threading.Lock()
+        # replica_id -> (next probe time, current backoff delay) for unresponsive replicas
+        self.backoff = {}
+        self.probe_thread = None
+        # (leader id, follower addresses) last sent to the replicas with `announce_followers`
+        self.announced = None
+        # address -> highest transaction id the leader reported the follower has stored
+        self.applied = {}
+        # address -> order reads in flight, and replica_id -> order reads sent
+        self.outstanding = {}
+        self.reads = {}
+
+    def start(self):
+        """Runs the initial leader election and starts the background probe thread."""
+        self.elect_leader()
+        leader = self.get_leader()
+        for each_replica in self.replicas:
+            if each_replica is not leader:
+                if self.health_check(each_replica):
+                    with self.lock:
+                        each_replica["status"] = True
+                else:
+                    self.mark_unresponsive(each_replica)
+        self.update_followers()
+        if self.probe_thread is None:
+            self.probe_thread = threading.Thread(target=self.periodic_probe, daemon=True)
+            self.probe_thread.start()
+
+    def get_leader(self):
+        """Returns the cached leader replica, or None if no replica is responsive."""
+        with self.lock:
+            return self.leader
+
+    def get_followers(self):
+        """Returns a copy of the cached list of follower replicas."""
+        with self.lock:
+            return list(self.followers)
+
+    def choose_reader(self, transaction_id):
+        """
+        Picks a follower to read the order with `transaction_id` from.
+
+        Only followers the leader reported to have stored the id are considered. Of two of them picked at
+        random, the one with fewer reads in flight is chosen (power of two choices).
+
+        Returns:
+            dict or None: The follower, or None if no follower is known to have the order, then the leader
+            is read from.
+        """
+        with self.lock:
+            candidates = [replica for replica in self.followers if self.applied.get(replica["address"], -1) >= transaction_id]
+            if not candidates:
+                return None
+            # Random order breaks ties, so idle followers share the reads
+            candidates = random.sample(candidates, min(len(candidates), 2))
+            return min(candidates, key=lambda replica: self.outstanding.get(replica["address"], 0))
+
+    def start_read(self, replica):
+        """Counts a read sent to the replica, to be paired with `finish_read`."""
+        with self.lock:
+            self.outstanding[replica["address"]] = self.outstanding.get(replica["address"], 0) + 1
+            self.reads[replica["replica_id"]] = self.reads.get(replica["replica_id"], 0) + 1
+
+    def finish_read(self, replica):
+        with self.lock:
+            self.outstanding[replica["address"]] -= 1
+
+    def read_stats(self):
+        """Returns the number of order reads sent to each replica, keyed by replica id."""
+        with self.lock:
+            return dict(self.reads)
+
+    def elect_leader(self, failed=None):
+        """
+            Elects a leader from the available replicas based on their health status.
+
+            The replicas are sorted by replica_id in descending order. The leader is chosen from the first healthy replica.
+            If no healthy replica is found, the election fails. The health checks run without holding `lock`, the
+            result is published under it.
+
+            Args:
+                failed (dict): The leader that failed, if given the election is skipped when another thread
+                    already replaced it.
+        """
+        with self.election_lock:
+            with self.lock:
+                if failed is not None and self.leader is not None and self.leader["replica_id"] != failed["replica_id"]:
+                    return
+                sorted_replicas = sorted(self.replicas, key=lambda x: x["replica_id"], reverse=True)
+            for each_replica in sorted_replicas:
+                if self.health_check(each_replica):
+                    with self.lock:
+                        self.leader = each_replica
+                        each_replica["status"] = True
+                        self.backoff.pop(each_replica["replica_id"], None)
+                    print(f"Elected Leader - {each_replica['replica_id']}")
+                    return
+                self.mark_unresponsive(each_replica)
+            with self.lock:
+                self.leader = None
+            print("All the Order Service Replicas are unresponsive, cannot select the leader")
+
+    def update_followers(self):
+        """
+        Updates the list of follower replicas from the replicas currently marked as active.
+
+        Only the leader is excluded, the health of each replica is maintained by the background probe
+        and by `report_failure`, so no health checks are issued here. If the followers changed they are
+        sent to the replicas, after releasing the lock.
+        """
+        with self.lock:
+            leader_id = self.leader["replica_id"] if self.leader else None
+            self.followers = [replica for replica in self.replicas
+                              if replica["replica_id"] != leader_id and replica["status"]]
+            changed = (leader_id, [replica["address"] for replica in self.followers]) != self.announced
+        if changed:
+            self.announce_followers()
+
+    def announce_followers(self):
+        """
+        Tells the leader which followers to replicate its orders to, and every other active replica that it
+        has none. Sent whenever the leader or the followers change and on every probe, so a restarted
+        leader picks up its followers again.
+        """
+        with self.lock:
+            leader = self.leader
+            addresses = [replica["address"] for replica in self.followers]
+            active_replicas = [replica for replica in self.replicas if replica["status"]]
+            self.announced = (leader["replica_id"] if leader else None, addresses)
+        for each_replica in active_replicas:
+            try:
+                stub = self.channel_pool.get_stub(each_replica["address"], order_pb2_grpc.OrderServiceStub)
+                request = order_pb2.SetFollowersRequest(addresses=addresses if each_replica is leader else [],
+                                                       replica_count=len(self.replicas))
+                response = stub.SetFollowers(request, timeout=1)
+                if each_replica is leader:
+                    with self.lock:
+                        for follower in response.followers:
+                            self.applied[follower.address] = follower.match_transaction_id
+            except grpc.RpcError as e:
+                print(f"Could not send the followers to replica {each_replica['replica_id']}: {e.details()}")
+
+    def report_failure(self, replica):
+        """
+        Marks a replica as unresponsive after a failed RPC and re-elects the leader if needed.
+
+        Args:
+            replica (dict): The replica that failed to answer.
+        """
+        if replica is None:
+            return
+        with self.lock:
+            self.mark_unresponsive(replica)
+            leader_failed = self.leader is None or self.leader["replica_id"] == replica["replica_id"]
+        if leader_failed:
+            print("Leader appears unavailable — triggering leader election.")
+            self.elect_leader(failed=replica)
+        self.update_followers()
+
+    def mark_unresponsive(self, replica):
+        """Flags the replica as inactive and schedules its first re-probe."""
+        with self.lock:
+            replica["status"] = False
+            if replica["replica_id"] not in self.backoff:
+                self.backoff[replica["replica_id"]] = (time.time() + self.probe_interval, self.probe_interval)
+
+    def periodic_probe(self):
+        """Background loop probing the replicas every `probe_interval` seconds."""
+        while True:
+            time.sleep(self.probe_interval)
+            try:
+                self.probe_active_replicas()
+                self.check_and_update_faulty_replicas()
+                self.announce_followers()
+            except Exception as e:
+                print(f"Exception in periodic_probe: {str(e)}")
+
+    def probe_active_replicas(self):
+        """Health checks the leader and followers, re-electing the leader if it stopped answering."""
+        for each_replica in [self.get_leader()] + self.get_followers():
+            if each_replica is not None and not self.health_check(each_replica):
+                self.report_failure(each_replica)
+
+    def check_and_update_faulty_replicas(self):
+        """
+        Checks the status of faulty replicas and attempts to sync them with the leader if they become healthy.
+
+        Faulty replicas are only probed once their backoff delay has expired, the delay doubles after every
+        unanswered probe up to `max_backoff`. If a replica becomes healthy, it is synced with the leader using
+        the sync function. If syncing is successful, the replica's status is updated to active, and the followers
+        list is refreshed.
+        """
+        now = time.time()
+        with self.lock:
+            inactive_replicas = [replica for replica in self.replicas if not replica["status"]]
+
+        for each_inactive_replica in inactive_replicas:
+            replica_id = each_inactive_replica["replica_id"]
+            next_probe, delay = self.backoff.get(replica_id, (now, self.probe_interval))
+            if now < next_probe:
+                continue
+
+            if self.health_check(each_inactive_replica):
+                if self.get_leader() is None:
+                    self.elect_leader()
+                    self.update_followers()
+                    continue
+                if self.sync_faulty_replica(each_inactive_replica):
+                    print(f" Faulty Replica {replica_id} synced successfully.")
+                    with self.lock:
+                        each_inactive_replica["status"] = True
+                        self.backoff.pop(replica_id, None)
+                    self.update_followers()
+                    continue
+                print(f"Failed to sync faulty replica {replica_id}.")
+            else:
+                print(f"Replica {replica_id} is unresponsive, next probe in {min(delay * 2, self.max_backoff):.0f}s.")
+            delay = min(delay * 2, self.max_backoff)
+            self.backoff[replica_id] = (now + delay, delay)
+
+    def sync_faulty_replica(self, replica):
+        """
+        Attempts to sync a faulty replica with the leader's data.
+
+        The replica pulls the orders it is missing straight from the leader over a chunked `CatchUp`
+        stream, so they are not relayed through this process in one message.
+
+        Args:
+            replica: The replica to be synced.
+
+        Returns:
+            bool: True if the replica was successfully synced, False otherwise.
+        """
+        try:
+            stub = self.channel_pool.get_stub(replica["address"], order_pb2_grpc.OrderServiceStub)
+            response = stub.CatchUpFrom(order_pb2.CatchUpFromRequest(leader_address=self.get_leader()["address"]))
+            if response.success:
+                print(f"Replica {replica['replica_id']} caught up with {response.applied} orders, next transaction ID {response.transaction_id}.")
+            else:
+                print(f"Replica {replica['replica_id']} could not catch up: {response.message}")
+            return response.success
+        except grpc.RpcError as e:
+            print(f"Error syncing replica {replica['replica_id']}: {e.details()}")
+            return False
+
+    def health_check(self, replica):
+        """
+        Performs a health check on the given replica by sending a HealthCheck request.
+
+        Args:
+            replica (dict): The replica to be checked. It contains the replica's address.
+
+        Returns:
+            bool: Returns `True` if the replica is healthy, `False` otherwise.
+        """
+        address = replica['address'] if replica else "localhost:50054"
+        try:
+            stub = self.channel_pool.get_stub(address, order_pb2_grpc.OrderServiceStub)
+            health_check_request = order_pb2.HealthCheckRequest()
+            response = stub.HealthCheck(health_check_request, timeout=1)
+            return response.success
+        except grpc.RpcError as e:
+            print(f"Order Service error {e.details()}")
+            return False
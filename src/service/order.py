@@ -1,17 +1,41 @@
 import os
 import csv
+import json
 import threading
 import time
 import grpc
 from concurrent import futures
+from itertools import islice
 import argparse
 
+from channel_pool import ChannelPool, SERVER_OPTIONS
+from group_commit import GroupCommitter
+from order_snapshot import read_snapshot, write_snapshot
+from order_store import OrderStore
+from replication import Replicator
+from wal import WriteAheadLog
 import catalog_pb2 as catalog_pb2
 import catalog_pb2_grpc as catalog_pb2_grpc
 import order_pb2 as order_pb2
 import order_pb2_grpc as order_pb2_grpc
 
 catalog_ip = os.environ.get("CATALOG_IP") if os.environ.get("CATALOG_IP") else "localhost"
+CATALOG_ADDRESS = f"{catalog_ip}:50052"
+# Seconds between checkpoints, which write an order snapshot and truncate the order log
+CHECKPOINT_INTERVAL = float(os.environ.get("ORDER_CHECKPOINT_INTERVAL")) if os.environ.get("ORDER_CHECKPOINT_INTERVAL") else 30.0
+# Orders per message of a catch-up stream
+CATCH_UP_CHUNK_SIZE = int(os.environ.get("CATCH_UP_CHUNK_SIZE")) if os.environ.get("CATCH_UP_CHUNK_SIZE") else 1000
+# Compression a recovering replica asks the leader for: "gzip", "deflate" or empty for none
+CATCH_UP_COMPRESSION = os.environ.get("CATCH_UP_COMPRESSION") if os.environ.get("CATCH_UP_COMPRESSION") else ""
+# Times an interrupted catch-up stream is resumed before giving up
+CATCH_UP_RETRIES = int(os.environ.get("CATCH_UP_RETRIES")) if os.environ.get("CATCH_UP_RETRIES") else 3
+# Seconds between catch-up progress lines
+CATCH_UP_PROGRESS_INTERVAL = 1.0
+
+# Seconds a placed order waits for the followers its replication durability requires
+REPLICATION_ACK_TIMEOUT = float(os.environ.get("REPLICATION_ACK_TIMEOUT")) if os.environ.get("REPLICATION_ACK_TIMEOUT") else 5.0
+
+COMPRESSION = {"gzip": grpc.Compression.Gzip, "deflate": grpc.Compression.Deflate}
 
 # Read-Write Lock for synchronization
 class ReadWriteLock: 
@@ -45,26 +69,38 @@ class ReadWriteLock:
 
 
 class OrderServiceImpl(order_pb2_grpc.OrderServiceServicer):
-    def __init__(self, order_file, replica_id):
+    def __init__(self, order_file, replica_id, catalog_address=CATALOG_ADDRESS):
         self.order_file = order_file
         self.replica_id = replica_id
+        self.catalog_address = catalog_address
+        # Long-lived channel to the catalog shared by all PlaceOrder calls
+        self.channel_pool = ChannelPool()
         print(f"Order service running as Replica {self.replica_id} with database {self.order_file}")
-        self.orders = []
-        self.orders_map = {}
+        self.store = OrderStore()
         self.transaction_id = 0
         self.lock = ReadWriteLock()
+        # Orders are appended to the log as they are placed, checkpoints write them all to the snapshot and
+        # truncate the log. The CSV file is only read when there is no snapshot yet.
+        self.snapshot_file = os.path.splitext(order_file)[0] + ".snapshot"
+        self.wal = WriteAheadLog(os.path.splitext(order_file)[0] + ".wal")
         self.load_orders()
+        # Concurrent orders share one log write (and fsync)
+        self.group_commit = GroupCommitter(self.wal.append_many, f"order replica {self.replica_id}")
+        # Streams new orders to the followers while this replica is the leader
+        self.replicator = Replicator(self.read_orders, self.store.max_id(), self.channel_pool)
+        print(f"Replica {self.replica_id} replicates orders with {self.replicator.durability} durability")
 
-        # Start periodic flushing to disk
+        # Start periodic checkpoints
         self.flush_thread = threading.Thread(target=self.periodic_flush, daemon=True)
         self.flush_thread.start()
 
     def load_orders(self):
         """
-        Loads order data from the CSV file into memory and initializes the transaction ID.
+        Loads order data into memory and initializes the transaction ID.
 
-        This function reads from the `order_file` (CSV file) and loads all existing orders into the `orders` list
-        and `orders_map` dictionary. 
+        The orders are loaded from the latest binary snapshot (`order_database_N.snapshot`), or on the very
+        first start from the `order_file` (CSV file), into the `store`. Then the orders logged after the
+        snapshot are replayed.
         In the code the following data fields have been used:
         `transaction_id`: Unique identifier for each order transaction.
         `stock_name`: The name of the stock involved in the order (e.g., "AAPL", "GOOGL").
@@ -73,54 +109,103 @@ class OrderServiceImpl(order_pb2_grpc.OrderServiceServicer):
         """
         try:
             self.lock.acquire_write()
-            if os.path.exists(self.order_file):
+            if os.path.exists(self.snapshot_file):
+                self.store = OrderStore.from_columns(read_snapshot(self.snapshot_file))
+            elif os.path.exists(self.order_file):
                 with open(self.order_file, 'r') as f:
                     reader = csv.DictReader(f)
                     for row in reader:
-                        self.orders.append({
+                        self.add_order({
                             'transaction_id': int(row['transaction_id']),
                             'stock_name': row['stock_name'],
                             'order_type': row['order_type'],
                             'quantity': int(row['quantity'])
                         })
-                        self.orders_map[row['transaction_id']] = {
-                            'transaction_id': int(row['transaction_id']),
-                            'stock_name': row['stock_name'],
-                            'order_type': row['order_type'],
-                            'quantity': int(row['quantity'])
-                        }
-                    if self.orders:
-                        self.transaction_id = max(order['transaction_id'] for order in self.orders) + 1
-            else:
-                with open(self.order_file, 'w', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=['transaction_id', 'stock_name', 'order_type', 'quantity'])
-                    writer.writeheader()
+
+            replayed = 0
+            for payload in self.wal.replay():
+                transaction_id, stock_name, order_type, quantity = json.loads(payload)
+                if transaction_id not in self.store:
+                    self.add_order({
+                        'transaction_id': transaction_id,
+                        'stock_name': stock_name,
+                        'order_type': order_type,
+                        'quantity': quantity
+                    })
+                    replayed += 1
+            if replayed:
+                print(f"Replayed {replayed} orders from {self.wal.path}")
+            if len(self.store):
+                self.transaction_id = self.store.max_id() + 1
         finally:
             self.lock.release_write()
 
+    def add_order(self, order):
+        """Adds an order to the in-memory store. Caller holds the write lock."""
+        self.store.add(order['transaction_id'], order['stock_name'], order['order_type'], order['quantity'])
+
+    def log_orders(self, orders):
+        """
+        Queues orders for the order log, one record each, in the next group commit.
+
+        The caller holds the write lock so records are logged in transaction order, and should release
+        it before waiting on the returned batch.
+
+        Returns:
+            The group commit batch, its `wait()` returns once the orders are written.
+        """
+        return self.group_commit.submit([
+            json.dumps([order['transaction_id'], order['stock_name'], order['order_type'], order['quantity']]).encode('utf-8')
+            for order in orders
+        ])
+
+    def read_orders(self, transaction_id, limit):
+        """
+        Reads up to `limit` stored orders with an id of at least `transaction_id`, under the read lock.
+
+        Returns:
+            list: `OrderSyncRequest` messages in transaction id order.
+        """
+        self.lock.acquire_read()
+        try:
+            return [order_pb2.OrderSyncRequest(
+                transaction_id=order['transaction_id'],
+                stock_name=order['stock_name'],
+                order_type=order['order_type'],
+                quantity=order['quantity']
+            ) for order in islice(self.store.orders_from(transaction_id), limit)]
+        finally:
+            self.lock.release_read()
+
     def flush_to_disk(self):
-        """Write the order to disk"""
-        with open(self.order_file, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=['transaction_id', 'stock_name', 'order_type', 'quantity'])
-            writer.writeheader()
-            for order in self.orders:
-                writer.writerow(order)
-
-    def safe_flush_to_disk(self):
+        """
+        Checkpoints the orders: writes them all to a binary snapshot and truncates the order log.
+
+        Only copying the order columns and rotating the log happen under the lock, the snapshot is written
+        while orders keep being placed. It replaces the old snapshot atomically, and the rotated log records
+        are kept until then, so a crash at any point loses nothing.
+        """
         try:
             self.lock.acquire_write()
-            self.flush_to_disk()
+            # Nothing to do unless orders were logged, or the orders still come from the CSV file
+            if not self.wal.records and os.path.exists(self.snapshot_file):
+                return
+            columns = self.store.to_columns()
+            self.wal.rotate()
         finally:
             self.lock.release_write()
 
+        write_snapshot(self.snapshot_file, columns)
+        self.wal.discard_rotated()
+
     def periodic_flush(self):
-        """Periodically flush data to disk"""
-        try:
-            while True:
-                time.sleep(5)
-                self.safe_flush_to_disk()
-        except Exception as e:
-            print(f"Exception in periodic_flush: {str(e)}")
+        """Periodically checkpoint the orders to disk"""
+        while True:
+            time.sleep(CHECKPOINT_INTERVAL)
+            try:
+                self.flush_to_disk()
+            except Exception as e:
+                print(f"Exception in periodic_flush: {str(e)}")
 
     def HealthCheck(self, request, context):
         """Health check for the Order Service."""
@@ -145,11 +230,8 @@ class OrderServiceImpl(order_pb2_grpc.OrderServiceServicer):
             self.lock.acquire_read()
             transactoin_id = request.transaction_id
             print(f"Order trancsaction Id {transactoin_id}")
-            print(self.orders_map)
-            print(str(transactoin_id) in self.orders_map)
-            if str(transactoin_id) in self.orders_map:
-                order = self.orders_map[str(transactoin_id)]
-                print(order)
+            order = self.store.get(transactoin_id)
+            if order is not None:
                 return order_pb2.OrderLookUpResponse(
                     exists=True,
                     transaction_id=order['transaction_id'],
@@ -165,8 +247,8 @@ class OrderServiceImpl(order_pb2_grpc.OrderServiceServicer):
         finally:
             self.lock.release_read()
     
-    def LatesttId(self, request, context):
-        """Retrieves the latest transaction ID."""
+    def get_latest_transaction_id(self, request, context):
+        """Retrieves the next transaction ID this replica would assign."""
         try: 
             return order_pb2.LatestOrderResponse(success=True, transaction_id=self.transaction_id)
         except Exception as e:
@@ -184,48 +266,66 @@ class OrderServiceImpl(order_pb2_grpc.OrderServiceServicer):
             - message (str): A message providing more details about the operation.
         """
         try:
-            data = request.data
-            self.lock.acquire_write()
+            self.apply_orders(request.data)
+            return order_pb2.BulkUpsertResponse(success=True, message=f"Replica {self.replica_id} updated successfully")
+        except Exception as e:
+            print(f"Error occurred during bulk upsert: {str(e)}")
+            return order_pb2.BulkUpsertResponse(success=False, message=f"Error occurred during bulk upsert: {str(e)}")
+
+    def apply_orders(self, data):
+        """
+        Stores and logs the orders of a sync that are not present yet, and waits until they are logged.
 
+        Args:
+            data: `OrderSyncRequest` messages in transaction id order.
+
+        Returns:
+            int: The number of orders that were new.
+        """
+        new_orders = []
+        commit = None
+        self.lock.acquire_write()
+        try:
             for order in data:
-                if str(order.transaction_id) not in self.orders_map:
-                    self.orders.append({
+                if order.transaction_id not in self.store:
+                    new_orders.append({
                         'transaction_id': order.transaction_id,
                         'stock_name': order.stock_name,
                         'order_type': order.order_type,
                         'quantity': order.quantity
                     })
-                    self.orders_map[str(order.transaction_id)] = order
-            self.flush_to_disk()
             if data:
-                self.transaction_id = max(self.transaction_id, data[-1].transaction_id)
-            return order_pb2.BulkUpsertResponse(success=True, message=f"Replica {self.replica_id} updated successfully")
-        except Exception as e:
-            print(f"Error occurred during bulk upsert: {str(e)}")
-            return order_pb2.BulkUpsertResponse(success=False, message=f"Error occurred during bulk upsert: {str(e)}")
-
+                self.transaction_id = max(self.transaction_id, data[-1].transaction_id + 1)
+            if not new_orders:
+                # Nothing to log, e.g. a sync that only repeats orders already stored
+                return 0
+            commit = self.log_orders(new_orders)
+            for new_order in new_orders:
+                self.add_order(new_order)
         finally:
             # Ensure the write lock is always released
             self.lock.release_write()
+        if commit is not None:
+            commit.wait()
+        self.replicator.notify(new_orders[-1]['transaction_id'])
+        return len(new_orders)
 
     def LookUpOrdersById(self, request, context):
         """Fetches all orders with transaction IDs greater than the provided transaction ID."""
         try:
             transaction_id = request.transaction_id
-            orders_after = []
 
+            # Orders are addressed by id, so only the tail after transaction_id is visited
             self.lock.acquire_read()
-
-            for order in self.orders:
-                if order['transaction_id'] > transaction_id:
-                    orders_after.append(order_pb2.OrderSyncRequest(
-                        transaction_id=order['transaction_id'],
-                        stock_name=order['stock_name'],
-                        order_type=order['order_type'],
-                        quantity=order['quantity']
-                    ))
-
-            self.lock.release_read()
+            try:
+                orders_after = [order_pb2.OrderSyncRequest(
+                    transaction_id=order['transaction_id'],
+                    stock_name=order['stock_name'],
+                    order_type=order['order_type'],
+                    quantity=order['quantity']
+                ) for order in self.store.orders_from(transaction_id + 1)]
+            finally:
+                self.lock.release_read()
 
             if not orders_after:
                 return order_pb2.LookUpByIdResponse(exists=False, message = f"No new order present after {transaction_id}")
@@ -234,6 +334,103 @@ class OrderServiceImpl(order_pb2_grpc.OrderServiceServicer):
         except Exception as e:
             return order_pb2.LookUpByIdResponse(exists=False, message = f"Error while fetching orders after transaction_id {transaction_id}: {str(e)}")
 
+    def CatchUp(self, request, context):
+        """
+        Streams the orders after `request.transaction_id` to a recovering replica in chunks.
+
+        Only one chunk is read (under the read lock) at a time: the next one is read once gRPC has sent
+        the previous one, so a slow replica holds back the leader through HTTP/2 flow control instead of
+        the whole tail being buffered.
+
+        Args:
+            request: The id to start after, the chunk size and the compression to use.
+
+        Yields:
+            CatchUpChunk: Up to `chunk_size` orders and the highest id logged on the leader, for progress.
+        """
+        chunk_size = request.chunk_size if request.chunk_size > 0 else CATCH_UP_CHUNK_SIZE
+        if request.compression in COMPRESSION:
+            context.set_compression(COMPRESSION[request.compression])
+        next_id = request.transaction_id + 1
+        while context.is_active():
+            # Like the replication streams, only orders this replica has logged are sent
+            leader_transaction_id = self.replicator.committed_id
+            orders = [order for order in self.read_orders(next_id, chunk_size) if order.transaction_id <= leader_transaction_id]
+            if not orders:
+                return
+            next_id = orders[-1].transaction_id + 1
+            yield order_pb2.CatchUpChunk(data=orders, leader_transaction_id=leader_transaction_id)
+
+    def CatchUpFrom(self, request, context):
+        """
+        Pulls the orders this replica is missing from the leader over a `CatchUp` stream.
+
+        Every chunk is stored and logged before the next one is read. If the stream breaks, it is
+        resumed after the last applied order, up to `CATCH_UP_RETRIES` times.
+
+        Args:
+            request: The address of the leader.
+
+        Returns:
+            - success (bool): True if the replica caught up with the leader.
+            - applied (int): The number of orders stored.
+            - transaction_id (int): The next transaction ID of this replica.
+        """
+        stub = self.channel_pool.get_stub(request.leader_address, order_pb2_grpc.OrderServiceStub)
+        applied = 0
+        attempt = 0
+        last_report = time.time()
+        while True:
+            self.lock.acquire_read()
+            after = self.transaction_id - 1
+            self.lock.release_read()
+            try:
+                chunks = stub.CatchUp(order_pb2.CatchUpRequest(
+                    transaction_id=after, chunk_size=CATCH_UP_CHUNK_SIZE, compression=CATCH_UP_COMPRESSION))
+                for chunk in chunks:
+                    applied += self.apply_orders(chunk.data)
+                    if time.time() - last_report >= CATCH_UP_PROGRESS_INTERVAL:
+                        last_report = time.time()
+                        print(f"Replica {self.replica_id} catching up: at {chunk.data[-1].transaction_id} of {chunk.leader_transaction_id}, {applied} orders applied")
+                print(f"Replica {self.replica_id} caught up with {applied} orders from {request.leader_address}")
+                return order_pb2.CatchUpFromResponse(success=True, message=f"Replica {self.replica_id} caught up",
+                                                     applied=applied, transaction_id=self.transaction_id)
+            except grpc.RpcError as e:
+                attempt += 1
+                if attempt > CATCH_UP_RETRIES:
+                    return order_pb2.CatchUpFromResponse(success=False, message=f"Catch-up from {request.leader_address} failed: {e.details()}",
+                                                         applied=applied, transaction_id=self.transaction_id)
+                print(f"Catch-up stream from {request.leader_address} interrupted ({e.details()}), resuming after {self.transaction_id - 1}")
+                time.sleep(0.2 * 2 ** attempt)
+
+    def SetFollowers(self, request, context):
+        """
+        Sets the followers this replica replicates its orders to, sent by the frontend membership.
+
+        The leader gets the addresses of the active followers, every other replica an empty list.
+
+        Returns:
+            - success (bool): True once the replication streams are updated.
+            - followers: The connection state and match index of every follower.
+        """
+        self.replicator.set_followers(list(request.addresses), request.replica_count)
+        return order_pb2.SetFollowersResponse(success=True, followers=self.replicator.status())
+
+    def Replicate(self, request_iterator, context):
+        """
+        Follower side of the replication stream from the leader.
+
+        Stores and logs the orders of every append, then acknowledges it with the highest logged id.
+        The first, empty append is answered right away so the leader knows where to start.
+
+        Yields:
+            AppendResponse: The highest transaction id stored on this replica.
+        """
+        for request in request_iterator:
+            if request.data:
+                self.apply_orders(request.data)
+            yield order_pb2.AppendResponse(match_transaction_id=self.replicator.committed_id)
+
     def SyncOrder(self, request, context):
         """
         Syncs a new order to the replica if it's not already present.
@@ -251,7 +448,7 @@ class OrderServiceImpl(order_pb2_grpc.OrderServiceServicer):
         order_type = request.order_type
         quantity = request.quantity
 
-        if str(transaction_id) not in self.orders_map:
+        if transaction_id not in self.store:
             try:
                 self.lock.acquire_write()
                 new_order = {
@@ -260,12 +457,13 @@ class OrderServiceImpl(order_pb2_grpc.OrderServiceServicer):
                     'order_type': order_type,
                     'quantity': quantity
                 }
-                self.orders.append(new_order)
-                self.orders_map[str(transaction_id)] = new_order
-                self.transaction_id = transaction_id
-                self.flush_to_disk()
+                commit = self.log_orders([new_order])
+                self.add_order(new_order)
+                self.transaction_id = max(self.transaction_id, transaction_id + 1)
             finally:
                 self.lock.release_write()
+            commit.wait()
+            self.replicator.notify(transaction_id)
             return order_pb2.OrderSyncResponse(success=True, message=f"Order Replica {self.replica_id} synced successfully")
         else:
             return order_pb2.OrderSyncResponse(success=True, message=f"Order Replica {self.replica_id} was already in sync")
@@ -283,52 +481,95 @@ class OrderServiceImpl(order_pb2_grpc.OrderServiceServicer):
             message (str): A message describing the outcome.
             
         """
-        stock_name = request.stock_name
-        order_type = request.order_type
-        quantity = request.quantity
-
-        try:
-            with grpc.insecure_channel(f'localhost:50052') as channel:
-                catalog_stub = catalog_pb2_grpc.CatalogServiceStub(channel)
-                stock_request = catalog_pb2.LookupRequest(name=stock_name)
-                stock_response = catalog_stub.LookupStock(stock_request)
+        return self.place_orders([request])[0]
 
-                if not stock_response.exists:
-                    return order_pb2.OrderResponse(success=False, message="Stock not found", transaction_id=-1)
+    def PlaceOrders(self, request, context):
+        """
+        Places a basket of orders in one pass, see `place_orders`.
 
-                if order_type == "buy" and stock_response.quantity < quantity:
-                    return order_pb2.OrderResponse(success=False, message="Insufficient stock", transaction_id=-1)
+        Args:
+            request: The orders, each with a stock name, order type and quantity.
 
-                update_request = catalog_pb2.UpdateRequest(
-                    name=stock_name,
-                    quantity_change=(-quantity if order_type == "buy" else quantity)
-                )
-                update_response = catalog_stub.UpdateStock(update_request)
-                if not update_response.success:
-                    return order_pb2.OrderResponse(success=False, message=update_response.message, transaction_id=-1)
+        Returns:
+            results: An `OrderResponse` per order, in the order of `request.orders`.
+        """
+        return order_pb2.PlaceOrdersResponse(results=self.place_orders(request.orders))
 
-            # Proceed with placing order
-            try:
-                self.lock.acquire_write()
-                transaction_id = self.transaction_id
-                self.transaction_id += 1
+    def place_orders(self, requests):
+        """
+        Places orders with one catalog call, one log write and one wait for the followers, however many there are.
 
-                new_order = {
-                    'transaction_id': transaction_id,
-                    'stock_name': stock_name,
-                    'order_type': order_type,
-                    'quantity': quantity
-                }
-                self.orders.append(new_order)
-                self.orders_map[str(new_order['transaction_id'])] = new_order
-                self.flush_to_disk()
-            finally:
-                self.lock.release_write()
+        The catalog checks and applies every trade with `UpdateStocks`, the accepted ones get consecutive
+        transaction IDs under one acquisition of the lock and share a group commit. An order the catalog
+        rejects gets `transaction_id` -1 and does not affect the others.
 
-            return order_pb2.OrderResponse(success=True, message="Order placed successfully", transaction_id=transaction_id)
+        Args:
+            requests: `OrderRequest` messages.
 
+        Returns:
+            list: An `OrderResponse` per request, in the same order.
+        """
+        try:
+            catalog_stub = self.channel_pool.get_stub(self.catalog_address, catalog_pb2_grpc.CatalogServiceStub)
+            # Checks the quantities and applies the trades atomically, in one round trip
+            update_request = catalog_pb2.UpdateStocksRequest(items=[
+                catalog_pb2.ReserveRequest(name=request.stock_name, order_type=request.order_type, quantity=request.quantity)
+                for request in requests
+            ])
+            reserve_responses = catalog_stub.UpdateStocks(update_request).results
         except grpc.RpcError as e:
-            return order_pb2.OrderResponse(success=False, message=f"gRPC error: {e.details()}", transaction_id=-1)
+            return [order_pb2.OrderResponse(success=False, message=f"gRPC error: {e.details()}", transaction_id=-1)
+                    for _ in requests]
+
+        # Proceed with placing the accepted orders
+        new_orders = []
+        try:
+            self.lock.acquire_write()
+            for request, reserve_response in zip(requests, reserve_responses):
+                if reserve_response.success:
+                    new_orders.append({
+                        'transaction_id': self.transaction_id,
+                        'stock_name': request.stock_name,
+                        'order_type': request.order_type,
+                        'quantity': request.quantity
+                    })
+                    self.transaction_id += 1
+            if new_orders:
+                commit = self.log_orders(new_orders)
+            for new_order in new_orders:
+                self.add_order(new_order)
+        finally:
+            self.lock.release_write()
+
+        durability = self.replicator.durability
+        acks = 0
+        required = 0
+        if new_orders:
+            # Reply only once the orders are logged and as many followers as the durability mode requires have
+            # them, without holding the lock during the write. Followers are only sent orders up to the committed
+            # id, which advances once the write succeeded.
+            commit.wait()
+            self.replicator.notify(new_orders[-1]['transaction_id'])
+            required = self.replicator.required_acks()
+            acks = self.replicator.wait_for(new_orders[-1]['transaction_id'], required, REPLICATION_ACK_TIMEOUT)
+
+        responses = []
+        placed = iter(new_orders)
+        for reserve_response in reserve_responses:
+            if not reserve_response.success:
+                responses.append(order_pb2.OrderResponse(success=False, message=reserve_response.message, transaction_id=-1))
+                continue
+            transaction_id = next(placed)['transaction_id']
+            if acks < required:
+                # The order is placed and stays logged on the leader, the followers receive it once they are back.
+                # Still a success, a client retrying a failure would place the trade twice.
+                responses.append(order_pb2.OrderResponse(
+                    success=True, under_replicated=True, transaction_id=transaction_id, durability=durability, acks=acks + 1,
+                    message=f"Order {transaction_id} placed but stored on {acks + 1} replicas, {durability} durability needs {required + 1}"))
+            else:
+                responses.append(order_pb2.OrderResponse(success=True, message="Order placed successfully", transaction_id=transaction_id,
+                                                         durability=durability, acks=acks + 1))
+        return responses
 
 
 def serve():
@@ -341,7 +582,7 @@ def serve():
         order_file = f'data/order_database_{args.replica_id}.csv'
         print(order_file)
 
-        server = grpc.server(futures.ThreadPoolExecutor(max_workers=50))
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=50), options=SERVER_OPTIONS)
       
         order_pb2_grpc.add_OrderServiceServicer_to_server(OrderServiceImpl(order_file, args.replica_id), server)
 
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0border.proto\"H\n\x0cOrderRequest\x12\x12\n\nstock_name\x18\x01 \x01(\t\x12\x12\n\norder_type\x18\x02 \x01(\t\x12\x10\n\x08quantity\x18\x03 \x01(\x05\"I\n\rOrderResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x0etransaction_id\x18\x03 \x01(\x05\",\n\x12OrderLookUpRequest\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x05\"\x88\x01\n\x13OrderLookUpResponse\x12\x0e\n\x06\x65xists\x18\x01 \x01(\x08\x12\x16\n\x0etransaction_id\x18\x02 \x01(\x05\x12\x12\n\nstock_name\x18\x03 \x01(\t\x12\x12\n\norder_type\x18\x04 \x01(\t\x12\x10\n\x08quantity\x18\x05 \x01(\x05\x12\x0f\n\x07message\x18\x06 \x01(\t\"d\n\x10OrderSyncRequest\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x05\x12\x12\n\nstock_name\x18\x02 \x01(\t\x12\x12\n\norder_type\x18\x03 \x01(\t\x12\x10\n\x08quantity\x18\x04 \x01(\x05\"5\n\x11OrderSyncResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x15\n\x13LastestOrderRequest\">\n\x13LatestOrderResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x16\n\x0etransaction_id\x18\x02 \x01(\x05\"\x14\n\x12HealthCheckRequest\"&\n\x13HealthCheckResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"+\n\x11LookUpByIdRequest\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x05\"V\n\x12LookUpByIdResponse\x12\x0e\n\x06\x65xists\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1f\n\x04\x64\x61ta\x18\x03 \x03(\x0b\x32\x11.OrderSyncRequest\"4\n\x11\x42ulkUpsertRequest\x12\x1f\n\x04\x64\x61ta\x18\x01 \x03(\x0b\x32\x11.OrderSyncRequest\"6\n\x12\x42ulkUpsertResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t2\xa0\x03\n\x0cOrderService\x12+\n\nPlaceOrder\x12\r.OrderRequest\x1a\x0e.OrderResponse\x12\x38\n\x0bLookUpOrder\x12\x13.OrderLookUpRequest\x1a\x14.OrderLookUpResponse\x12\x32\n\tSyncOrder\x12\x11.OrderSyncRequest\x1a\x12.OrderSyncResponse\x12G\n\x19get_latest_transaction_id\x12\x14.LastestOrderRequest\x1a\x14.LatestOrderResponse\x12\x38\n\x0bHealthCheck\x12\x13.HealthCheckRequest\x1a\x14.HealthCheckResponse\x12;\n\x10LookUpOrdersById\x12\x12.LookUpByIdRequest\x1a\x13.LookUpByIdResponse\x12\x35\n\nBulkUpsert\x12\x12.BulkUpsertRequest\x1a\x13.BulkUpsertResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0border.proto\"H\n\x0cOrderRequest\x12\x12\n\nstock_name\x18\x01 \x01(\t\x12\x12\n\norder_type\x18\x02 \x01(\t\x12\x10\n\x08quantity\x18\x03 \x01(\x05\"\x85\x01\n\rOrderResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x0etransaction_id\x18\x03 \x01(\x05\x12\x12\n\ndurability\x18\x04 \x01(\t\x12\x0c\n\x04\x61\x63ks\x18\x05 \x01(\x05\x12\x18\n\x10under_replicated\x18\x06 \x01(\x08\"3\n\x12PlaceOrdersRequest\x12\x1d\n\x06orders\x18\x01 \x03(\x0b\x32\r.OrderRequest\"6\n\x13PlaceOrdersResponse\x12\x1f\n\x07results\x18\x01 \x03(\x0b\x32\x0e.OrderResponse\",\n\x12OrderLookUpRequest\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x05\"\x88\x01\n\x13OrderLookUpResponse\x12\x0e\n\x06\x65xists\x18\x01 \x01(\x08\x12\x16\n\x0etransaction_id\x18\x02 \x01(\x05\x12\x12\n\nstock_name\x18\x03 \x01(\t\x12\x12\n\norder_type\x18\x04 \x01(\t\x12\x10\n\x08quantity\x18\x05 \x01(\x05\x12\x0f\n\x07message\x18\x06 \x01(\t\"d\n\x10OrderSyncRequest\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x05\x12\x12\n\nstock_name\x18\x02 \x01(\t\x12\x12\n\norder_type\x18\x03 \x01(\t\x12\x10\n\x08quantity\x18\x04 \x01(\x05\"5\n\x11OrderSyncResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x15\n\x13LastestOrderRequest\">\n\x13LatestOrderResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x16\n\x0etransaction_id\x18\x02 \x01(\x05\"\x14\n\x12HealthCheckRequest\"&\n\x13HealthCheckResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"+\n\x11LookUpByIdRequest\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x05\"V\n\x12LookUpByIdResponse\x12\x0e\n\x06\x65xists\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1f\n\x04\x64\x61ta\x18\x03 \x03(\x0b\x32\x11.OrderSyncRequest\"4\n\x11\x42ulkUpsertRequest\x12\x1f\n\x04\x64\x61ta\x18\x01 \x03(\x0b\x32\x11.OrderSyncRequest\"6\n\x12\x42ulkUpsertResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"Q\n\x0e\x43\x61tchUpRequest\x12\x16\n\x0etransaction_id\x18\x01 \x01(\x05\x12\x12\n\nchunk_size\x18\x02 \x01(\x05\x12\x13\n\x0b\x63ompression\x18\x03 \x01(\t\"N\n\x0c\x43\x61tchUpChunk\x12\x1f\n\x04\x64\x61ta\x18\x01 \x03(\x0b\x32\x11.OrderSyncRequest\x12\x1d\n\x15leader_transaction_id\x18\x02 \x01(\x05\",\n\x12\x43\x61tchUpFromRequest\x12\x16\n\x0eleader_address\x18\x01 \x01(\t\"`\n\x13\x43\x61tchUpFromResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0f\n\x07\x61pplied\x18\x03 \x01(\x05\x12\x16\n\x0etransaction_id\x18\x04 \x01(\x05\"?\n\x13SetFollowersRequest\x12\x11\n\taddresses\x18\x01 \x03(\t\x12\x15\n\rreplica_count\x18\x02 \x01(\x05\"R\n\x0e\x46ollowerStatus\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\x12\x11\n\tconnected\x18\x02 \x01(\x08\x12\x1c\n\x14match_transaction_id\x18\x03 \x01(\x05\"K\n\x14SetFollowersResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\"\n\tfollowers\x18\x02 \x03(\x0b\x32\x0f.FollowerStatus\"0\n\rAppendRequest\x12\x1f\n\x04\x64\x61ta\x18\x01 \x03(\x0b\x32\x11.OrderSyncRequest\".\n\x0e\x41ppendResponse\x12\x1c\n\x14match_transaction_id\x18\x01 \x01(\x05\x32\xb0\x05\n\x0cOrderService\x12+\n\nPlaceOrder\x12\r.OrderRequest\x1a\x0e.OrderResponse\x12\x38\n\x0bPlaceOrders\x12\x13.PlaceOrdersRequest\x1a\x14.PlaceOrdersResponse\x12\x38\n\x0bLookUpOrder\x12\x13.OrderLookUpRequest\x1a\x14.OrderLookUpResponse\x12\x32\n\tSyncOrder\x12\x11.OrderSyncRequest\x1a\x12.OrderSyncResponse\x12G\n\x19get_latest_transaction_id\x12\x14.LastestOrderRequest\x1a\x14.LatestOrderResponse\x12\x38\n\x0bHealthCheck\x12\x13.HealthCheckRequest\x1a\x14.HealthCheckResponse\x12;\n\x10LookUpOrdersById\x12\x12.LookUpByIdRequest\x1a\x13.LookUpByIdResponse\x12\x35\n\nBulkUpsert\x12\x12.BulkUpsertRequest\x1a\x13.BulkUpsertResponse\x12+\n\x07\x43\x61tchUp\x12\x0f.CatchUpRequest\x1a\r.CatchUpChunk0\x01\x12\x38\n\x0b\x43\x61tchUpFrom\x12\x13.CatchUpFromRequest\x1a\x14.CatchUpFromResponse\x12;\n\x0cSetFollowers\x12\x14.SetFollowersRequest\x1a\x15.SetFollowersResponse\x12\x30\n\tReplicate\x12\x0e.AppendRequest\x1a\x0f.AppendResponse(\x01\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -33,32 +33,54 @@ if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_ORDERREQUEST']._serialized_start=15
   _globals['_ORDERREQUEST']._serialized_end=87
-  _globals['_ORDERRESPONSE']._serialized_start=89
-  _globals['_ORDERRESPONSE']._serialized_end=162
-  _globals['_ORDERLOOKUPREQUEST']._serialized_start=164
-  _globals['_ORDERLOOKUPREQUEST']._serialized_end=208
-  _globals['_ORDERLOOKUPRESPONSE']._serialized_start=211
-  _globals['_ORDERLOOKUPRESPONSE']._serialized_end=347
-  _globals['_ORDERSYNCREQUEST']._serialized_start=349
-  _globals['_ORDERSYNCREQUEST']._serialized_end=449
-  _globals['_ORDERSYNCRESPONSE']._serialized_start=451
-  _globals['_ORDERSYNCRESPONSE']._serialized_end=504
-  _globals['_LASTESTORDERREQUEST']._serialized_start=506
-  _globals['_LASTESTORDERREQUEST']._serialized_end=527
-  _globals['_LATESTORDERRESPONSE']._serialized_start=529
-  _globals['_LATESTORDERRESPONSE']._serialized_end=591
-  _globals['_HEALTHCHECKREQUEST']._serialized_start=593
-  _globals['_HEALTHCHECKREQUEST']._serialized_end=613
-  _globals['_HEALTHCHECKRESPONSE']._serialized_start=615
-  _globals['_HEALTHCHECKRESPONSE']._serialized_end=653
-  _globals['_LOOKUPBYIDREQUEST']._serialized_start=655
-  _globals['_LOOKUPBYIDREQUEST']._serialized_end=698
-  _globals['_LOOKUPBYIDRESPONSE']._serialized_start=700
-  _globals['_LOOKUPBYIDRESPONSE']._serialized_end=786
-  _globals['_BULKUPSERTREQUEST']._serialized_start=788
-  _globals['_BULKUPSERTREQUEST']._serialized_end=840
-  _globals['_BULKUPSERTRESPONSE']._serialized_start=842
-  _globals['_BULKUPSERTRESPONSE']._serialized_end=896
-  _globals['_ORDERSERVICE']._serialized_start=899
-  _globals['_ORDERSERVICE']._serialized_end=1315
+  _globals['_ORDERRESPONSE']._serialized_start=90
+  _globals['_ORDERRESPONSE']._serialized_end=223
+  _globals['_PLACEORDERSREQUEST']._serialized_start=225
+  _globals['_PLACEORDERSREQUEST']._serialized_end=276
+  _globals['_PLACEORDERSRESPONSE']._serialized_start=278
+  _globals['_PLACEORDERSRESPONSE']._serialized_end=332
+  _globals['_ORDERLOOKUPREQUEST']._serialized_start=334
+  _globals['_ORDERLOOKUPREQUEST']._serialized_end=378
+  _globals['_ORDERLOOKUPRESPONSE']._serialized_start=381
+  _globals['_ORDERLOOKUPRESPONSE']._serialized_end=517
+  _globals['_ORDERSYNCREQUEST']._serialized_start=519
+  _globals['_ORDERSYNCREQUEST']._serialized_end=619
+  _globals['_ORDERSYNCRESPONSE']._serialized_start=621
+  _globals['_ORDERSYNCRESPONSE']._serialized_end=674
+  _globals['_LASTESTORDERREQUEST']._serialized_start=676
+  _globals['_LASTESTORDERREQUEST']._serialized_end=697
+  _globals['_LATESTORDERRESPONSE']._serialized_start=699
+  _globals['_LATESTORDERRESPONSE']._serialized_end=761
+  _globals['_HEALTHCHECKREQUEST']._serialized_start=763
+  _globals['_HEALTHCHECKREQUEST']._serialized_end=783
+  _globals['_HEALTHCHECKRESPONSE']._serialized_start=785
+  _globals['_HEALTHCHECKRESPONSE']._serialized_end=823
+  _globals['_LOOKUPBYIDREQUEST']._serialized_start=825
+  _globals['_LOOKUPBYIDREQUEST']._serialized_end=868
+  _globals['_LOOKUPBYIDRESPONSE']._serialized_start=870
+  _globals['_LOOKUPBYIDRESPONSE']._serialized_end=956
+  _globals['_BULKUPSERTREQUEST']._serialized_start=958
+  _globals['_BULKUPSERTREQUEST']._serialized_end=1010
+  _globals['_BULKUPSERTRESPONSE']._serialized_start=1012
+  _globals['_BULKUPSERTRESPONSE']._serialized_end=1066
+  _globals['_CATCHUPREQUEST']._serialized_start=1068
+  _globals['_CATCHUPREQUEST']._serialized_end=1149
+  _globals['_CATCHUPCHUNK']._serialized_start=1151
+  _globals['_CATCHUPCHUNK']._serialized_end=1229
+  _globals['_CATCHUPFROMREQUEST']._serialized_start=1231
+  _globals['_CATCHUPFROMREQUEST']._serialized_end=1275
+  _globals['_CATCHUPFROMRESPONSE']._serialized_start=1277
+  _globals['_CATCHUPFROMRESPONSE']._serialized_end=1373
+  _globals['_SETFOLLOWERSREQUEST']._serialized_start=1375
+  _globals['_SETFOLLOWERSREQUEST']._serialized_end=1438
+  _globals['_FOLLOWERSTATUS']._serialized_start=1440
+  _globals['_FOLLOWERSTATUS']._serialized_end=1522
+  _globals['_SETFOLLOWERSRESPONSE']._serialized_start=1524
+  _globals['_SETFOLLOWERSRESPONSE']._serialized_end=1599
+  _globals['_APPENDREQUEST']._serialized_start=1601
+  _globals['_APPENDREQUEST']._serialized_end=1649
+  _globals['_APPENDRESPONSE']._serialized_start=1651
+  _globals['_APPENDRESPONSE']._serialized_end=1697
+  _globals['_ORDERSERVICE']._serialized_start=1700
+  _globals['_ORDERSERVICE']._serialized_end=2388
 # @@protoc_insertion_point(module_scope)
@@ -39,6 +39,11 @@ class OrderServiceStub(object):
                 request_serializer=order__pb2.OrderRequest.SerializeToString,
                 response_deserializer=order__pb2.OrderResponse.FromString,
                 _registered_method=True)
+        self.PlaceOrders = channel.unary_unary(
+                '/OrderService/PlaceOrders',
+                request_serializer=order__pb2.PlaceOrdersRequest.SerializeToString,
+                response_deserializer=order__pb2.PlaceOrdersResponse.FromString,
+                _registered_method=True)
         self.LookUpOrder = channel.unary_unary(
                 '/OrderService/LookUpOrder',
                 request_serializer=order__pb2.OrderLookUpRequest.SerializeToString,
@@ -69,6 +74,26 @@ class OrderServiceStub(object):
                 request_serializer=order__pb2.BulkUpsertRequest.SerializeToString,
                 response_deserializer=order__pb2.BulkUpsertResponse.FromString,
                 _registered_method=True)
+        self.CatchUp = channel.unary_stream(
+                '/OrderService/CatchUp',
+                request_serializer=order__pb2.CatchUpRequest.SerializeToString,
+                response_deserializer=order__pb2.CatchUpChunk.FromString,
+                _registered_method=True)
+        self.CatchUpFrom = channel.unary_unary(
+                '/OrderService/CatchUpFrom',
+                request_serializer=order__pb2.CatchUpFromRequest.SerializeToString,
+                response_deserializer=order__pb2.CatchUpFromResponse.FromString,
+                _registered_method=True)
+        self.SetFollowers = channel.unary_unary(
+                '/OrderService/SetFollowers',
+                request_serializer=order__pb2.SetFollowersRequest.SerializeToString,
+                response_deserializer=order__pb2.SetFollowersResponse.FromString,
+                _registered_method=True)
+        self.Replicate = channel.stream_stream(
+                '/OrderService/Replicate',
+                request_serializer=order__pb2.AppendRequest.SerializeToString,
+                response_deserializer=order__pb2.AppendResponse.FromString,
+                _registered_method=True)
 
 
 class OrderServiceServicer(object):
@@ -80,6 +105,12 @@ class OrderServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PlaceOrders(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def LookUpOrder(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -116,6 +147,30 @@ class OrderServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def CatchUp(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CatchUpFrom(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetFollowers(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Replicate(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_OrderServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -124,6 +179,11 @@ def add_OrderServiceServicer_to_server(servicer, server):
                     request_deserializer=order__pb2.OrderRequest.FromString,
                     response_serializer=order__pb2.OrderResponse.SerializeToString,
             ),
+            'PlaceOrders': grpc.unary_unary_rpc_method_handler(
+                    servicer.PlaceOrders,
+                    request_deserializer=order__pb2.PlaceOrdersRequest.FromString,
+                    response_serializer=order__pb2.PlaceOrdersResponse.SerializeToString,
+            ),
             'LookUpOrder': grpc.unary_unary_rpc_method_handler(
                     servicer.LookUpOrder,
                     request_deserializer=order__pb2.OrderLookUpRequest.FromString,
@@ -154,6 +214,26 @@ def add_OrderServiceServicer_to_server(servicer, server):
                     request_deserializer=order__pb2.BulkUpsertRequest.FromString,
                     response_serializer=order__pb2.BulkUpsertResponse.SerializeToString,
             ),
+            'CatchUp': grpc.unary_stream_rpc_method_handler(
+                    servicer.CatchUp,
+                    request_deserializer=order__pb2.CatchUpRequest.FromString,
+                    response_serializer=order__pb2.CatchUpChunk.SerializeToString,
+            ),
+            'CatchUpFrom': grpc.unary_unary_rpc_method_handler(
+                    servicer.CatchUpFrom,
+                    request_deserializer=order__pb2.CatchUpFromRequest.FromString,
+                    response_serializer=order__pb2.CatchUpFromResponse.SerializeToString,
+            ),
+            'SetFollowers': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetFollowers,
+                    request_deserializer=order__pb2.SetFollowersRequest.FromString,
+                    response_serializer=order__pb2.SetFollowersResponse.SerializeToString,
+            ),
+            'Replicate': grpc.stream_stream_rpc_method_handler(
+                    servicer.Replicate,
+                    request_deserializer=order__pb2.AppendRequest.FromString,
+                    response_serializer=order__pb2.AppendResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'OrderService', rpc_method_handlers)
@@ -192,6 +272,33 @@ class OrderService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def PlaceOrders(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/OrderService/PlaceOrders',
+            order__pb2.PlaceOrdersRequest.SerializeToString,
+            order__pb2.PlaceOrdersResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def LookUpOrder(request,
             target,
@@ -353,3 +460,111 @@ class OrderService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def CatchUp(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/OrderService/CatchUp',
+            order__pb2.CatchUpRequest.SerializeToString,
+            order__pb2.CatchUpChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CatchUpFrom(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/OrderService/CatchUpFrom',
+            order__pb2.CatchUpFromRequest.SerializeToString,
+            order__pb2.CatchUpFromResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetFollowers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/OrderService/SetFollowers',
+            order__pb2.SetFollowersRequest.SerializeToString,
+            order__pb2.SetFollowersResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Replicate(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/OrderService/Replicate',
+            order__pb2.AppendRequest.SerializeToString,
+            order__pb2.AppendResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,103 @@
+import array
+import mmap
+import os
+import struct
+import zlib
+
+MAGIC = b"ORDSNAP\x01"
+# order count, number of stock names, number of order types
+HEADER = struct.Struct("<QII")
+NAME_LENGTH = struct.Struct("<H")
+CHECKSUM = struct.Struct("<I")
+
+
+class OrderColumns:
+    """
+    Orders stored column by column.
+
+    `stock_names` and `order_types` are the distinct values, each order refers to them by index.
+    """
+
+    def __init__(self, transaction_ids, quantities, stock_indexes, type_indexes, stock_names, order_types):
+        self.transaction_ids = transaction_ids
+        self.quantities = quantities
+        self.stock_indexes = stock_indexes
+        self.type_indexes = type_indexes
+        self.stock_names = stock_names
+        self.order_types = order_types
+
+    def __len__(self):
+        return len(self.transaction_ids)
+
+
+def write_snapshot(path, columns):
+    """
+    Writes the orders to a binary snapshot file atomically (temp file, fsync, rename).
+
+    Layout:
+        MAGIC | count, #names, #types | names and types (uint16 length + utf-8) |
+        transaction ids (int64) | quantities (int32) | stock indexes (uint32) | type indexes (uint8) | crc32
+    """
+    header = [MAGIC, HEADER.pack(len(columns), len(columns.stock_names), len(columns.order_types))]
+    for name in columns.stock_names + columns.order_types:
+        encoded = name.encode('utf-8')
+        header.append(NAME_LENGTH.pack(len(encoded)) + encoded)
+    parts = header + [columns.transaction_ids.tobytes(), columns.quantities.tobytes(),
+                      columns.stock_indexes.tobytes(), columns.type_indexes.tobytes()]
+    checksum = 0
+    for part in parts:
+        checksum = zlib.crc32(part, checksum)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        for part in parts:
+            f.write(part)
+        f.write(CHECKSUM.pack(checksum))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def read_snapshot(path):
+    """
+    Loads a snapshot written by `write_snapshot`.
+
+    The file is memory-mapped and every column is copied into its array in one step, no per-order
+    parsing is done.
+
+    Returns:
+        OrderColumns: The orders of the snapshot.
+
+    Raises:
+        ValueError: If the file is not a snapshot or its checksum does not match.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            if len(view) < len(MAGIC) + HEADER.size + CHECKSUM.size or view[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not an order snapshot")
+            with view[:-CHECKSUM.size] as body:
+                if zlib.crc32(body) != CHECKSUM.unpack_from(view, len(view) - CHECKSUM.size)[0]:
+                    raise ValueError(f"Checksum mismatch in order snapshot {path}")
+
+            count, name_count, type_count = HEADER.unpack_from(view, len(MAGIC))
+            offset = len(MAGIC) + HEADER.size
+            names = []
+            for _ in range(name_count + type_count):
+                length = NAME_LENGTH.unpack_from(view, offset)[0]
+                offset += NAME_LENGTH.size
+                names.append(str(view[offset:offset + length], 'utf-8'))
+                offset += length
+
+            columns = []
+            for typecode in ('q', 'i', 'I', 'B'):
+                column = array.array(typecode)
+                size = count * column.itemsize
+                column.frombytes(view[offset:offset + size])
+                offset += size
+                columns.append(column)
+    return OrderColumns(*columns, names[:name_count], names[name_count:])
@@ -0,0 +1,159 @@
+import array
+
+from order_snapshot import OrderColumns
+
+# Order type index of a slot that holds no order
+EMPTY = 255
+
+
+class OrderStore:
+    """
+    Array-backed store of orders, addressed by transaction id.
+
+    Transaction ids are dense and increasing, so the order with id `t` lives in slot `t - base` of three
+    parallel arrays: quantity (int32), stock index (uint32) and order type index (uint8). Stock names and
+    order types are interned in small tables, so an order takes 9 bytes instead of two dicts. Ids that
+    have not arrived yet (e.g. on a follower that missed orders) are empty slots until they are filled.
+    """
+
+    def __init__(self):
+        self.base = 0
+        self.quantities = array.array('i')
+        self.stock_indexes = array.array('I')
+        self.type_indexes = array.array('B')
+        self.stock_names = []
+        self.stock_lookup = {}
+        self.order_types = []
+        self.type_lookup = {}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _slot(self, transaction_id):
+        """Returns the slot of the id, or -1 if it lies outside the stored range."""
+        slot = transaction_id - self.base
+        return slot if 0 <= slot < len(self.type_indexes) else -1
+
+    def __contains__(self, transaction_id):
+        slot = self._slot(transaction_id)
+        return slot >= 0 and self.type_indexes[slot] != EMPTY
+
+    def get(self, transaction_id):
+        """Returns the order as a dict, or None if there is no order with that id."""
+        slot = self._slot(transaction_id)
+        if slot < 0 or self.type_indexes[slot] == EMPTY:
+            return None
+        return self._order(slot)
+
+    def _order(self, slot):
+        return {
+            'transaction_id': self.base + slot,
+            'stock_name': self.stock_names[self.stock_indexes[slot]],
+            'order_type': self.order_types[self.type_indexes[slot]],
+            'quantity': self.quantities[slot]
+        }
+
+    def __iter__(self):
+        """Yields every order as a dict in transaction id order."""
+        return self.orders_from(self.base)
+
+    def orders_from(self, transaction_id):
+        """Yields the orders with an id of at least `transaction_id` as dicts, in id order."""
+        for slot in range(max(transaction_id - self.base, 0), len(self.type_indexes)):
+            if self.type_indexes[slot] != EMPTY:
+                yield self._order(slot)
+
+    def max_id(self):
+        """Returns the highest stored transaction id, or -1 if the store is empty."""
+        return self.base + len(self.type_indexes) - 1 if self.count else -1
+
+    def add(self, transaction_id, stock_name, order_type, quantity):
+        """
+        Stores an order.
+
+        Returns:
+            bool: False if an order with that id was already stored.
+        """
+        if transaction_id in self:
+            return False
+        if not self.count:
+            self.base = transaction_id
+        elif transaction_id < self.base:
+            self._extend_front(self.base - transaction_id)
+
+        slot = transaction_id - self.base
+        if slot >= len(self.type_indexes):
+            gap = slot - len(self.type_indexes)
+            if gap:
+                self.quantities.extend(array.array('i', bytes(4 * gap)))
+                self.stock_indexes.extend(array.array('I', bytes(4 * gap)))
+                self.type_indexes.extend(array.array('B', [EMPTY]) * gap)
+            self.quantities.append(quantity)
+            self.stock_indexes.append(self._intern_stock(stock_name))
+            self.type_indexes.append(self._intern_type(order_type))
+        else:
+            self.quantities[slot] = quantity
+            self.stock_indexes[slot] = self._intern_stock(stock_name)
+            self.type_indexes[slot] = self._intern_type(order_type)
+        self.count += 1
+        return True
+
+    def _extend_front(self, size):
+        """Prepends empty slots for ids below the current base, only happens for out of order ids."""
+        self.quantities = array.array('i', bytes(4 * size)) + self.quantities
+        self.stock_indexes = array.array('I', bytes(4 * size)) + self.stock_indexes
+        self.type_indexes = array.array('B', [EMPTY]) * size + self.type_indexes
+        self.base -= size
+
+    def _intern_stock(self, stock_name):
+        index = self.stock_lookup.get(stock_name)
+        if index is None:
+            index = self.stock_lookup[stock_name] = len(self.stock_names)
+            self.stock_names.append(stock_name)
+        return index
+
+    def _intern_type(self, order_type):
+        index = self.type_lookup.get(order_type)
+        if index is None:
+            if len(self.order_types) >= EMPTY:
+                raise ValueError(f"Too many distinct order types to store {order_type}")
+            index = self.type_lookup[order_type] = len(self.order_types)
+            self.order_types.append(order_type)
+        return index
+
+    def to_columns(self):
+        """Returns a copy of the stored orders as `OrderColumns`, e.g. for a snapshot."""
+        if self.count == len(self.type_indexes):
+            transaction_ids = array.array('q', range(self.base, self.base + self.count))
+            return OrderColumns(transaction_ids, array.array('i', self.quantities), array.array('I', self.stock_indexes),
+                                array.array('B', self.type_indexes), list(self.stock_names), list(self.order_types))
+        slots = [slot for slot, type_index in enumerate(self.type_indexes) if type_index != EMPTY]
+        return OrderColumns(
+            array.array('q', [self.base + slot for slot in slots]),
+            array.array('i', [self.quantities[slot] for slot in slots]),
+            array.array('I', [self.stock_indexes[slot] for slot in slots]),
+            array.array('B', [self.type_indexes[slot] for slot in slots]),
+            list(self.stock_names), list(self.order_types)
+        )
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Builds a store from `OrderColumns`, adopting the arrays as they are when the ids are contiguous."""
+        store = cls()
+        count = len(columns)
+        if count and columns.transaction_ids == array.array('q', range(columns.transaction_ids[0], columns.transaction_ids[0] + count)):
+            store.base = columns.transaction_ids[0]
+            store.quantities = columns.quantities
+            store.stock_indexes = columns.stock_indexes
+            store.type_indexes = columns.type_indexes
+            store.stock_names = list(columns.stock_names)
+            store.stock_lookup = {name: index for index, name in enumerate(store.stock_names)}
+            store.order_types = list(columns.order_types)
+            store.type_lookup = {name: index for index, name in enumerate(store.order_types)}
+            store.count = count
+            return store
+        for transaction_id, quantity, stock_index, type_index in zip(
+                columns.transaction_ids, columns.quantities, columns.stock_indexes, columns.type_indexes):
+            store.add(transaction_id, columns.stock_names[stock_index], columns.order_types[type_index], quantity)
+        return store
@@ -0,0 +1,197 @@
+import os
+import threading
+import time
+from collections import deque
+
+import grpc
+
+import order_pb2 as order_pb2
+import order_pb2_grpc as order_pb2_grpc
+
+# Orders per append sent to a follower
+REPLICATION_BATCH_SIZE = int(os.environ.get("REPLICATION_BATCH_SIZE")) if os.environ.get("REPLICATION_BATCH_SIZE") else 256
+# Appends sent to a follower before its acknowledgement of the oldest one is needed
+REPLICATION_MAX_INFLIGHT = int(os.environ.get("REPLICATION_MAX_INFLIGHT")) if os.environ.get("REPLICATION_MAX_INFLIGHT") else 4
+# When the leader replies to an order: "leader" once it logged it (followers catch up asynchronously),
+# "quorum" once a majority of the replicas stored it, "all" once every active follower stored it
+REPLICATION_DURABILITY = os.environ.get("REPLICATION_DURABILITY") if os.environ.get("REPLICATION_DURABILITY") else "leader"
+# Seconds before a broken replication stream is reopened
+REPLICATION_RETRY_INTERVAL = float(os.environ.get("REPLICATION_RETRY_INTERVAL")) if os.environ.get("REPLICATION_RETRY_INTERVAL") else 1.0
+
+DURABILITY_MODES = ("leader", "quorum", "all")
+
+
+class FollowerStream:
+    """
+    Replication stream from the leader to one follower.
+
+    Keeps a bidirectional `Replicate` call open. The follower first answers an empty handshake with the
+    highest id it has logged, then the leader sends it every later order in appends of up to `batch_size`
+    orders, with up to `max_inflight` appends unacknowledged. Each acknowledgement advances `match_id`.
+    A broken stream is reopened after `REPLICATION_RETRY_INTERVAL` seconds and resumes from `match_id`.
+    """
+
+    def __init__(self, address, replicator):
+        self.address = address
+        self.replicator = replicator
+        self.condition = replicator.condition
+        # Highest id the follower acknowledged, and highest id sent to it
+        self.match_id = -1
+        self.sent_id = -1
+        # Last id of every append waiting for an acknowledgement
+        self.inflight = deque()
+        self.connected = False
+        self.stopped = False
+        # Incremented whenever a stream ends, so the request generator of an old stream stops
+        self.generation = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """Opens the stream and applies the follower's acknowledgements until the stream is stopped."""
+        while not self.stopped:
+            try:
+                stub = self.replicator.channel_pool.get_stub(self.address, order_pb2_grpc.OrderServiceStub)
+                for response in stub.Replicate(self.requests(self.generation)):
+                    with self.condition:
+                        if not self.connected:
+                            self.connected = True
+                            self.sent_id = response.match_transaction_id
+                            print(f"Replicating to {self.address} from transaction {self.sent_id + 1}")
+                        self.match_id = max(self.match_id, response.match_transaction_id)
+                        while self.inflight and self.inflight[0] <= self.match_id:
+                            self.inflight.popleft()
+                        self.condition.notify_all()
+            except grpc.RpcError as e:
+                if not self.stopped:
+                    print(f"Replication stream to {self.address} broken: {e.details()}")
+            with self.condition:
+                self.connected = False
+                self.inflight.clear()
+                self.generation += 1
+                self.condition.notify_all()
+            if not self.stopped:
+                time.sleep(REPLICATION_RETRY_INTERVAL)
+
+    def requests(self, generation):
+        """Yields the handshake, then an append whenever committed orders past `sent_id` exist and the pipeline has room."""
+        yield order_pb2.AppendRequest()
+        while True:
+            with self.condition:
+                while self.generation == generation and not self.stopped and (
+                        not self.connected or len(self.inflight) >= self.replicator.max_inflight
+                        or self.replicator.committed_id <= self.sent_id):
+                    self.condition.wait()
+                if self.generation != generation or self.stopped:
+                    return
+                start = self.sent_id + 1
+                end = self.replicator.committed_id
+            # Orders past the committed id may be stored but not logged yet, they are sent once they are
+            orders = [order for order in self.replicator.read_orders(start, self.replicator.batch_size) if order.transaction_id <= end]
+            if not orders:
+                continue
+            with self.condition:
+                if self.generation != generation:
+                    return
+                self.sent_id = orders[-1].transaction_id
+                self.inflight.append(self.sent_id)
+            yield order_pb2.AppendRequest(data=orders)
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+
+class Replicator:
+    """
+    Leader side of the order replication.
+
+    Holds a `FollowerStream` per follower and tracks how far each one is (its match index). The order
+    service calls `notify` after storing orders and `wait_for` to wait until as many followers as the
+    durability mode requires have them. All streams send concurrently.
+
+    Only orders up to the committed id are sent. The order service advances it with `notify` once orders
+    are logged, so a follower never stores an order the leader could still lose in a crash.
+
+    Args:
+        read_orders: Function (first id, max count) returning the stored orders from that id on as
+            `OrderSyncRequest` messages.
+        committed_id: Highest id already logged when the replicator is created.
+        channel_pool: Pool the follower channels are taken from.
+        durability: One of `DURABILITY_MODES`.
+
+    Raises:
+        ValueError: If the durability mode is unknown.
+    """
+
+    def __init__(self, read_orders, committed_id, channel_pool, batch_size=REPLICATION_BATCH_SIZE, max_inflight=REPLICATION_MAX_INFLIGHT,
+                 durability=REPLICATION_DURABILITY):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown replication durability {durability}, expected one of {', '.join(DURABILITY_MODES)}")
+        self.durability = durability
+        self.read_orders = read_orders
+        # Highest logged id, orders after it are not sent yet
+        self.committed_id = committed_id
+        self.channel_pool = channel_pool
+        self.batch_size = batch_size
+        self.max_inflight = max_inflight
+        self.condition = threading.Condition()
+        self.followers = {}
+        # Number of replicas in the deployment, active or not, a quorum is a majority of them
+        self.replica_count = 1
+
+    def set_followers(self, addresses, replica_count=0):
+        """
+        Starts streams to new follower addresses and stops the streams to addresses no longer listed.
+
+        Args:
+            addresses (list): host:port of every active follower.
+            replica_count (int): Number of replicas in the deployment, defaults to the leader and its followers.
+        """
+        with self.condition:
+            self.replica_count = max(replica_count, len(addresses) + 1)
+            for address in list(self.followers):
+                if address not in addresses:
+                    print(f"Stopped replicating to {address}")
+                    self.followers.pop(address).stop()
+            for address in addresses:
+                if address not in self.followers:
+                    self.followers[address] = FollowerStream(address, self)
+
+    def notify(self, transaction_id):
+        """Marks the orders up to `transaction_id` as logged and wakes the follower streams."""
+        with self.condition:
+            self.committed_id = max(self.committed_id, transaction_id)
+            self.condition.notify_all()
+
+    def required_acks(self):
+        """Returns how many followers have to acknowledge an order before the leader replies."""
+        with self.condition:
+            if self.durability == "leader":
+                return 0
+            if self.durability == "all":
+                return len(self.followers)
+            # A majority of the replicas, the leader counts as one
+            return self.replica_count // 2
+
+    def wait_for(self, transaction_id, required, timeout=None):
+        """
+        Waits until `required` followers acknowledged `transaction_id`, or the timeout expires.
+
+        Returns:
+            int: The number of followers that acknowledged the id.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.acks(transaction_id) >= required, timeout)
+            return self.acks(transaction_id)
+
+    def acks(self, transaction_id):
+        """Returns the number of followers whose match index reached `transaction_id`. Caller holds the condition."""
+        return sum(follower.match_id >= transaction_id for follower in self.followers.values())
+
+    def status(self):
+        """Returns a `FollowerStatus` message per follower."""
+        with self.condition:
+            return [order_pb2.FollowerStatus(address=address, connected=follower.connected, match_transaction_id=follower.match_id)
+                    for address, follower in self.followers.items()]
@@ -0,0 +1,174 @@
+import multiprocessing
+import pickle
+import struct
+from multiprocessing import shared_memory
+
+# Fixed width of a key slot, longer keys are not cached
+KEY_SIZE = 64
+# Fixed width of a value slot, larger pickled values are not cached
+VALUE_SIZE = 1024
+
+
+class SharedCache:
+    """
+    LRU cache stored in a shared-memory segment so it can be shared by forked worker processes.
+
+    Offers the same `get_cache` / `update_cache` / `get_many` / `update_many` / `invalidate_stock` interface as `Cache`. It has to be
+    created in the parent before the workers are forked, a lookup cached by one worker is then a hit for
+    all of them and an invalidation from any worker removes the entry everywhere.
+
+    Layout of the segment:
+        tick (Q) | keys (max_size * KEY_SIZE) | last used ticks (max_size * Q) | value lengths (max_size * I) | values (max_size * VALUE_SIZE)
+    A slot with a last used tick of 0 is empty. Keys are null padded so a lookup is a single `find` over the key region.
+    The hit, miss and eviction counters are kept per process.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.keys_offset = 8
+        self.ticks_offset = self.keys_offset + max_size * KEY_SIZE
+        self.lengths_offset = self.ticks_offset + max_size * 8
+        self.values_offset = self.lengths_offset + max_size * 4
+        self.shm = shared_memory.SharedMemory(create=True, size=self.values_offset + max_size * VALUE_SIZE)
+        self.shm.buf[:] = bytes(self.shm.size)
+        self.lock = multiprocessing.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _find_slot(self, key):
+        """Returns the slot index holding the padded key, or -1. Caller holds the lock."""
+        keys = bytes(self.shm.buf[self.keys_offset:self.ticks_offset])
+        start = 0
+        while True:
+            position = keys.find(key, start)
+            if position < 0:
+                return -1
+            # A match can straddle a slot boundary when the next slot is empty, only aligned matches count
+            if position % KEY_SIZE == 0:
+                return position // KEY_SIZE
+            start = position + 1
+
+    def _encode_key(self, stock_name):
+        key = stock_name.encode('utf-8')
+        if not key or len(key) > KEY_SIZE or b"\x00" in key:
+            return None
+        return key.ljust(KEY_SIZE, b"\x00")
+
+    def _next_tick(self):
+        tick = struct.unpack_from("Q", self.shm.buf, 0)[0] + 1
+        struct.pack_into("Q", self.shm.buf, 0, tick)
+        return tick
+
+    def get_cache(self, stock_name):
+        """Check if stock is present in cache it will return it"""
+        return self.get_many([stock_name]).get(stock_name)
+
+    def get_many(self, stock_names):
+        """Returns the cached entries of several stocks as a dict, taking the cross-process lock once."""
+        keys = [(stock_name, self._encode_key(stock_name)) for stock_name in stock_names]
+        values = {}
+        with self.lock:
+            for stock_name, key in keys:
+                if key is None:
+                    continue
+                slot = self._find_slot(key)
+                if slot < 0:
+                    self.misses += 1
+                    continue
+                self.hits += 1
+                struct.pack_into("Q", self.shm.buf, self.ticks_offset + slot * 8, self._next_tick())
+                length = struct.unpack_from("I", self.shm.buf, self.lengths_offset + slot * 4)[0]
+                start = self.values_offset + slot * VALUE_SIZE
+                values[stock_name] = bytes(self.shm.buf[start:start + length])
+        return {stock_name: pickle.loads(value) for stock_name, value in values.items()}
+
+    def update_cache(self, stock_name, stock_details):
+        """Add stock data to cache and apply eviction if needed."""
+        self.update_many({stock_name: stock_details})
+
+    def update_many(self, entries):
+        """Adds the entries of a dict of stocks to the cache, taking the cross-process lock once."""
+        encoded = []
+        for stock_name, stock_details in entries.items():
+            key = self._encode_key(stock_name)
+            if key is None or stock_details is None:
+                continue
+            value = pickle.dumps(stock_details, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(value) <= VALUE_SIZE:
+                encoded.append((key, value))
+        if not encoded:
+            return
+        with self.lock:
+            for key, value in encoded:
+                slot = self._find_slot(key)
+                if slot < 0:
+                    slot = self._victim_slot()
+                    start = self.keys_offset + slot * KEY_SIZE
+                    self.shm.buf[start:start + KEY_SIZE] = key
+                start = self.values_offset + slot * VALUE_SIZE
+                self.shm.buf[start:start + len(value)] = value
+                struct.pack_into("I", self.shm.buf, self.lengths_offset + slot * 4, len(value))
+                struct.pack_into("Q", self.shm.buf, self.ticks_offset + slot * 8, self._next_tick())
+
+    def _victim_slot(self):
+        """Returns an empty slot, or the least recently used one. Caller holds the lock."""
+        ticks = struct.unpack_from(f"{self.max_size}Q", self.shm.buf, self.ticks_offset)
+        slot = min(range(self.max_size), key=ticks.__getitem__)
+        if ticks[slot]:
+            self.evictions += 1
+        return slot
+
+    def invalidate_stock(self, stock_name):
+        """Remove stock from cache (invalidated)."""
+        key = self._encode_key(stock_name)
+        if key is None:
+            return
+        with self.lock:
+            slot = self._find_slot(key)
+            if slot >= 0:
+                self._clear_slot(slot)
+
+    def refresh_cache(self, stock_name, stock_details):
+        """Replace the data of a stock only if it is already cached, without touching its recency."""
+        key = self._encode_key(stock_name)
+        if key is None:
+            return
+        value = pickle.dumps(stock_details, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            slot = self._find_slot(key)
+            if slot < 0:
+                return
+            if len(value) > VALUE_SIZE:
+                self._clear_slot(slot)
+                return
+            start = self.values_offset + slot * VALUE_SIZE
+            self.shm.buf[start:start + len(value)] = value
+            struct.pack_into("I", self.shm.buf, self.lengths_offset + slot * 4, len(value))
+
+    def clear(self):
+        """Remove every stock from the cache."""
+        with self.lock:
+            self.shm.buf[self.keys_offset:self.lengths_offset] = bytes(self.lengths_offset - self.keys_offset)
+
+    def _clear_slot(self, slot):
+        start = self.keys_offset + slot * KEY_SIZE
+        self.shm.buf[start:start + KEY_SIZE] = bytes(KEY_SIZE)
+        struct.pack_into("Q", self.shm.buf, self.ticks_offset + slot * 8, 0)
+
+    def stats(self):
+        """Returns the hit, miss and eviction counters of this process."""
+        total = self.hits + self.misses
+        return {
+            "policy": "lru",
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
+
+    def close(self, unlink=False):
+        """Detaches from the segment, the creating process should also unlink it."""
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
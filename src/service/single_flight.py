@@ -0,0 +1,108 @@
+import asyncio
+import threading
+
+
+class _Call:
+    """An in-flight call whose result is shared by every caller of the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key onto a single in-flight call.
+
+    The first caller for a key runs the function, callers arriving while it is running wait for it and
+    get the same result (or exception). Counters report how many calls were executed and how many were
+    deduplicated.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.executed = 0
+        self.deduplicated = 0
+
+    def do(self, key, fn):
+        """
+        Runs `fn` once for all concurrent callers of `key`.
+
+        Args:
+            key: Identifies calls that can share a result, e.g. the stock name.
+            fn: Zero-argument function performing the call.
+
+        Returns:
+            The result of `fn`, exceptions raised by `fn` are re-raised in every waiting caller.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self.calls[key] = call
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                if self.calls.get(key) is call:
+                    del self.calls[key]
+            call.done.set()
+
+    def forget(self, key):
+        """Detaches the in-flight call for `key`, later callers start a new call instead of joining it."""
+        with self.lock:
+            self.calls.pop(key, None)
+
+    def stats(self):
+        with self.lock:
+            return {"executed": self.executed, "deduplicated": self.deduplicated}
+
+
+class AsyncSingleFlight:
+    """`SingleFlight` for coroutines running on one event loop."""
+
+    def __init__(self):
+        self.calls = {}
+        self.executed = 0
+        self.deduplicated = 0
+
+    async def do(self, key, fn):
+        """Awaits `fn()` once for all concurrent callers of `key`."""
+        future = self.calls.get(key)
+        if future is not None:
+            self.deduplicated += 1
+            # shield() so a cancelled waiter does not cancel the call shared with the others
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(fn())
+        self.calls[key] = future
+        self.executed += 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self.calls.get(key) is future:
+                del self.calls[key]
+
+    def forget(self, key):
+        """Detaches the in-flight call for `key`, later callers start a new call instead of joining it."""
+        self.calls.pop(key, None)
+
+    def stats(self):
+        return {"executed": self.executed, "deduplicated": self.deduplicated}
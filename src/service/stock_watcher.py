@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+import grpc
+
+from bloom import BloomFilter
+from cache import EncodedResponse
+import catalog_pb2 as catalog_pb2
+import catalog_pb2_grpc as catalog_pb2_grpc
+
+# Upper bound for the delay between reconnect attempts to the catalog change feed
+MAX_RECONNECT_DELAY = 10.0
+# False positive rate of the filter of known stock names
+SYMBOL_FILTER_ERROR_RATE = float(os.environ.get("SYMBOL_FILTER_ERROR_RATE")) if os.environ.get("SYMBOL_FILTER_ERROR_RATE") else 0.01
+
+
+class StockWatcher:
+    """
+    Keeps the frontend stock cache coherent with the catalog through the `WatchStocks` change feed.
+
+    Each change event updates the cached entry of the stock in place (stocks that are not cached are
+    ignored), so trades placed through another frontend or direct `UpdateStock` calls do not leave stale
+    entries behind. The cache is (or wraps) a `GenerationCache`, so applying an event also moves the generation of
+    the stock: a lookup that read the catalog before the change and completes after the event was
+    applied drops its fill instead of caching the old quantity. After a disconnect the watcher resumes from the last version it applied, if the
+    catalog cannot resume from there it sends a reset and the cache is cleared.
+
+    Reset events (always the first event of a fresh subscription) carry every stock name, from which a
+    Bloom filter of known symbols is rebuilt, so lookups of names the catalog does not have can be
+    rejected without an RPC.
+    """
+
+    def __init__(self, cache, catalog_address, channel_pool, encode_responses=False):
+        self.cache = cache
+        # Refresh entries with `EncodedResponse`s, for caches filled with pre-encoded responses
+        self.encode_responses = encode_responses
+        self.catalog_address = catalog_address
+        self.channel_pool = channel_pool
+        self.epoch = 0
+        self.version = 0
+        # Bloom filter of stock names, None until the first reset event is received
+        self.known_stocks = None
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.watch_forever, daemon=True)
+            self.thread.start()
+
+    def might_exist(self, stock_name):
+        """Returns False only if the catalog certainly has no such stock."""
+        known_stocks = self.known_stocks
+        return known_stocks is None or stock_name in known_stocks
+
+    def watch_forever(self):
+        """Subscribes to the change feed and reconnects with exponential backoff when the stream breaks."""
+        delay = 0.5
+        while True:
+            try:
+                if self.watch():
+                    delay = 0.5
+            except grpc.RpcError as e:
+                print(f"Catalog change feed interrupted: {e.details()}, resuming from version {self.version} in {delay:.1f}s")
+            time.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    def watch(self):
+        """Applies events until the stream ends, returns True if any event was received."""
+        stub = self.channel_pool.get_stub(self.catalog_address, catalog_pb2_grpc.CatalogServiceStub)
+        request = catalog_pb2.WatchRequest(epoch=self.epoch, from_version=self.version)
+        received = False
+        for event in stub.WatchStocks(request):
+            self.apply(event)
+            received = True
+        return received
+
+    def apply(self, event):
+        """Applies one change event to the cache."""
+        if event.reset:
+            print(f"[Cache RESET] Catalog change feed restarted at version {event.version}")
+            self.cache.clear()
+            self.known_stocks = BloomFilter.from_keys(event.names, SYMBOL_FILTER_ERROR_RATE)
+        else:
+            if self.known_stocks is not None and event.name not in self.known_stocks:
+                self.known_stocks.add(event.name)
+            stock_details = {
+                "data": {
+                    "name": event.name,
+                    "price": event.price,
+                    "quantity": event.quantity
+                }
+            }
+            if self.encode_responses:
+                stock_details = EncodedResponse(stock_details)
+            self.cache.refresh_cache(event.name, stock_details)
+        self.epoch = event.epoch
+        self.version = event.version
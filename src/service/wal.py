@@ -0,0 +1,152 @@
+import os
+import shutil
+import struct
+import threading
+import time
+import zlib
+
+# When appended records are forced to disk: "always" (fsync before every append returns, so an acknowledged
+# order survives a crash), "interval" (a background thread fsyncs every WAL_FSYNC_INTERVAL seconds, orders
+# acknowledged since the last fsync can be lost) or "never" (left to the OS)
+WAL_FSYNC = os.environ.get("WAL_FSYNC") if os.environ.get("WAL_FSYNC") else "always"
+WAL_FSYNC_INTERVAL = float(os.environ.get("WAL_FSYNC_INTERVAL")) if os.environ.get("WAL_FSYNC_INTERVAL") else 1.0
+
+# Every record is framed as: payload length (uint32) | crc32 of the payload (uint32) | payload
+RECORD_HEADER = struct.Struct("<II")
+
+
+class WriteAheadLog:
+    """
+    Append-only log of checksummed records.
+
+    Appending a record is a single `write` at the end of the file, independent of how much was logged
+    before. On startup `replay` returns the payloads of all complete records; a torn or corrupt record
+    at the end (from a crash in the middle of a write) is cut off along with everything after it.
+
+    Once the state the records describe has been written elsewhere (a checkpoint), `rotate` moves them
+    to `<path>.old` and starts an empty log, and `discard_rotated` deletes them after the checkpoint is
+    durable. Until then `replay` returns the rotated records first.
+    """
+
+    def __init__(self, path, fsync_policy=WAL_FSYNC, fsync_interval=WAL_FSYNC_INTERVAL):
+        if fsync_policy not in ("always", "interval", "never"):
+            raise ValueError(f"Unknown fsync policy {fsync_policy}, expected always, interval or never")
+        self.path = path
+        self.rotated_path = path + ".old"
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.lock = threading.Lock()
+        self.file = None
+        # Records in the log since it was opened or rotated, including replayed ones
+        self.records = 0
+        self.dirty = False
+
+    def replay(self):
+        """
+        Reads every complete record and opens the log for appending.
+
+        Returns:
+            list: The record payloads (bytes) in the order they were appended.
+        """
+        payloads = []
+        for path in (self.rotated_path, self.path):
+            if os.path.exists(path):
+                payloads.extend(self._read(path))
+        self.records = len(payloads)
+        self.file = open(self.path, 'ab', buffering=0)
+        if self.fsync_policy == "interval":
+            threading.Thread(target=self._periodic_sync, daemon=True).start()
+        return payloads
+
+    def _read(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        payloads = []
+        offset = 0
+        while offset + RECORD_HEADER.size <= len(data):
+            length, checksum = RECORD_HEADER.unpack_from(data, offset)
+            start = offset + RECORD_HEADER.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            payloads.append(payload)
+            offset = start + length
+        if offset < len(data):
+            print(f"[WAL] Discarding {len(data) - offset} bytes of incomplete or corrupt records at the end of {path}")
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+                os.fsync(f.fileno())
+        return payloads
+
+    def append(self, payload):
+        """Appends one record, durable on return if the fsync policy is "always"."""
+        self.append_many([payload])
+
+    def append_many(self, payloads):
+        """Appends several records with a single write (and at most one fsync)."""
+        if not payloads:
+            return
+        buffer = b"".join(RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload for payload in payloads)
+        with self.lock:
+            self.file.write(buffer)
+            self.records += len(payloads)
+            if self.fsync_policy == "always":
+                os.fsync(self.file.fileno())
+            else:
+                self.dirty = True
+
+    def sync(self):
+        """Forces every appended record to disk."""
+        with self.lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        if self.dirty:
+            os.fsync(self.file.fileno())
+            self.dirty = False
+
+    def _periodic_sync(self):
+        while self.file is not None:
+            time.sleep(self.fsync_interval)
+            try:
+                self.sync()
+            except (OSError, ValueError) as e:
+                print(f"[WAL] fsync of {self.path} failed: {str(e)}")
+
+    def rotate(self):
+        """Moves the records written so far to `<path>.old` and continues with an empty log."""
+        with self.lock:
+            self._sync_locked()
+            self.file.close()
+            if os.path.exists(self.rotated_path):
+                # The previous checkpoint did not finish, keep its records in front of ours
+                with open(self.path, 'rb') as src, open(self.rotated_path, 'ab') as dst:
+                    shutil.copyfileobj(src, dst)
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.rotated_path)
+            self.file = open(self.path, 'ab', buffering=0)
+            self.records = 0
+            self._sync_directory()
+
+    def discard_rotated(self):
+        """Deletes the rotated records, once the checkpoint covering them is durable."""
+        if os.path.exists(self.rotated_path):
+            os.remove(self.rotated_path)
+            self._sync_directory()
+
+    def _sync_directory(self):
+        fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self._sync_locked()
+                self.file.close()
+                self.file = None
@@ -9,7 +9,8 @@ for port in "${ports[@]}"; do
     pid=$(lsof -ti :"$port")
     if [ -n "$pid" ]; then
         echo "Killing process on port $port (PID: $pid)"
-        kill -9 "$pid"
+        # Several PIDs are listed when frontend workers share the port
+        kill -9 $pid
     else
         echo "No process running on port $port"
     fi
@@ -0,0 +1,75 @@
+"""
+Shared setup of the benchmarks that run the services as gRPC servers on localhost.
+
+`ServiceProcesses` starts the catalog and order replicas each in its own process, with their files in
+one work folder, and returns their addresses. `order-batch-benchmark.py` imports it, and the paths of
+the service sources and data, from here.
+"""
+
+import multiprocessing
+import os
+import shutil
+import sys
+from concurrent import futures
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service")
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data")
+
+
+def copy_catalog(workdir):
+    """Copies the catalog file of the repo into the work folder."""
+    shutil.copy(os.path.join(DATA_DIR, "catalog_database.csv"), workdir)
+
+
+def serve(workdir, replica_id, catalog_address, environ, ports):
+    """Runs the catalog (replica_id 0) or an order replica and reports its port, meant to run in a child process."""
+    os.environ.update(environ)
+    sys.stdout = open(os.devnull, "w")
+    sys.path.insert(0, SERVICE_DIR)
+    import grpc
+    from channel_pool import SERVER_OPTIONS
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=64), options=SERVER_OPTIONS)
+    if replica_id == 0:
+        import catalog_pb2_grpc
+        from catalog import CatalogServiceImpl
+        catalog_pb2_grpc.add_CatalogServiceServicer_to_server(CatalogServiceImpl(os.path.join(workdir, "catalog_database.csv")), server)
+    else:
+        import order_pb2_grpc
+        from order import OrderServiceImpl
+        order_pb2_grpc.add_OrderServiceServicer_to_server(
+            OrderServiceImpl(os.path.join(workdir, f"order_database_{replica_id}.csv"), replica_id, catalog_address), server)
+    ports.put(server.add_insecure_port("localhost:0"))
+    server.start()
+    server.wait_for_termination()
+
+
+class ServiceProcesses:
+    """
+    Service processes of one measurement.
+
+    Args:
+        workdir (str): Folder holding the catalog and order files.
+        environ (dict): Environment variables set in every service process, e.g. REPLICATION_DURABILITY.
+    """
+
+    def __init__(self, workdir, environ=None):
+        self.workdir = workdir
+        self.environ = dict(environ or {})
+        # Forking once gRPC is running in this process can hang the child
+        self.context = multiprocessing.get_context("spawn")
+        self.ports = self.context.Queue()
+        self.processes = []
+
+    def start(self, replica_id=0, catalog_address=None):
+        """Starts the catalog (replica_id 0) or an order replica, returns its address once it is serving."""
+        process = self.context.Process(target=serve, args=(self.workdir, replica_id, catalog_address, self.environ, self.ports), daemon=True)
+        process.start()
+        self.processes.append(process)
+        return f"localhost:{self.ports.get()}"
+
+    def stop(self):
+        """Terminates every started process."""
+        for process in self.processes:
+            process.terminate()
+        self.processes.clear()
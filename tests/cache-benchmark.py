@@ -0,0 +1,62 @@
+"""
+Microbenchmark of cache hit throughput under concurrency.
+
+Compares the global-lock `Cache` with the lock-striped `ShardedCache` (exact LRU per shard and
+CLOCK with lock-free hits). The cache is pre-filled with the catalog stocks and every thread
+looks up random cached stocks for a fixed duration; hits/sec is reported at 1, 8 and 50 threads.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service"))
+
+from cache import Cache, ShardedCache
+
+THREAD_COUNTS = [1, 8, 50]
+DURATION = 2.0
+STOCKS = [f"STOCK{i}" for i in range(64)]
+
+
+def make_caches():
+    return [
+        ("Cache (global lock)", Cache(max_size=len(STOCKS))),
+        ("ShardedCache LRU", ShardedCache(max_size=len(STOCKS), num_shards=16)),
+        ("ShardedCache CLOCK", ShardedCache(max_size=len(STOCKS), num_shards=16, policy="clock")),
+    ]
+
+
+def run(cache, num_threads):
+    """Returns the number of cache hits per second across all threads."""
+    for stock in STOCKS:
+        cache.update_cache(stock, {"data": {"name": stock, "price": 1.0, "quantity": 100}})
+
+    counts = [0] * num_threads
+    deadline = time.perf_counter() + DURATION
+
+    def worker(index):
+        keys = [random.choice(STOCKS) for _ in range(64)]
+        hits = 0
+        while time.perf_counter() < deadline:
+            for key in keys:
+                if cache.get_cache(key) is not None:
+                    hits += 1
+        counts[index] = hits
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    print(f"{'cache':<22}" + "".join(f"{f'{n} threads':>16}" for n in THREAD_COUNTS))
+    for name, cache in make_caches():
+        results = [run(cache, n) for n in THREAD_COUNTS]
+        print(f"{name:<22}" + "".join(f"{r:>12,.0f}/s  " for r in results))
@@ -0,0 +1,81 @@
+"""
+Offline replay of a recorded stock key trace against every cache eviction policy.
+
+A trace is recorded by starting the frontend with CACHE_TRACE_FILE set, every line is
+`get,<stock>` or `invalidate,<stock>`. The client latency CSVs (latency_lru_*.csv) can be replayed
+as well: a lookup is a get and a trade an invalidation. A get that misses is followed by a put, the
+same way the frontend fills its cache from the catalog. Without arguments a synthetic workload is
+replayed: Zipf-distributed lookups of a few hot symbols interrupted by one-off STOCK0..STOCKn scans.
+
+Usage:
+    python cache-policy-replay.py [--size 10] [--shards 1] [trace or csv files...]
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service"))
+
+from cache import EVICTION_POLICIES, ShardedCache
+
+
+def read_trace(path):
+    """Yields (operation, stock) pairs from a frontend trace or a client latency CSV."""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        for row in reader:
+            if not row:
+                continue
+            if row[0] in ("get", "invalidate"):
+                yield row[0], row[1]
+            elif len(row) == 5 and row[2] in ("lookup", "trade"):
+                yield ("get" if row[2] == "lookup" else "invalidate"), row[3]
+
+
+def synthetic_trace(length=200000, hot_stocks=20, scan_every=500, scan_length=12, seed=1):
+    """Zipf-skewed lookups of `hot_stocks` symbols with a one-off scan every `scan_every` requests."""
+    rng = random.Random(seed)
+    stocks = [f"HOT{i}" for i in range(hot_stocks)]
+    weights = [1 / (rank + 1) for rank in range(hot_stocks)]
+    trace = []
+    scans = 0
+    while len(trace) < length:
+        for stock in rng.choices(stocks, weights, k=scan_every):
+            trace.append(("invalidate" if rng.random() < 0.05 else "get", stock))
+        trace.extend(("get", f"STOCK{scans * scan_length + i}") for i in range(scan_length))
+        scans += 1
+    return trace
+
+
+def replay(trace, policy, size, shards):
+    cache = ShardedCache(max_size=size, num_shards=shards, policy=policy)
+    for operation, stock in trace:
+        if operation == "get":
+            if cache.get_cache(stock) is None:
+                cache.update_cache(stock, stock)
+        else:
+            cache.invalidate_stock(stock)
+    return cache.stats()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replays a cache key trace against every eviction policy")
+    parser.add_argument("traces", nargs="*", help="frontend traces (CACHE_TRACE_FILE) or client latency CSVs")
+    parser.add_argument("--size", type=int, default=10, help="cache size, the frontend uses 10")
+    parser.add_argument("--shards", type=int, default=1, help="number of cache shards")
+    args = parser.parse_args()
+
+    if args.traces:
+        trace = [entry for path in args.traces for entry in read_trace(path)]
+    else:
+        trace = synthetic_trace()
+    gets = sum(1 for operation, _ in trace if operation == "get")
+    print(f"{len(trace)} operations, {gets} lookups, cache size {args.size}, {args.shards} shard(s)\n")
+
+    print(f"{'policy':<10}{'hit ratio':>12}{'hits':>12}{'misses':>12}{'evictions':>12}")
+    results = [replay(trace, policy, args.size, args.shards) for policy in EVICTION_POLICIES]
+    for stats in sorted(results, key=lambda stats: -stats["hit_ratio"]):
+        print(f"{stats['policy']:<10}{stats['hit_ratio']:>12.2%}{stats['hits']:>12}{stats['misses']:>12}{stats['evictions']:>12}")
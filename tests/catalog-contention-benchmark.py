@@ -0,0 +1,79 @@
+"""
+Contention benchmark of catalog trades.
+
+Threads call `ReserveStock` on an in-process `CatalogServiceImpl` (no gRPC, so only the catalog's own
+locking, applying and persistence are measured), alternating buys and sells of one share:
+
+- "hot symbol": every thread trades the same stock
+- "spread": thread i trades stock i of the catalog, so threads rarely share a stock
+
+Trades/sec, the p99 latency per trade and the average number of trades the catalog combined into one
+apply and write (flat combining) are reported for 1, 8 and 32 threads. The catalog works on a
+fresh copy of the catalog file per measurement.
+"""
+
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service")
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data")
+sys.path.insert(0, SERVICE_DIR)
+
+import catalog_pb2
+from catalog import CatalogServiceImpl
+
+THREAD_COUNTS = [1, 8, 32]
+MODES = ["hot symbol", "spread"]
+DURATION = 3.0
+
+
+def run(mode, num_threads, names, workdir):
+    """Returns (trades/sec, p99 latency, trades per combining pass) with the latency in seconds."""
+    # The periodic flush of earlier catalogs keeps running, so each one keeps its folder until the end
+    workdir = os.path.join(workdir, f"{mode}-{num_threads}")
+    os.makedirs(workdir)
+    shutil.copy(os.path.join(DATA_DIR, "catalog_database.csv"), workdir)
+    catalog = CatalogServiceImpl(os.path.join(workdir, "catalog_database.csv"))
+    latencies = [[] for _ in range(num_threads)]
+    deadline = time.perf_counter() + DURATION
+
+    def trader(index):
+        stock_name = names[0] if mode == "hot symbol" else names[index % len(names)]
+        count = 0
+        while time.perf_counter() < deadline:
+            request = catalog_pb2.ReserveRequest(name=stock_name, order_type="buy" if count % 2 else "sell", quantity=1)
+            start_time = time.perf_counter()
+            response = catalog.ReserveStock(request, None)
+            latencies[index].append(time.perf_counter() - start_time)
+            assert response.success, response.message
+            count += 1
+
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=trader, args=(i,)) for i in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start_time
+    samples = sorted(latency for thread_latencies in latencies for latency in thread_latencies)
+    return len(samples) / elapsed, samples[int(len(samples) * 0.99)], catalog.combining_stats()["average_pass_size"]
+
+
+if __name__ == "__main__":
+    sys.stdout, stdout = open(os.devnull, "w"), sys.stdout
+    with open(os.path.join(DATA_DIR, "catalog_database.csv")) as f:
+        names = [row["name"] for row in csv.DictReader(f)]
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in MODES:
+            rows.append((mode, [run(mode, num_threads, names, workdir) for num_threads in THREAD_COUNTS]))
+    sys.stdout = stdout
+    print("trades/sec (p99 latency, trades per pass)")
+    print(f"{'':<12}" + "".join(f"{f'{n} threads':>28}" for n in THREAD_COUNTS))
+    for mode, results in rows:
+        print(f"{mode:<12}" + "".join(f"{f'{rate:,.0f}/s ({p99 * 1000:.1f}ms, {pass_size:.1f})':>28}" for rate, p99, pass_size in results))
@@ -0,0 +1,91 @@
+"""
+Benchmark of the cost of persisting catalog trades as the catalog grows.
+
+Threads call `ReserveStock` on an in-process `CatalogServiceImpl` (no gRPC), alternating buys and sells of
+one share spread over the stocks. Every acknowledged trade has to be on disk, so this measures what the
+catalog writes per trade: a full rewrite of the catalog file used to grow with the number of stocks, a
+record appended to the change log does not.
+
+The real catalog file and generated catalogs of 1,000 and 10,000 stocks are used, with a fresh copy per
+measurement. Trades/sec and the p99 latency per trade are reported for 1 and 8 threads.
+"""
+
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service")
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data")
+sys.path.insert(0, SERVICE_DIR)
+
+import catalog_pb2
+from catalog import CatalogServiceImpl
+
+CATALOG_SIZES = [None, 1000, 10000]
+THREAD_COUNTS = [1, 8]
+DURATION = 3.0
+
+
+def write_catalog(path, size):
+    """Writes a copy of the real catalog, or a generated one of size stocks, and returns the stock names."""
+    if size is None:
+        shutil.copy(os.path.join(DATA_DIR, "catalog_database.csv"), path)
+        with open(path) as f:
+            return [row["name"] for row in csv.DictReader(f)]
+    names = [f"S{i:05d}" for i in range(size)]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["name", "price", "quantity", "volume"])
+        writer.writeheader()
+        for name in names:
+            writer.writerow({"name": name, "price": 100.0, "quantity": 1000, "volume": 0})
+    return names
+
+
+def run(size, num_threads, workdir):
+    """Returns (number of stocks, trades/sec, p99 latency) with the latency in seconds."""
+    # The periodic flush of earlier catalogs keeps running, so each one keeps its folder until the end
+    workdir = os.path.join(workdir, f"{size}-{num_threads}")
+    os.makedirs(workdir)
+    names = write_catalog(os.path.join(workdir, "catalog_database.csv"), size)
+    catalog = CatalogServiceImpl(os.path.join(workdir, "catalog_database.csv"))
+    latencies = [[] for _ in range(num_threads)]
+    deadline = time.perf_counter() + DURATION
+
+    def trader(index):
+        count = 0
+        while time.perf_counter() < deadline:
+            # A sell then a buy of each stock, so a thread never buys more than it sold
+            stock_name = names[(index + count // 2 * num_threads) % len(names)]
+            request = catalog_pb2.ReserveRequest(name=stock_name, order_type="buy" if count % 2 else "sell", quantity=1)
+            start_time = time.perf_counter()
+            response = catalog.ReserveStock(request, None)
+            latencies[index].append(time.perf_counter() - start_time)
+            assert response.success, response.message
+            count += 1
+
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=trader, args=(i,)) for i in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start_time
+    samples = sorted(latency for thread_latencies in latencies for latency in thread_latencies)
+    return len(names), len(samples) / elapsed, samples[int(len(samples) * 0.99)]
+
+
+if __name__ == "__main__":
+    sys.stdout, stdout = open(os.devnull, "w"), sys.stdout
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in CATALOG_SIZES:
+            rows.append([run(size, num_threads, workdir) for num_threads in THREAD_COUNTS])
+    sys.stdout = stdout
+    print("trades/sec (p99 latency)")
+    print(f"{'':<14}" + "".join(f"{f'{n} threads':>24}" for n in THREAD_COUNTS))
+    for results in rows:
+        print(f"{f'{results[0][0]:,} stocks':<14}" + "".join(f"{f'{rate:,.0f}/s ({p99 * 1000:.1f}ms)':>24}" for _, rate, p99 in results))
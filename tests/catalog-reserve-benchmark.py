@@ -0,0 +1,98 @@
+"""
+Benchmark of the catalog calls a trade makes.
+
+- "lookup + update": the previous order path, `LookupStock` to check the quantity, then `UpdateStock`
+- "reserve": one `ReserveStock` that checks and applies the trade atomically
+
+The catalog runs as a gRPC server on localhost in its own process with a fresh copy of the catalog
+file. Clients alternate buys and sells of one share spread over the stocks. Trades/sec and the p50/p99
+latency per trade are reported for 1, 8 and 32 clients.
+"""
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent import futures
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service")
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data")
+
+CLIENT_COUNTS = [1, 8, 32]
+MODES = ["lookup + update", "reserve"]
+DURATION = 3.0
+
+
+def serve(workdir, ports):
+    """Runs the catalog and reports its port, meant to run in a child process."""
+    sys.stdout = open(os.devnull, "w")
+    sys.path.insert(0, SERVICE_DIR)
+    import grpc
+    import catalog_pb2_grpc
+    from catalog import CatalogServiceImpl
+    from channel_pool import SERVER_OPTIONS
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=64), options=SERVER_OPTIONS)
+    catalog_pb2_grpc.add_CatalogServiceServicer_to_server(CatalogServiceImpl(os.path.join(workdir, "catalog_database.csv")), server)
+    ports.put(server.add_insecure_port("localhost:0"))
+    server.start()
+    server.wait_for_termination()
+
+
+def run(mode, num_clients):
+    """Returns (trades/sec, p50 latency, p99 latency) with latencies in seconds."""
+    sys.path.insert(0, SERVICE_DIR)
+    import grpc
+    import catalog_pb2
+    import catalog_pb2_grpc
+
+    # Forking once gRPC is running in this process can hang the child
+    context = multiprocessing.get_context("spawn")
+    ports = context.Queue()
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copy(os.path.join(DATA_DIR, "catalog_database.csv"), workdir)
+        process = context.Process(target=serve, args=(workdir, ports), daemon=True)
+        process.start()
+        stub = catalog_pb2_grpc.CatalogServiceStub(grpc.insecure_channel(f"localhost:{ports.get()}"))
+        names = ["AAPL", "MSFT", "GOOGL", "AMZN", "META", "NFLX", "TSLA", "NVDA"]
+
+        def trade(stock_name, order_type):
+            if mode == "reserve":
+                stub.ReserveStock(catalog_pb2.ReserveRequest(name=stock_name, order_type=order_type, quantity=1))
+                return
+            stock = stub.LookupStock(catalog_pb2.LookupRequest(name=stock_name))
+            if stock.exists and (order_type == "sell" or stock.quantity >= 1):
+                stub.UpdateStock(catalog_pb2.UpdateRequest(name=stock_name, quantity_change=-1 if order_type == "buy" else 1))
+
+        latencies = [[] for _ in range(num_clients)]
+        deadline = time.perf_counter() + DURATION
+
+        def client(index):
+            count = 0
+            while time.perf_counter() < deadline:
+                start_time = time.perf_counter()
+                trade(names[index % len(names)], "buy" if count % 2 else "sell")
+                latencies[index].append(time.perf_counter() - start_time)
+                count += 1
+
+        start_time = time.perf_counter()
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(num_clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start_time
+        process.terminate()
+        samples = sorted(latency for client_latencies in latencies for latency in client_latencies)
+        return len(samples) / elapsed, samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+if __name__ == "__main__":
+    print(f"trades/sec (p50 / p99 latency)")
+    print(f"{'':<18}" + "".join(f"{f'{n} clients':>28}" for n in CLIENT_COUNTS))
+    for mode in MODES:
+        results = [run(mode, num_clients) for num_clients in CLIENT_COUNTS]
+        print(f"{mode:<18}" + "".join(f"{f'{rate:,.0f}/s ({p50 * 1000:.1f} / {p99 * 1000:.1f}ms)':>28}" for rate, p50, p99 in results))
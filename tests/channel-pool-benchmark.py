@@ -0,0 +1,113 @@
+"""
+Benchmark of per-request latency with and without pooled gRPC channels.
+
+Starts the catalog and one order replica in-process on free ports (using copies of the CSV
+databases in a temp folder) and measures:
+- lookup path: frontend -> catalog `LookupStock`
+- trade path: frontend -> order `PlaceOrder` -> catalog `LookupStock` + `UpdateStock`
+once opening a new channel per call (the previous behaviour) and once through `ChannelPool`.
+"""
+
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent import futures
+
+import grpc
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service")
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data")
+sys.path.insert(0, SERVICE_DIR)
+
+from channel_pool import ChannelPool, SERVER_OPTIONS
+from catalog import CatalogServiceImpl
+from order import OrderServiceImpl
+import catalog_pb2
+import catalog_pb2_grpc
+import order_pb2
+import order_pb2_grpc
+
+NUM_REQUESTS = 500
+
+
+class UnpooledChannels:
+    """Mimics the old behaviour: every stub gets a brand new channel that is closed after the call."""
+
+    def __init__(self):
+        self.open_channels = []
+
+    def get_stub(self, address, stub_class):
+        channel = grpc.insecure_channel(address)
+        self.open_channels.append(channel)
+        return stub_class(channel)
+
+    def reset(self, address):
+        pass
+
+    def close(self):
+        for channel in self.open_channels:
+            channel.close()
+        self.open_channels = []
+
+
+def start_services(workdir):
+    """Starts the catalog and an order replica, returns (servers, catalog address, order address)."""
+    shutil.copy(os.path.join(DATA_DIR, "catalog_database.csv"), workdir)
+    catalog_server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), options=SERVER_OPTIONS)
+    catalog_pb2_grpc.add_CatalogServiceServicer_to_server(
+        CatalogServiceImpl(os.path.join(workdir, "catalog_database.csv")), catalog_server)
+    catalog_port = catalog_server.add_insecure_port("localhost:0")
+    catalog_server.start()
+    catalog_address = f"localhost:{catalog_port}"
+
+    order_service = OrderServiceImpl(os.path.join(workdir, "order_database_1.csv"), 1, catalog_address=catalog_address)
+    order_server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), options=SERVER_OPTIONS)
+    order_pb2_grpc.add_OrderServiceServicer_to_server(order_service, order_server)
+    order_port = order_server.add_insecure_port("localhost:0")
+    order_server.start()
+    return [catalog_server, order_server], order_service, catalog_address, f"localhost:{order_port}"
+
+
+def measure(call, channels):
+    """Runs `call` NUM_REQUESTS times and returns the latencies in milliseconds."""
+    latencies = []
+    for _ in range(NUM_REQUESTS):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+        if isinstance(channels, UnpooledChannels):
+            channels.close()
+    return latencies
+
+
+def run_benchmark(label, channels, order_service, catalog_address, order_address):
+    order_service.channel_pool = channels
+
+    def lookup():
+        stub = channels.get_stub(catalog_address, catalog_pb2_grpc.CatalogServiceStub)
+        stub.LookupStock(catalog_pb2.LookupRequest(name="AAPL"))
+
+    def trade():
+        stub = channels.get_stub(order_address, order_pb2_grpc.OrderServiceStub)
+        stub.PlaceOrder(order_pb2.OrderRequest(stock_name="AAPL", quantity=1, order_type="sell"))
+
+    for name, call in [("lookup", lookup), ("trade", trade)]:
+        latencies = measure(call, channels)
+        print(f"{label:<10} {name:<7} mean {statistics.mean(latencies):7.3f} ms   "
+              f"p50 {statistics.median(latencies):7.3f} ms   "
+              f"p99 {sorted(latencies)[int(len(latencies) * 0.99) - 1]:7.3f} ms")
+
+
+if __name__ == "__main__":
+    workdir = tempfile.mkdtemp()
+    servers, order_service, catalog_address, order_address = start_services(workdir)
+    try:
+        run_benchmark("per-call", UnpooledChannels(), order_service, catalog_address, order_address)
+        run_benchmark("pooled", ChannelPool(), order_service, catalog_address, order_address)
+    finally:
+        for server in servers:
+            server.stop(None)
+        shutil.rmtree(workdir)
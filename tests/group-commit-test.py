@@ -0,0 +1,106 @@
+"""
+This test script checks that group commit batches concurrent writes without losing or reordering them,
+that a failed write reaches every writer of its batch, and that the write-ahead log the batches are
+appended to recovers every complete record after a crash in the middle of a write.
+Everything runs in-process on temp files, no services need to be running.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service")
+sys.path.insert(0, SERVICE_DIR)
+
+from group_commit import GroupCommitter
+from wal import RECORD_HEADER, WriteAheadLog
+
+# Concurrent writers of the batching test
+NUM_WRITERS = 32
+
+# Writers submitting at the same time share batches, and every record is written once, in one piece per writer
+def test_concurrent_writers_share_batches():
+    print("\n[TEST] Concurrent writers share batches")
+    batches = []
+
+    def write_batch(records):
+        time.sleep(0.01)  # a slow disk, so writers queue up behind the flush
+        batches.append(list(records))
+
+    committer = GroupCommitter(write_batch, "test")
+    threads = [threading.Thread(target=committer.commit, args=([f"{i}-a", f"{i}-b"],)) for i in range(NUM_WRITERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    written = [record for batch in batches for record in batch]
+    print(f"{len(written)} records in {len(batches)} batches")
+    assert sorted(written) == sorted(f"{i}-{part}" for i in range(NUM_WRITERS) for part in "ab")
+    for batch in batches:
+        # The records of one submit are never split across batches
+        for index in range(0, len(batch), 2):
+            assert batch[index][:-1] == batch[index + 1][:-1]
+    assert len(batches) < NUM_WRITERS
+
+# A failed write is raised to every writer of the batch, and the next batch is written normally
+def test_failed_write_reaches_every_writer():
+    print("\n[TEST] Failed write reaches every writer of the batch")
+    written = []
+
+    def write_batch(records):
+        if records == ["a", "b"]:
+            raise OSError("disk full")
+        written.extend(records)
+
+    # The delay lets both submits join one batch
+    committer = GroupCommitter(write_batch, "test", max_delay=0.2)
+    first, second = committer.submit(["a"]), committer.submit(["b"])
+    assert first is second
+    for batch in (first, second):
+        try:
+            batch.wait()
+            assert False, "the failed write was not raised"
+        except OSError as e:
+            print("Raised:", e)
+    committer.commit(["c"])
+    assert written == ["c"]
+
+# Records committed before a crash in the middle of the next write are replayed, the torn record is dropped
+def test_replay_after_truncated_record(workdir):
+    print("\n[TEST] Log replay after a truncated record")
+    path = os.path.join(workdir, "orders.wal")
+    wal = WriteAheadLog(path, fsync_policy="always")
+    assert wal.replay() == []
+    committer = GroupCommitter(wal.append_many, "test")
+    payloads = [f"order {i}".encode('utf-8') for i in range(10)]
+    for payload in payloads:
+        committer.commit([payload])
+    wal.close()
+    clean_size = os.path.getsize(path)
+
+    # The header and half the payload of the next record made it to disk
+    torn = b"order 10"
+    with open(path, 'ab') as f:
+        f.write(RECORD_HEADER.pack(len(torn), 0) + torn[:4])
+
+    wal = WriteAheadLog(path, fsync_policy="always")
+    replayed = wal.replay()
+    print(f"Replayed {len(replayed)} records")
+    assert replayed == payloads
+    assert os.path.getsize(path) == clean_size
+
+    # Appending continues after the last complete record
+    wal.append(torn)
+    wal.close()
+    assert WriteAheadLog(path).replay() == payloads + [torn]
+
+if __name__ == "__main__":
+    test_concurrent_writers_share_batches()
+    test_failed_write_reaches_every_writer()
+    with tempfile.TemporaryDirectory() as workdir:
+        test_replay_after_truncated_record(workdir)
+
+    print("\nGroup commit tests passed.")
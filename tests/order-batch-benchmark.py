@@ -0,0 +1,78 @@
+"""
+Benchmark of placing baskets of orders with one leader and two followers (quorum durability).
+
+- "PlaceOrder per order": every order of a basket is a separate `PlaceOrder`, with its own catalog
+  call, log write and wait for a follower
+- "PlaceOrders per basket": the basket is one `PlaceOrders`, which costs one `UpdateStocks` catalog call,
+  one log write and one wait for a follower however many orders it has
+
+A catalog and three order replicas run as gRPC servers on localhost, each in its own process, with a
+fresh temp folder per measurement. Orders/sec and the p50 latency per basket are reported for baskets of
+1, 10 and 50 orders placed by 8 clients.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+
+from benchmark_services import SERVICE_DIR, ServiceProcesses, copy_catalog
+
+BASKET_SIZES = [1, 10, 50]
+MODES = ["PlaceOrder per order", "PlaceOrders per basket"]
+NUM_CLIENTS = 8
+DURATION = 3.0
+
+
+def run(mode, basket_size):
+    """Returns (orders/sec, p50 latency per basket) with the latency in seconds."""
+    sys.path.insert(0, SERVICE_DIR)
+    import grpc
+    import order_pb2
+    import order_pb2_grpc
+
+    with tempfile.TemporaryDirectory() as workdir:
+        copy_catalog(workdir)
+        services = ServiceProcesses(workdir, {"ORDER_CHECKPOINT_INTERVAL": "3600", "REPLICATION_DURABILITY": "quorum"})
+        catalog_address = services.start()
+        addresses = [services.start(replica_id, catalog_address) for replica_id in (3, 1, 2)]
+        leader = order_pb2_grpc.OrderServiceStub(grpc.insecure_channel(addresses[0]))
+        leader.SetFollowers(order_pb2.SetFollowersRequest(addresses=addresses[1:], replica_count=len(addresses)))
+        time.sleep(0.5)
+        names = ["AAPL", "MSFT", "GOOGL", "AMZN", "META", "NFLX", "TSLA", "NVDA"]
+        basket = [order_pb2.OrderRequest(stock_name=names[i % len(names)], quantity=1, order_type="sell") for i in range(basket_size)]
+
+        def place():
+            if mode == "PlaceOrders per basket":
+                results = leader.PlaceOrders(order_pb2.PlaceOrdersRequest(orders=basket)).results
+            else:
+                results = [leader.PlaceOrder(order) for order in basket]
+            assert all(result.success for result in results)
+
+        latencies = [[] for _ in range(NUM_CLIENTS)]
+        deadline = time.perf_counter() + DURATION
+
+        def client(index):
+            while time.perf_counter() < deadline:
+                start_time = time.perf_counter()
+                place()
+                latencies[index].append(time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(NUM_CLIENTS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start_time
+        services.stop()
+        samples = sorted(latency for client_latencies in latencies for latency in client_latencies)
+        return len(samples) * basket_size / elapsed, samples[len(samples) // 2]
+
+
+if __name__ == "__main__":
+    print(f"orders/sec (p50 latency per basket), {NUM_CLIENTS} clients")
+    print(f"{'':<24}" + "".join(f"{f'{n} orders':>24}" for n in BASKET_SIZES))
+    for mode in MODES:
+        results = [run(mode, basket_size) for basket_size in BASKET_SIZES]
+        print(f"{mode:<24}" + "".join(f"{f'{rate:,.0f}/s ({p50 * 1000:.1f}ms)':>24}" for rate, p50 in results))
@@ -0,0 +1,81 @@
+"""
+Benchmark of recovering an empty order replica from a leader holding 10k, 100k and 1M orders.
+
+- "relay": the previous sync, the orders are fetched from the leader with one `LookUpOrdersById` call
+  and pushed to the replica with one `BulkUpsert` call, as the frontend did
+- "catch-up": the replica pulls them with `CatchUpFrom` over the chunked `CatchUp` stream
+- "catch-up gzip": the same with CATCH_UP_COMPRESSION=gzip
+
+Leader and replica are gRPC servers on localhost in a fresh process with their own temp folder.
+Reports the time to sync or the gRPC error.
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent import futures
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service")
+
+HISTORY_SIZES = [10_000, 100_000, 1_000_000]
+MODES = ["relay", "catch-up", "catch-up gzip"]
+
+
+def run(mode, size):
+    """Returns the sync time in seconds or the error, meant to run in a child process."""
+    os.environ["ORDER_CHECKPOINT_INTERVAL"] = "3600"
+    if mode == "catch-up gzip":
+        os.environ["CATCH_UP_COMPRESSION"] = "gzip"
+    sys.path.insert(0, SERVICE_DIR)
+    import grpc
+    import order_pb2
+    import order_pb2_grpc
+    from channel_pool import SERVER_OPTIONS
+    from order import OrderServiceImpl
+
+    with tempfile.TemporaryDirectory() as workdir:
+        leader = OrderServiceImpl(os.path.join(workdir, "order_database_3.csv"), 3)
+        for i in range(size):
+            leader.store.add(i, f"STOCK{i % 10}", "buy" if i % 2 else "sell", 1 + i % 5)
+        leader.transaction_id = size
+        replica = OrderServiceImpl(os.path.join(workdir, "order_database_1.csv"), 1)
+
+        addresses = []
+        servers = []
+        for impl in (leader, replica):
+            server = grpc.server(futures.ThreadPoolExecutor(max_workers=4), options=SERVER_OPTIONS)
+            order_pb2_grpc.add_OrderServiceServicer_to_server(impl, server)
+            addresses.append(f"localhost:{server.add_insecure_port('localhost:0')}")
+            server.start()
+            servers.append(server)
+        leader_stub = order_pb2_grpc.OrderServiceStub(grpc.insecure_channel(addresses[0]))
+        replica_stub = order_pb2_grpc.OrderServiceStub(grpc.insecure_channel(addresses[1]))
+
+        start = time.perf_counter()
+        try:
+            if mode == "relay":
+                response = leader_stub.LookUpOrdersById(order_pb2.LookUpByIdRequest(transaction_id=-1))
+                replica_stub.BulkUpsert(order_pb2.BulkUpsertRequest(data=response.data))
+            else:
+                replica_stub.CatchUpFrom(order_pb2.CatchUpFromRequest(leader_address=addresses[0]))
+        except grpc.RpcError as e:
+            return e.code().name
+        elapsed = time.perf_counter() - start
+        assert len(replica.store) == size
+        for server in servers:
+            server.stop(None)
+        return elapsed
+
+
+if __name__ == "__main__":
+    context = multiprocessing.get_context("fork")
+    print(f"{'orders stored':<16}" + "".join(f"{mode:>24}" for mode in MODES))
+    for size in HISTORY_SIZES:
+        results = []
+        for mode in MODES:
+            with context.Pool(1) as pool:
+                result = pool.apply(run, (mode, size))
+            results.append(f"{result * 1000:,.0f}ms" if isinstance(result, float) else result)
+        print(f"{size:<16,}" + "".join(f"{r:>24}" for r in results))
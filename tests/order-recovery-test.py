@@ -0,0 +1,89 @@
+"""
+This test script checks that an order replica restarts with every order it acknowledged: from the
+binary snapshot plus the orders logged after it, and from a checkpoint that crashed between rotating
+the log and writing the snapshot. Replicas run in-process on temp files, no services need to be running.
+"""
+
+import csv
+import os
+import sys
+import tempfile
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service")
+sys.path.insert(0, SERVICE_DIR)
+# Checkpoints are only taken by the tests
+os.environ["ORDER_CHECKPOINT_INTERVAL"] = "3600"
+
+import order_pb2
+from order import OrderServiceImpl
+
+# Orders in the CSV file of the very first start
+HISTORY_SIZE = 100
+
+def write_history(order_file):
+    with open(order_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['transaction_id', 'stock_name', 'order_type', 'quantity'])
+        writer.writerows((i, f"STOCK{i % 10}", "buy" if i % 2 else "sell", 1 + i % 5) for i in range(HISTORY_SIZE))
+
+# Logs orders the way a follower receives them
+def sync_orders(service, first_id, count):
+    for transaction_id in range(first_id, first_id + count):
+        response = service.SyncOrder(order_pb2.OrderSyncRequest(
+            transaction_id=transaction_id, stock_name="AAPL", order_type="buy", quantity=transaction_id), None)
+        assert response.success
+
+# Checks the replica holds exactly the orders 0 .. count - 1 and continues after them
+def check_orders(service, count):
+    assert len(service.store) == count, f"{len(service.store)} orders instead of {count}"
+    for transaction_id in range(count):
+        order = service.store.get(transaction_id)
+        if transaction_id < HISTORY_SIZE:
+            assert order['stock_name'] == f"STOCK{transaction_id % 10}" and order['quantity'] == 1 + transaction_id % 5
+        else:
+            assert order['stock_name'] == "AAPL" and order['quantity'] == transaction_id
+    assert service.transaction_id == count
+
+# Restart after a checkpoint: the snapshot holds the history, the log holds the orders placed after it
+def test_snapshot_plus_log_recovery(workdir):
+    print("\n[TEST] Recovery from the snapshot plus the log")
+    order_file = os.path.join(workdir, "order_database_1.csv")
+    write_history(order_file)
+    service = OrderServiceImpl(order_file, 1)
+    service.flush_to_disk()
+    assert os.path.exists(service.snapshot_file)
+    assert os.path.getsize(service.wal.path) == 0
+    sync_orders(service, HISTORY_SIZE, 20)
+
+    # The CSV file is not read again once there is a snapshot
+    os.remove(order_file)
+    restarted = OrderServiceImpl(order_file, 1)
+    check_orders(restarted, HISTORY_SIZE + 20)
+    print(f"Recovered {len(restarted.store)} orders")
+
+# Restart after a checkpoint that rotated the log but crashed before its snapshot was written
+def test_interrupted_checkpoint_recovery(workdir):
+    print("\n[TEST] Recovery after an interrupted checkpoint")
+    order_file = os.path.join(workdir, "order_database_1.csv")
+    write_history(order_file)
+    service = OrderServiceImpl(order_file, 1)
+    service.flush_to_disk()
+    sync_orders(service, HISTORY_SIZE, 10)
+    service.wal.rotate()
+    sync_orders(service, HISTORY_SIZE + 10, 10)
+
+    restarted = OrderServiceImpl(order_file, 1)
+    check_orders(restarted, HISTORY_SIZE + 20)
+    # The next checkpoint covers the rotated records too and deletes them
+    sync_orders(restarted, HISTORY_SIZE + 20, 5)
+    restarted.flush_to_disk()
+    assert not os.path.exists(restarted.wal.rotated_path)
+    check_orders(OrderServiceImpl(order_file, 1), HISTORY_SIZE + 25)
+    print(f"Recovered {HISTORY_SIZE + 25} orders")
+
+if __name__ == "__main__":
+    for test in (test_snapshot_plus_log_recovery, test_interrupted_checkpoint_recovery):
+        with tempfile.TemporaryDirectory() as workdir:
+            test(workdir)
+
+    print("\nOrder recovery tests passed.")
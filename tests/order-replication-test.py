@@ -0,0 +1,187 @@
+"""
+This test script checks that the leader replicates placed orders to its followers: every follower ends
+up with the leader's orders, a follower that was down catches up once it is back, and an order the
+leader failed to log is never sent to a follower. With quorum durability an order is acknowledged once
+a majority has it, and an order placed while the followers are down is still placed but answered by
+the frontend with a 202 flagged `under_replicated`.
+
+The catalog, three order replicas and the frontend run in-process on their usual ports (50052,
+50054-50056 and 8081), so stop any running services first. Replica 3 is the leader.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent import futures
+
+import requests
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service")
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data")
+sys.path.insert(0, SERVICE_DIR)
+# Checkpoints are not needed by the tests, and a restarted follower is reconnected quickly
+os.environ["ORDER_CHECKPOINT_INTERVAL"] = "3600"
+os.environ["REPLICATION_RETRY_INTERVAL"] = "0.2"
+# A majority of the three replicas has to store an order, a missing follower ack is given up on quickly
+os.environ["REPLICATION_DURABILITY"] = "quorum"
+os.environ["REPLICATION_ACK_TIMEOUT"] = "0.5"
+
+import grpc
+import catalog_pb2_grpc
+import order_pb2
+import order_pb2_grpc
+from catalog import CatalogServiceImpl
+from channel_pool import SERVER_OPTIONS
+from order import OrderServiceImpl
+import front_end
+
+FRONTEND_PORT = 8081
+FRONTEND_URL = f"http://localhost:{FRONTEND_PORT}"
+CATALOG_ADDRESS = "localhost:50052"
+REPLICA_ADDRESSES = {1: "localhost:50054", 2: "localhost:50055", 3: "localhost:50056"}
+LEADER_ID = 3
+# Seconds a follower gets to receive the orders of a test
+REPLICATION_TIMEOUT = 5.0
+
+def start_server(add_servicer, service, address):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=16), options=SERVER_OPTIONS)
+    add_servicer(service, server)
+    server.add_insecure_port(address)
+    server.start()
+    return server
+
+def start_replica(workdir, replica_id):
+    """Starts an order replica on its usual port, returns (service, server)."""
+    service = OrderServiceImpl(os.path.join(workdir, f"order_database_{replica_id}.csv"), replica_id, CATALOG_ADDRESS)
+    return service, start_server(order_pb2_grpc.add_OrderServiceServicer_to_server, service, REPLICA_ADDRESSES[replica_id])
+
+def announce_followers(leader, follower_ids):
+    # What the frontend membership does whenever the active replicas change
+    addresses = [REPLICA_ADDRESSES[replica_id] for replica_id in follower_ids]
+    leader.SetFollowers(order_pb2.SetFollowersRequest(addresses=addresses, replica_count=len(REPLICA_ADDRESSES)), None)
+
+def place_orders(leader, count):
+    transaction_ids = []
+    for _ in range(count):
+        response = leader.PlaceOrder(order_pb2.OrderRequest(stock_name="AAPL", quantity=1, order_type="sell"), None)
+        assert response.success, response.message
+        transaction_ids.append(response.transaction_id)
+    return transaction_ids
+
+def wait_for_orders(replica, transaction_ids):
+    """Returns True once the replica stores every id, False if it does not within REPLICATION_TIMEOUT."""
+    deadline = time.monotonic() + REPLICATION_TIMEOUT
+    while time.monotonic() < deadline:
+        if all(transaction_id in replica.store for transaction_id in transaction_ids):
+            return True
+        time.sleep(0.05)
+    return False
+
+# Orders placed on the leader reach every follower unchanged
+def test_followers_receive_orders(leader, followers):
+    print("\n[TEST] Followers receive placed orders")
+    transaction_ids = place_orders(leader, 10)
+    for replica_id, (follower, _) in followers.items():
+        assert wait_for_orders(follower, transaction_ids), f"Replica {replica_id} is missing orders"
+        assert list(follower.store) == list(leader.store)
+    print("Replicated orders:", transaction_ids)
+
+# A follower that was down gets the orders placed meanwhile once it is back
+def test_restarted_follower_catches_up(workdir, leader, followers):
+    print("\n[TEST] Restarted follower catches up")
+    follower, server = followers[1]
+    server.stop(0).wait()
+    missed = place_orders(leader, 5)
+    assert all(transaction_id not in follower.store for transaction_id in missed)
+
+    followers[1] = start_replica(workdir, 1)
+    announce_followers(leader, [1, 2])
+    assert wait_for_orders(followers[1][0], missed), "Replica 1 did not catch up"
+    assert list(followers[1][0].store) == list(leader.store)
+    print("Caught up on orders:", missed)
+
+# An order whose log write failed on the leader is not sent to the followers
+def test_unlogged_order_not_replicated(leader, followers):
+    print("\n[TEST] Unlogged orders are not replicated")
+    write_batch = leader.group_commit.write_batch
+
+    def failing_write(records):
+        raise OSError("disk full")
+
+    leader.group_commit.write_batch = failing_write
+    try:
+        leader.PlaceOrder(order_pb2.OrderRequest(stock_name="AAPL", quantity=1, order_type="sell"), None)
+        assert False, "placing the order did not fail"
+    except OSError as e:
+        print("PlaceOrder failed:", e)
+    finally:
+        leader.group_commit.write_batch = write_batch
+    unlogged_id = leader.store.max_id()
+
+    time.sleep(1.0)
+    for replica_id, (follower, _) in followers.items():
+        assert unlogged_id not in follower.store, f"Replica {replica_id} received unlogged order {unlogged_id}"
+    assert all(status.match_transaction_id < unlogged_id for status in leader.replicator.status())
+
+# With quorum durability the leader acknowledges once one of the two followers has the order
+def test_quorum_durability(leader, followers):
+    print("\n[TEST] Quorum durability")
+    response = leader.PlaceOrder(order_pb2.OrderRequest(stock_name="AAPL", quantity=1, order_type="sell"), None)
+    print("Response:", response.durability, response.acks, response.message)
+    assert response.success and not response.under_replicated
+    assert response.durability == "quorum" and response.acks >= 2
+
+    # One follower down still leaves a majority
+    followers[2][1].stop(0).wait()
+    response = leader.PlaceOrder(order_pb2.OrderRequest(stock_name="AAPL", quantity=1, order_type="sell"), None)
+    print("Response:", response.durability, response.acks, response.message)
+    assert response.success and not response.under_replicated and response.acks == 2
+
+# An order placed while no follower is up is still placed, the frontend answers 202 so clients do not retry it
+def test_under_replicated_order_answered_with_202(leader, followers):
+    print("\n[TEST] Under-replicated order answered with 202")
+    threading.Thread(target=front_end.run_server, args=(FRONTEND_PORT,), daemon=True).start()
+    deadline = time.monotonic() + REPLICATION_TIMEOUT
+    while True:
+        try:
+            if requests.get(f"{FRONTEND_URL}/stocks/AAPL").status_code == 200:
+                break
+        except requests.ConnectionError:
+            pass
+        assert time.monotonic() < deadline, "the frontend did not start"
+        time.sleep(0.1)
+
+    for _, server in followers.values():
+        server.stop(0).wait()
+    resp = requests.post(f"{FRONTEND_URL}/orders", json={"name": "AAPL", "type": "sell", "quantity": 1})
+    print("POST /orders - Status Code:", resp.status_code)
+    print("Response:", resp.json())
+    assert resp.status_code == 202
+    assert resp.json()["data"]["under_replicated"] is True
+    transaction_id = resp.json()["data"]["transaction_id"]
+    # The order stays placed on the leader
+    assert leader.store.get(transaction_id)['stock_name'] == "AAPL"
+    assert requests.get(f"{FRONTEND_URL}/orders/{transaction_id}").status_code == 200
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copy(os.path.join(DATA_DIR, "catalog_database.csv"), workdir)
+        catalog_server = start_server(catalog_pb2_grpc.add_CatalogServiceServicer_to_server,
+                                      CatalogServiceImpl(os.path.join(workdir, "catalog_database.csv")), CATALOG_ADDRESS)
+        followers = {replica_id: start_replica(workdir, replica_id) for replica_id in (1, 2)}
+        leader, leader_server = start_replica(workdir, LEADER_ID)
+        announce_followers(leader, [1, 2])
+        try:
+            test_followers_receive_orders(leader, followers)
+            test_restarted_follower_catches_up(workdir, leader, followers)
+            test_unlogged_order_not_replicated(leader, followers)
+            test_quorum_durability(leader, followers)
+            test_under_replicated_order_answered_with_202(leader, followers)
+        finally:
+            for server in [catalog_server, leader_server] + [server for _, server in followers.values()]:
+                server.stop(0)
+
+    print("\nOrder replication tests passed.")
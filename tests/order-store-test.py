@@ -0,0 +1,98 @@
+"""
+This test script checks the array-backed order store: lookups by transaction id, ids that arrive out
+of order or leave gaps (as on a follower that missed orders), the round trip through the snapshot
+columns, and `LookUpOrdersById` returning the orders after an id for a resyncing replica.
+Everything runs in-process, no services need to be running.
+"""
+
+import os
+import sys
+import tempfile
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service")
+sys.path.insert(0, SERVICE_DIR)
+# Checkpoints are not needed by the tests
+os.environ["ORDER_CHECKPOINT_INTERVAL"] = "3600"
+
+import order_pb2
+from order import OrderServiceImpl
+from order_store import OrderStore
+
+def order(transaction_id):
+    return {
+        'transaction_id': transaction_id,
+        'stock_name': f"STOCK{transaction_id % 3}",
+        'order_type': "buy" if transaction_id % 2 else "sell",
+        'quantity': transaction_id + 1
+    }
+
+def build_store(transaction_ids):
+    store = OrderStore()
+    for transaction_id in transaction_ids:
+        assert store.add(transaction_id, order(transaction_id)['stock_name'], order(transaction_id)['order_type'], transaction_id + 1)
+    return store
+
+# Every stored order comes back as it was added, ids that were never added are not found
+def test_lookup_by_id():
+    print("\n[TEST] Lookup by transaction id")
+    store = build_store(range(100))
+    assert len(store) == 100 and store.max_id() == 99
+    for transaction_id in range(100):
+        assert transaction_id in store
+        assert store.get(transaction_id) == order(transaction_id)
+    assert store.get(100) is None and store.get(-1) is None and 100 not in store
+    # An id is stored once
+    assert not store.add(5, "AAPL", "buy", 1)
+    assert store.get(5) == order(5)
+
+# Ids arriving out of order and with gaps are stored in their slots, the gaps stay empty until filled
+def test_out_of_order_ids_and_gaps():
+    print("\n[TEST] Out of order ids and gaps")
+    store = build_store([10, 11, 15, 7])
+    assert len(store) == 4 and store.max_id() == 15
+    assert [stored['transaction_id'] for stored in store] == [7, 10, 11, 15]
+    assert all(transaction_id not in store for transaction_id in (8, 9, 12, 13, 14))
+    assert store.add(13, order(13)['stock_name'], order(13)['order_type'], 14)
+    assert store.get(13) == order(13)
+    assert [stored['transaction_id'] for stored in store.orders_from(11)] == [11, 13, 15]
+    print("Stored ids:", [stored['transaction_id'] for stored in store])
+
+# A store rebuilt from its snapshot columns holds the same orders, with or without gaps
+def test_columns_round_trip():
+    print("\n[TEST] Round trip through the snapshot columns")
+    for transaction_ids in (range(50), [3, 4, 9, 20]):
+        store = build_store(transaction_ids)
+        restored = OrderStore.from_columns(store.to_columns())
+        assert list(restored) == list(store)
+        assert restored.max_id() == store.max_id() and len(restored) == len(store)
+        # The restored store keeps accepting orders
+        next_id = store.max_id() + 1
+        assert restored.add(next_id, order(next_id)['stock_name'], order(next_id)['order_type'], next_id + 1)
+        assert restored.get(next_id) == order(next_id)
+
+# A resyncing replica gets exactly the orders after its last id, in id order, and nothing once it is up to date
+def test_lookup_orders_after_id(workdir):
+    print("\n[TEST] LookUpOrdersById")
+    service = OrderServiceImpl(os.path.join(workdir, "order_database_1.csv"), 1)
+    for transaction_id in [0, 1, 2, 3, 5, 6]:
+        service.SyncOrder(order_pb2.OrderSyncRequest(**order(transaction_id)), None)
+
+    response = service.LookUpOrdersById(order_pb2.LookUpByIdRequest(transaction_id=2), None)
+    assert response.exists
+    assert [synced.transaction_id for synced in response.data] == [3, 5, 6]
+    assert all(synced.quantity == synced.transaction_id + 1 for synced in response.data)
+    response = service.LookUpOrdersById(order_pb2.LookUpByIdRequest(transaction_id=-1), None)
+    assert [synced.transaction_id for synced in response.data] == [0, 1, 2, 3, 5, 6]
+    for transaction_id in (6, 100):
+        response = service.LookUpOrdersById(order_pb2.LookUpByIdRequest(transaction_id=transaction_id), None)
+        assert not response.exists and not response.data
+        print("Response:", response.message)
+
+if __name__ == "__main__":
+    test_lookup_by_id()
+    test_out_of_order_ids_and_gaps()
+    test_columns_round_trip()
+    with tempfile.TemporaryDirectory() as workdir:
+        test_lookup_orders_after_id(workdir)
+
+    print("\nOrder store tests passed.")
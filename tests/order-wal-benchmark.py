@@ -0,0 +1,75 @@
+"""
+Benchmark of order write throughput against the size of the order history.
+
+An order replica is loaded with 1k, 100k and 1M stored orders (from a generated CSV in a temp
+folder) and new orders are written through `SyncOrder`, the write path of `PlaceOrder` without the
+catalog calls. Orders/sec is measured with the previous behaviour, rewriting the whole CSV per order,
+and with the append-only order log under each fsync policy. Every measurement runs in a fresh process
+so the replicas of earlier runs do not stay in memory.
+"""
+
+import csv
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service")
+
+HISTORY_SIZES = [1_000, 100_000, 1_000_000]
+MODES = ["csv rewrite", "wal always", "wal interval", "wal never"]
+# Each measurement stops after this many orders or seconds, whichever comes first
+MAX_ORDERS = 5000
+MAX_SECONDS = 3.0
+
+
+def write_history(path, size):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['transaction_id', 'stock_name', 'order_type', 'quantity'])
+        writer.writerows((i, f"STOCK{i % 10}", "buy" if i % 2 else "sell", 1 + i % 5) for i in range(size))
+
+
+def run(mode, size):
+    """Returns the orders/sec of one mode at one history size, meant to run in a child process."""
+    os.environ["ORDER_CHECKPOINT_INTERVAL"] = "3600"
+    if mode.startswith("wal"):
+        os.environ["WAL_FSYNC"] = mode.split()[1]
+    sys.path.insert(0, SERVICE_DIR)
+    from order import OrderServiceImpl
+    import order_pb2
+
+    class FullRewriteOrderService(OrderServiceImpl):
+        """Mimics the previous behaviour: the whole order CSV is rewritten for every order."""
+
+        def log_orders(self, orders):
+            with open(self.order_file, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=['transaction_id', 'stock_name', 'order_type', 'quantity'])
+                writer.writeheader()
+                writer.writerows(list(self.store) + orders)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        order_file = os.path.join(workdir, "order_database_1.csv")
+        write_history(order_file, size)
+        service_class = FullRewriteOrderService if mode == "csv rewrite" else OrderServiceImpl
+        service = service_class(order_file, 1)
+
+        count = 0
+        start = time.perf_counter()
+        while count < MAX_ORDERS and time.perf_counter() - start < MAX_SECONDS:
+            service.SyncOrder(order_pb2.OrderSyncRequest(
+                transaction_id=size + count, stock_name="STOCK1", order_type="buy", quantity=1), None)
+            count += 1
+        return count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    context = multiprocessing.get_context("fork")
+    print(f"{'orders stored':<16}" + "".join(f"{mode:>16}" for mode in MODES))
+    for size in HISTORY_SIZES:
+        results = []
+        for mode in MODES:
+            with context.Pool(1) as pool:
+                results.append(pool.apply(run, (mode, size)))
+        print(f"{size:<16,}" + "".join(f"{r:>12,.1f}/s  " for r in results))
@@ -0,0 +1,99 @@
+"""
+Benchmark of refreshing a watchlist of every catalog stock on a cache miss.
+
+- "LookupStock per stock": the previous flow, one `LookupStock` per symbol, as when a dashboard issues
+  `GET /stocks/<name>` in a loop
+- "LookupStocks": the symbols missing from the frontend cache in one `LookupStocks` call, as done by
+  `GET /stocks?names=...`
+
+The catalog runs as a gRPC server on localhost in its own process with a copy of the catalog file.
+Watchlist refreshes/sec and the p50 latency per refresh are reported for 1, 8 and 32 clients.
+"""
+
+import csv
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent import futures
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "service")
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data")
+
+CLIENT_COUNTS = [1, 8, 32]
+MODES = ["LookupStock per stock", "LookupStocks"]
+DURATION = 3.0
+
+
+def serve(workdir, ports):
+    """Runs the catalog and reports its port, meant to run in a child process."""
+    sys.stdout = open(os.devnull, "w")
+    sys.path.insert(0, SERVICE_DIR)
+    import grpc
+    import catalog_pb2_grpc
+    from catalog import CatalogServiceImpl
+    from channel_pool import SERVER_OPTIONS
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=64), options=SERVER_OPTIONS)
+    catalog_pb2_grpc.add_CatalogServiceServicer_to_server(CatalogServiceImpl(os.path.join(workdir, "catalog_database.csv")), server)
+    ports.put(server.add_insecure_port("localhost:0"))
+    server.start()
+    server.wait_for_termination()
+
+
+def run(mode, num_clients, names):
+    """Returns (refreshes/sec, p50 latency) with the latency in seconds."""
+    sys.path.insert(0, SERVICE_DIR)
+    import grpc
+    import catalog_pb2
+    import catalog_pb2_grpc
+
+    # Forking once gRPC is running in this process can hang the child
+    context = multiprocessing.get_context("spawn")
+    ports = context.Queue()
+    workdir = tempfile.mkdtemp()
+    shutil.copy(os.path.join(DATA_DIR, "catalog_database.csv"), workdir)
+    process = context.Process(target=serve, args=(workdir, ports), daemon=True)
+    process.start()
+    stub = catalog_pb2_grpc.CatalogServiceStub(grpc.insecure_channel(f"localhost:{ports.get()}"))
+
+    def refresh():
+        if mode == "LookupStocks":
+            stocks = stub.LookupStocks(catalog_pb2.LookupStocksRequest(names=names)).stocks
+        else:
+            stocks = [stub.LookupStock(catalog_pb2.LookupRequest(name=name)) for name in names]
+        assert all(stock.exists for stock in stocks)
+
+    latencies = [[] for _ in range(num_clients)]
+    deadline = time.perf_counter() + DURATION
+
+    def client(index):
+        while time.perf_counter() < deadline:
+            start_time = time.perf_counter()
+            refresh()
+            latencies[index].append(time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(num_clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start_time
+    process.terminate()
+    shutil.rmtree(workdir)
+    samples = sorted(latency for client_latencies in latencies for latency in client_latencies)
+    return len(samples) / elapsed, samples[len(samples) // 2]
+
+
+if __name__ == "__main__":
+    with open(os.path.join(DATA_DIR, "catalog_database.csv")) as f:
+        names = [row["name"] for row in csv.DictReader(f)]
+    print(f"watchlist refreshes/sec of {len(names)} stocks (p50 latency)")
+    print(f"{'':<24}" + "".join(f"{f'{n} clients':>22}" for n in CLIENT_COUNTS))
+    for mode in MODES:
+        results = [run(mode, num_clients, names) for num_clients in CLIENT_COUNTS]
+        print(f"{mode:<24}" + "".join(f"{f'{rate:,.0f}/s ({p50 * 1000:.1f}ms)':>22}" for rate, p50 in results))